@@ -0,0 +1,327 @@
+####################################################################################
+#                                                                                  #
+# acquisition.py -- background sensor acquisition decoupled from the GUI loop      #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import threading
+import time
+import traceback
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import hw_commands
+import sensor_frames       as SDR_sensor_frames
+import controller_protocol as SDR_protocol
+import clock_sync          as SDR_clock_sync
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Default acquisition parameters
+DEFAULT_POLL_RATE   = 100  # Hz, 0 polls as fast as the controller responds
+DEFAULT_BUFFER_SIZE = 4096 # samples held in the ring buffer
+
+# Idle period while no controller is connected
+DISCONNECTED_PERIOD = 0.1  # seconds
+
+# Smoothing factor for the measured rate
+RATE_FILTER_GAIN    = 0.1
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Ring_Buffer                                                                #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Bounded, thread-safe sample buffer backed by a preallocated structured     #
+#       array (sensor_frames.sample_dtype by default). The oldest samples are      #
+#       overwritten once the buffer is full so the producer never blocks on the   #
+#       consumer                                                                   #
+#                                                                                  #
+####################################################################################
+class Ring_Buffer:
+
+    # Initialization
+    def __init__( self, size = DEFAULT_BUFFER_SIZE, dtype = None ):
+        if ( dtype is None ):
+            dtype = SDR_sensor_frames.sample_dtype
+        self.samples     = np.zeros( size, dtype = dtype )
+        self.size        = size
+        self.head        = 0 # index of the next write
+        self.count       = 0 # samples waiting to be drained
+        self.lock        = threading.Lock()
+        self.num_pushed  = 0
+        self.num_overrun = 0
+    ## __init__ ##
+
+    # Add a batch of samples, overwriting the oldest samples if full
+    def push( self, samples ):
+        num_samples = len( samples )
+        if ( num_samples > self.size ):
+            samples = samples[-self.size:]
+        with self.lock:
+            self.num_pushed += num_samples
+            overrun = self.count + num_samples - self.size
+            if ( overrun > 0 ):
+                self.num_overrun += overrun
+            first = min( len( samples ), self.size - self.head )
+            self.samples[self.head:self.head + first] = samples[:first]
+            self.samples[:len( samples ) - first]     = samples[first:]
+            self.head  = ( self.head + len( samples ) ) % self.size
+            self.count = min( self.count + len( samples ), self.size )
+    ## push ##
+
+    # Remove and return all buffered samples as one array, oldest first
+    def drain( self ):
+        with self.lock:
+            start = ( self.head - self.count ) % self.size
+            if ( start + self.count <= self.size ):
+                samples = self.samples[start:start + self.count].copy()
+            else:
+                samples = np.concatenate( ( self.samples[start:],
+                                            self.samples[:self.head] ) )
+            self.count = 0
+        return samples
+    ## drain ##
+
+    # Number of samples waiting to be drained
+    def __len__( self ):
+        with self.lock:
+            return self.count
+    ## __len__ ##
+## Ring_Buffer ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Rate_Meter                                                                 #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Tracks the rate of a periodic event using a filtered inter-event period    #
+#                                                                                  #
+####################################################################################
+class Rate_Meter:
+
+    # Initialization
+    def __init__( self ):
+        self.last_time = None
+        self.period    = None
+    ## __init__ ##
+
+    # Record count events that occurred since the last tick
+    def tick( self, now = None, count = 1 ):
+        if ( now is None ):
+            now = time.perf_counter()
+        if ( ( self.last_time is not None ) and ( count > 0 ) ):
+            dt = ( now - self.last_time )/count
+            if ( self.period is None ):
+                self.period = dt
+            else:
+                self.period += RATE_FILTER_GAIN*( dt - self.period )
+        self.last_time = now
+    ## tick ##
+
+    # Measured rate in Hz
+    def get_rate( self ):
+        if ( not self.period ):
+            return 0.0
+        return 1.0/self.period
+    ## get_rate ##
+## Rate_Meter ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Acquisition_Thread                                                         #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Worker thread that continuously polls the engine controller for sensor     #
+#       data and pushes samples into a ring buffer. Any other                      #
+#       user of the blocking serial port must hold serial_lock while it talks to   #
+#       the controller. Once an asyncio transport is attached, polls go through    #
+#       the transport instead and no lock is needed. In streaming mode the         #
+#       controller pushes frames on its own and the thread stops polling           #
+#                                                                                  #
+####################################################################################
+class Acquisition_Thread( threading.Thread ):
+
+    # Initialization
+    def __init__(
+                 self                             ,
+                 serialObj                        , # sdec terminalData object
+                 start_time                       , # perf_counter reference time
+                 poll_rate   = DEFAULT_POLL_RATE  , # target poll rate in Hz
+                 buffer_size = DEFAULT_BUFFER_SIZE  # ring buffer capacity
+                ):
+        super().__init__( daemon = True, name = "acquisition" )
+        self.serialObj    = serialObj
+        self.start_time   = start_time
+        self.poll_rate    = poll_rate
+        self.buffer       = Ring_Buffer( buffer_size )
+        self.serial_lock  = threading.RLock()
+        self.transport    = None
+        self.streaming    = False
+        self.link_monitor = None
+        self.log_sink     = None
+        self.rate_meter   = Rate_Meter()
+        self.stop_event   = threading.Event()
+        self.clock        = SDR_clock_sync.Clock_Sync(
+                                  SDR_protocol.TIMESTAMP_TICKS_PER_SEC,
+                                  SDR_protocol.TIMESTAMP_WRAP
+                                                     )
+        self.num_poll_failures = 0
+        self.num_sink_failures = 0    # batches the log sink raised on
+        self.sink_error        = None # last log sink error
+    ## __init__ ##
+
+    # Thread body
+    def run( self ):
+        next_poll = time.perf_counter()
+        while ( not self.stop_event.is_set() ):
+
+            # Wait for a controller connection, streamed samples arrive through
+            # the transport's telemetry callback
+            if ( ( self.serialObj.comport == None ) or self.streaming ):
+                self.stop_event.wait( DISCONNECTED_PERIOD )
+                next_poll = time.perf_counter()
+                continue
+
+            # Poll the controller. With a transport the controller stamps the
+            # sample itself; the blocking sdec dump has no timestamp, so the
+            # midpoint of the request is used instead
+            try:
+                if ( self.transport is not None ):
+                    device_ticks, readouts = self.transport.poll_sensors()
+                    arrival  = time.perf_counter() - self.start_time
+                    time_sec = self.device_to_host( device_ticks, arrival )
+                else:
+                    with self.serial_lock:
+                        request_time = time.perf_counter()
+                        hw_commands.sensor( ['dump'], self.serialObj,
+                                            show_readouts = False )
+                        readouts = dict( self.serialObj.sensor_readouts )
+                    time_sec = ( ( request_time + time.perf_counter() )/2.0 -
+                                 self.start_time )
+            except Exception:
+                self.num_poll_failures += 1
+                if ( self.link_monitor is not None ):
+                    self.link_monitor.report_failure()
+                self.stop_event.wait( DISCONNECTED_PERIOD )
+                next_poll = time.perf_counter()
+                continue
+            if ( self.link_monitor is not None ):
+                self.link_monitor.report_success()
+            self._push( SDR_sensor_frames.readouts_to_sample( readouts, time_sec ) )
+            self.rate_meter.tick()
+
+            # Pace to the target poll rate
+            if ( self.poll_rate > 0 ):
+                next_poll += 1.0/self.poll_rate
+                delay      = next_poll - time.perf_counter()
+                if ( delay > 0 ):
+                    self.stop_event.wait( delay )
+                else:
+                    next_poll = time.perf_counter()
+    ## run ##
+
+    # Map a controller timestamp onto the host clock, given the host time the
+    # response arrived
+    def device_to_host( self, device_ticks, arrival ):
+        device_time = self.clock.unwrap( device_ticks )
+        self.clock.update( device_time, arrival )
+        return self.clock.to_host( device_time )
+    ## device_to_host ##
+
+    # Change the target poll rate in Hz, 0 polls as fast as the controller
+    # responds. Takes effect from the next poll
+    def set_poll_rate( self, poll_rate ):
+        self.poll_rate = poll_rate
+    ## set_poll_rate ##
+
+    # Report poll failures and successes to a connection manager
+    def set_link_monitor( self, link_monitor ):
+        self.link_monitor = link_monitor
+    ## set_link_monitor ##
+
+    # Pass every batch of samples to log_sink( samples ) as soon as it is
+    # acquired, on the acquisition thread or the transport's event loop, so
+    # logging never waits on the GUI frame loop
+    def set_log_sink( self, log_sink ):
+        self.log_sink = log_sink
+    ## set_log_sink ##
+
+    # Poll through an asyncio serial transport, None reverts to blocking polls.
+    # With stream set, the controller is switched into streaming mode instead
+    def set_transport( self, transport, stream = False ):
+        self.transport = transport
+        self.streaming = stream
+        if ( stream ):
+            transport.start_stream( self.stream_sample )
+    ## set_transport ##
+
+    # Telemetry callback for streaming mode, receives a batch of decoded frames.
+    # Only the newest frame of a batch arrived with the batch, so it alone
+    # updates the clock fit
+    def stream_sample( self, frames ):
+        arrival      = time.perf_counter() - self.start_time
+        device_times = self.clock.unwrap_batch( frames["device_time"] )
+        self.clock.update( device_times[-1], arrival )
+        time_sec     = self.clock.to_host( device_times )
+        self._push( SDR_sensor_frames.frames_to_samples( frames, time_sec ) )
+        self.rate_meter.tick( count = len( frames ) )
+    ## stream_sample ##
+
+    # Hand newly acquired samples to the log sink and the ring buffer. A log
+    # sink error is counted and kept for the GUI; acquisition carries on
+    def _push( self, samples ):
+        if ( self.log_sink is not None ):
+            try:
+                self.log_sink( samples )
+            except Exception:
+                self.num_sink_failures += 1
+                self.sink_error = traceback.format_exc().strip().splitlines()[-1]
+        self.buffer.push( samples )
+    ## _push ##
+
+    # Remove and return all samples acquired since the last drain as a
+    # sensor_frames.sample_dtype structured array
+    def drain( self ):
+        return self.buffer.drain()
+    ## drain ##
+
+    # Measured acquisition rate in Hz
+    def get_rate( self ):
+        return self.rate_meter.get_rate()
+    ## get_rate ##
+
+    # Stop the thread and wait for it to exit
+    def stop( self, timeout = 1.0 ):
+        self.stop_event.set()
+        if ( self.is_alive() ):
+            self.join( timeout )
+    ## stop ##
+## Acquisition_Thread ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
@@ -0,0 +1,216 @@
+####################################################################################
+#                                                                                  #
+# binary_log.py -- self-describing fixed-width binary sample logs                  #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+# File layout:                                                                     #
+#       magic (6) | format version (u16) | header length (u32) | JSON header |     #
+#       padding to HEADER_ALIGNMENT | fixed-width little-endian records ...        #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import datetime
+import json
+import os
+import struct
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# File identification
+MAGIC          = b"SDRLOG"
+FORMAT_VERSION = 1
+FILE_EXTENSION = ".sdrlog"
+
+# Fixed part of the header: magic, format version, JSON header length
+PREFIX_FORMAT = "<6sHI"
+PREFIX_SIZE   = struct.calcsize( PREFIX_FORMAT )
+
+# Records start on a multiple of this many bytes
+HEADER_ALIGNMENT = 64
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         build_header                                                             #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Builds the complete file header for records of a structured dtype. units #
+#         maps field names to unit strings; metadata is stored alongside as is.    #
+#         Formats built on this header pass their own magic and header entries     #
+#                                                                                  #
+####################################################################################
+def build_header( dtype, units = None, metadata = None, magic = MAGIC, extra = None ):
+    if ( units is None ):
+        units = {}
+    header = {
+             "dtype"    : [ [ name, dtype[name].str ] for name in dtype.names ],
+             "channels" : [ { "name"  : name                ,
+                              "units" : units.get( name )   ,
+                              "dtype" : dtype[name].str     ,
+                              "offset": dtype.fields[name][1] }
+                            for name in dtype.names ],
+             "itemsize" : dtype.itemsize,
+             "created"  : datetime.datetime.now().isoformat(),
+             "metadata" : metadata if ( metadata is not None ) else {}
+             }
+    if ( extra is not None ):
+        header.update( extra )
+    text        = json.dumps( header ).encode( "utf-8" )
+    header_size = PREFIX_SIZE + len( text )
+    padding     = -header_size % HEADER_ALIGNMENT
+    text       += b" "*padding
+    return struct.pack( PREFIX_FORMAT, magic, FORMAT_VERSION, len( text ) ) + text
+## build_header ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         read_header                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Reads the header of a binary log, returns the header dictionary, the     #
+#         record dtype and the byte offset of the first record                     #
+#                                                                                  #
+####################################################################################
+def read_header( filename, magic = MAGIC ):
+    with open( filename, "rb" ) as file:
+        prefix = file.read( PREFIX_SIZE )
+        if ( len( prefix ) < PREFIX_SIZE ):
+            raise ValueError( filename + " is not a binary log" )
+        file_magic, version, header_length = struct.unpack( PREFIX_FORMAT, prefix )
+        if ( file_magic != magic ):
+            raise ValueError( filename + " is not a binary log" )
+        if ( version > FORMAT_VERSION ):
+            raise ValueError( filename + " has unsupported format version " +
+                              str( version ) )
+        header = json.loads( file.read( header_length ).decode( "utf-8" ) )
+    dtype = np.dtype( [ ( name, dtype_str ) for name, dtype_str in header["dtype"] ] )
+    return header, dtype, PREFIX_SIZE + header_length
+## read_header ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         load                                                                     #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Maps the records of a binary log into memory without parsing or copying. #
+#         Returns the header dictionary and a read-only structured array; each     #
+#         channel is available as records[name]. A partial record left by a crash  #
+#         at the end of the file is ignored                                        #
+#                                                                                  #
+####################################################################################
+def load( filename ):
+    header, dtype, offset = read_header( filename )
+    num_records = ( os.path.getsize( filename ) - offset )//dtype.itemsize
+    if ( num_records == 0 ):
+        return header, np.zeros( 0, dtype = dtype )
+    records = np.memmap(
+                       filename                     ,
+                       dtype  = dtype               ,
+                       mode   = "r"                 ,
+                       offset = offset              ,
+                       shape  = ( num_records, )
+                       )
+    return header, records
+## load ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Binary_Log_File                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Appends samples of one structured dtype to a binary log. A new file      #
+#         gets a header; an existing file is appended to after checking that its   #
+#         dtype matches and trimming any partial record. Text notes, which have no #
+#         place among the fixed-width records, go to an optional text file         #
+#                                                                                  #
+####################################################################################
+class Binary_Log_File:
+
+    # Initialization
+    def __init__(
+                 self                  ,
+                 filename              , # log filename
+                 dtype                 , # structured record dtype
+                 units          = None , # field name to unit string
+                 metadata       = None , # extra header entries
+                 notes_filename = None   # text file for notes, or None
+                ):
+        self.filename       = filename
+        self.dtype          = np.dtype( dtype ).newbyteorder( "<" )
+        self.notes_filename = notes_filename
+        self.notes_file     = None
+        if ( os.path.exists( filename ) and ( os.path.getsize( filename ) > 0 ) ):
+            _, file_dtype, offset = read_header( filename )
+            if ( file_dtype != self.dtype ):
+                raise ValueError( filename + " holds records of a different dtype" )
+            self.file  = open( filename, "r+b" )
+            num_bytes  = os.path.getsize( filename ) - offset
+            self.file.truncate( offset + num_bytes - num_bytes % self.dtype.itemsize )
+            self.file.seek( 0, os.SEEK_END )
+        else:
+            self.file = open( filename, "wb" )
+            self.file.write( build_header( self.dtype, units, metadata ) )
+    ## __init__ ##
+
+    # Append a structured array of samples
+    def write_samples( self, samples ):
+        if ( samples.dtype != self.dtype ):
+            samples = samples.astype( self.dtype )
+        self.file.write( np.ascontiguousarray( samples ).data )
+    ## write_samples ##
+
+    # Append a line to the notes file
+    def write_text( self, text ):
+        if ( self.notes_filename is None ):
+            return
+        if ( self.notes_file is None ):
+            self.notes_file = open( self.notes_filename, "a" )
+        self.notes_file.write( text )
+    ## write_text ##
+
+    # Flush buffered data to the operating system
+    def flush( self ):
+        self.file.flush()
+        if ( self.notes_file is not None ):
+            self.notes_file.flush()
+    ## flush ##
+
+    # Force flushed data to disk
+    def sync( self ):
+        os.fsync( self.file.fileno() )
+        if ( self.notes_file is not None ):
+            os.fsync( self.notes_file.fileno() )
+    ## sync ##
+
+    # Close the log
+    def close( self ):
+        self.file.close()
+        if ( self.notes_file is not None ):
+            self.notes_file.close()
+    ## close ##
+## Binary_Log_File ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
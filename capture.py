@@ -0,0 +1,276 @@
+####################################################################################
+#                                                                                  #
+# capture.py -- full-rate capture of the samples around ignition, aborts and       #
+#               channel threshold crossings                                        #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import math
+import os
+import queue
+import re
+import threading
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import sensor_frames  as SDR_sensor_frames
+import log_writer     as SDR_log_writer
+import run_catalog    as SDR_run_catalog
+import rate_scheduler as SDR_rate_scheduler
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Default capture windows
+DEFAULT_PRE_TRIGGER  = 5.0    # seconds kept before a trigger
+DEFAULT_POST_TRIGGER = 10.0   # seconds captured after a trigger
+
+# Highest sample rate the capture buffer is sized for, the fastest rate the
+# controller is asked to stream at
+DEFAULT_MAX_RATE     = SDR_rate_scheduler.MAX_STREAM_RATE # Hz
+
+# Extra ring space for a stream running fast of max_rate
+RATE_MARGIN          = 0.1    # fraction of max_rate
+
+# Channel threshold, e.g. "pt4>300" or "chamber_pressure>300"
+THRESHOLD_PATTERN = re.compile( r"^\s*(\w+)\s*([<>])\s*(\S+)\s*$" )
+
+# Tells the capture writer thread to exit
+_STOP = None
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         parse_threshold                                                          #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Parses a channel threshold trigger such as "pt4>300" or "tc<-150" into   #
+#         ( channel, comparison, value ). Channels may be sensor names or          #
+#         run_catalog.channel_aliases entries                                      #
+#                                                                                  #
+####################################################################################
+def parse_threshold( text ):
+    match = THRESHOLD_PATTERN.match( text )
+    if ( match is None ):
+        raise ValueError( "threshold must look like pt4>300: " + text )
+    channel = SDR_run_catalog.channel_aliases.get( match.group( 1 ),
+                                                   match.group( 1 ) )
+    if ( channel not in SDR_sensor_frames.sample_dtype.names ):
+        raise ValueError( "unknown channel: " + match.group( 1 ) )
+    return channel, match.group( 2 ), float( match.group( 3 ) )
+## parse_threshold ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Trigger_Capture                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Keeps the newest pre_trigger + post_trigger seconds of full-rate samples   #
+#       in a preallocated ring, ahead of any logging decimation. When a trigger    #
+#       fires, the ring is left to fill for post_trigger seconds and the window    #
+#       around the trigger is then handed to this thread, which writes it to its   #
+#       own capture file. Adding samples only copies them into the ring and        #
+#       reduces the threshold channels, so steady state allocates nothing; the     #
+#       window is copied out once per capture. A trigger during a capture ends     #
+#       that capture early and starts a new one. The ring is sized for max_rate,   #
+#       which defaults to the fastest stream rate, plus RATE_MARGIN; the batch     #
+#       that completes a capture is split at its end so none of it is overwritten  #
+#                                                                                  #
+####################################################################################
+class Trigger_Capture( threading.Thread ):
+
+    # Initialization
+    def __init__(
+                 self                                 ,
+                 log_format                           ,
+                 base_filename                        , # captures add "<n><ext>"
+                 units        = None                  ,
+                 codec        = "zlib"                ,
+                 pre_trigger  = DEFAULT_PRE_TRIGGER   ,
+                 post_trigger = DEFAULT_POST_TRIGGER  ,
+                 max_rate     = DEFAULT_MAX_RATE      ,
+                 thresholds   = ()                    , # parse_threshold results
+                 dtype        = None
+                ):
+        super().__init__( daemon = True, name = "trigger capture" )
+        if ( dtype is None ):
+            dtype = SDR_sensor_frames.sample_dtype
+        self.log_format    = log_format
+        self.base_filename = base_filename
+        self.units         = units
+        self.codec         = codec
+        self.pre_trigger   = pre_trigger
+        self.post_trigger  = post_trigger
+        self.thresholds    = list( thresholds )
+        self.armed         = [ True ]*len( self.thresholds )
+        self.size          = math.ceil( ( pre_trigger + post_trigger )*
+                                        max_rate*( 1.0 + RATE_MARGIN ) ) + 1
+        self.samples       = np.zeros( self.size, dtype = dtype )
+        self.head          = 0 # index of the next write
+        self.count         = 0 # samples held
+        self.lock          = threading.Lock()
+        self.queue         = queue.Queue()
+
+        # Capture in progress
+        self.trigger_reason = None
+        self.trigger_time   = None
+        self.end_time       = None
+
+        # Capture metrics
+        self.num_captures   = 0
+        self.num_written    = 0
+        self.next_file      = 0 # number of the next capture file
+    ## __init__ ##
+
+    # Add a batch of full-rate samples, called from the acquisition thread
+    def add( self, samples ):
+        if ( len( samples ) == 0 ):
+            return
+        with self.lock:
+
+            # Finish the capture once its post-trigger window has arrived,
+            # before the rest of the batch can overwrite the start of it
+            if ( ( self.end_time is not None ) and
+                 ( samples["time"][-1] >= self.end_time ) ):
+                split = np.searchsorted( samples["time"], self.end_time,
+                                         side = "right" )
+                self._copy( samples[:split] )
+                self._finish()
+                self._copy( samples[split:] )
+            else:
+                self._copy( samples )
+
+            # Trigger on a channel crossing its threshold, again only after it
+            # has come back
+            for index, threshold in enumerate( self.thresholds ):
+                channel, comparison, value = threshold
+                if ( comparison == ">" ):
+                    crossed = np.fmax.reduce( samples[channel] ) > value
+                else:
+                    crossed = np.fmin.reduce( samples[channel] ) < value
+                if ( crossed and self.armed[index] ):
+                    if ( comparison == ">" ):
+                        first = np.argmax( samples[channel] > value )
+                    else:
+                        first = np.argmax( samples[channel] < value )
+                    self._start( "{}{}{:g}".format( channel, comparison, value ),
+                                 float( samples["time"][first] ) )
+                self.armed[index] = not crossed
+    ## add ##
+
+    # Copy samples into the ring over the oldest ones held
+    def _copy( self, samples ):
+        num_samples = len( samples )
+        if ( num_samples > self.size ):
+            samples     = samples[-self.size:]
+            num_samples = self.size
+        first = min( num_samples, self.size - self.head )
+        self.samples[self.head:self.head + first] = samples[:first]
+        self.samples[:num_samples - first]        = samples[first:]
+        self.head  = ( self.head + num_samples ) % self.size
+        self.count = min( self.count + num_samples, self.size )
+    ## _copy ##
+
+    # Fire a trigger at time_sec, run time on the sample clock
+    def trigger( self, reason, time_sec ):
+        with self.lock:
+            self._start( reason, time_sec )
+    ## trigger ##
+
+    # Start a capture, ending any capture in progress at this trigger
+    def _start( self, reason, time_sec ):
+        if ( self.end_time is not None ):
+            self._finish()
+        self.trigger_reason = reason
+        self.trigger_time   = time_sec
+        self.end_time       = time_sec + self.post_trigger
+        self.num_captures  += 1
+    ## _start ##
+
+    # Copy the capture window out of the ring and queue it for writing
+    def _finish( self ):
+        start = ( self.head - self.count ) % self.size
+        if ( start + self.count <= self.size ):
+            held = self.samples[start:start + self.count]
+        else:
+            held = np.concatenate( ( self.samples[start:],
+                                     self.samples[:self.head] ) )
+        times = held["time"]
+        first = np.searchsorted( times, self.trigger_time - self.pre_trigger )
+        last  = np.searchsorted( times, self.end_time, side = "right" )
+        self.queue.put( ( self.trigger_reason, self.trigger_time,
+                          held[first:last].copy() ) )
+        self.trigger_reason = None
+        self.trigger_time   = None
+        self.end_time       = None
+    ## _finish ##
+
+    # Thread body, writes each capture to the next capture file
+    def run( self ):
+        while ( True ):
+            item = self.queue.get()
+            if ( item is _STOP ):
+                break
+            reason, trigger_time, samples = item
+
+            # Number past the captures of an earlier session of the same run
+            extension = SDR_log_writer.log_extensions[self.log_format]
+            while ( os.path.exists( self.base_filename + str( self.next_file ) +
+                                    extension ) ):
+                self.next_file += 1
+            filename        = self.base_filename + str( self.next_file ) + extension
+            self.next_file += 1
+            metadata = {
+                       "trigger"      : reason           ,
+                       "trigger_time" : trigger_time     ,
+                       "pre_trigger"  : self.pre_trigger ,
+                       "post_trigger" : self.post_trigger
+                       }
+            log_file = SDR_log_writer.open_log_file(
+                                                   self.log_format     ,
+                                                   filename            ,
+                                                   samples.dtype       ,
+                                                   units    = self.units,
+                                                   codec    = self.codec,
+                                                   metadata = metadata
+                                                   )
+            log_file.write_text( "# {:.6f} capture trigger: {}\n".format(
+                                     trigger_time, reason ) )
+            log_file.write_samples( samples )
+            log_file.close()
+            self.num_written += 1
+    ## run ##
+
+    # Write out a capture in progress, cut short, and any queued captures
+    def stop( self, timeout = 5.0 ):
+        with self.lock:
+            if ( self.end_time is not None ):
+                self._finish()
+        self.queue.put( _STOP )
+        if ( self.is_alive() ):
+            self.join( timeout )
+    ## stop ##
+## Trigger_Capture ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
@@ -0,0 +1,153 @@
+####################################################################################
+#                                                                                  #
+# clock_sync.py -- maps device timestamps onto the host clock with an online      #
+#                  estimate of clock offset and drift                              #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Weight given to past points per second of device time. 0.99 keeps a fit
+# memory of roughly 100 s, long enough to average out serial jitter while still
+# following temperature driven drift
+DEFAULT_FORGETTING = 0.99
+
+# Rate the lower envelope of the fit residuals relaxes upward (s per s), so a
+# single unusually fast arrival does not pin the offset forever
+ENVELOPE_LEAK = 1e-5
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Clock_Sync                                                                 #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Online linear fit of host arrival time against device time:                #
+#           host = offset + ( 1 + drift )*device                                   #
+#       using exponentially weighted least squares. Arrival times only ever lag    #
+#       the true host time by transport latency, so the fitted line is shifted     #
+#       down to the lower envelope of the residuals. Device counters that wrap     #
+#       are unwrapped before fitting                                               #
+#                                                                                  #
+####################################################################################
+class Clock_Sync:
+
+    # Initialization
+    def __init__(
+                self                            ,
+                ticks_per_sec = 1.0             , # device timestamp resolution
+                wrap          = None            , # counter wrap in ticks, or None
+                forgetting    = DEFAULT_FORGETTING
+                ):
+        self.ticks_per_sec = ticks_per_sec
+        self.wrap          = wrap
+        self.forgetting    = forgetting
+        self.last_ticks    = None
+        self.wrap_offset   = 0
+        self.origin        = None # first device/host time, keeps sums well scaled
+        self.last_device   = None
+        self.sum_w         = 0.0
+        self.sum_x         = 0.0
+        self.sum_y         = 0.0
+        self.sum_xx        = 0.0
+        self.sum_xy        = 0.0
+        self.envelope      = None
+        self.num_points    = 0
+    ## __init__ ##
+
+    # Convert raw device ticks to unwrapped device seconds
+    def unwrap( self, ticks ):
+        if ( self.wrap is not None ):
+            if ( ( self.last_ticks is not None ) and ( ticks < self.last_ticks ) and
+                 ( self.last_ticks - ticks > self.wrap//2 ) ):
+                self.wrap_offset += self.wrap
+            self.last_ticks = ticks
+        return ( ticks + self.wrap_offset )/self.ticks_per_sec
+    ## unwrap ##
+
+    # Convert a batch of raw device ticks, oldest first, to unwrapped device
+    # seconds. Only the newest tick advances the unwrapping state, so a batch
+    # must span less than half a wrap
+    def unwrap_batch( self, ticks ):
+        newest = int( ticks[-1] )
+        back   = newest - ticks.astype( "i8" )
+        if ( self.wrap is not None ):
+            back %= self.wrap
+        return self.unwrap( newest ) - back/self.ticks_per_sec
+    ## unwrap_batch ##
+
+    # Add a device time (seconds) and the host time it arrived at
+    def update( self, device_time, host_time ):
+        if ( self.origin is None ):
+            self.origin      = ( device_time, host_time )
+            self.last_device = device_time
+        x = device_time - self.origin[0]
+        y = host_time   - self.origin[1]
+
+        # Age the existing points by the device time elapsed
+        elapsed = max( device_time - self.last_device, 0.0 )
+        decay   = self.forgetting**elapsed
+        self.sum_w  = self.sum_w *decay + 1.0
+        self.sum_x  = self.sum_x *decay + x
+        self.sum_y  = self.sum_y *decay + y
+        self.sum_xx = self.sum_xx*decay + x*x
+        self.sum_xy = self.sum_xy*decay + x*y
+        self.last_device = device_time
+        self.num_points += 1
+
+        # Track the lower envelope of the residuals
+        residual = y - self._fit( x )
+        if ( self.envelope is None ):
+            self.envelope = residual
+        else:
+            self.envelope = min( residual, self.envelope + ENVELOPE_LEAK*elapsed )
+    ## update ##
+
+    # Least squares line through the weighted points, relative to the origin
+    def _fit( self, x ):
+        denominator = self.sum_w*self.sum_xx - self.sum_x*self.sum_x
+        if ( ( self.num_points < 2 ) or ( denominator <= 0.0 ) ):
+            slope = 1.0
+        else:
+            slope = ( self.sum_w*self.sum_xy - self.sum_x*self.sum_y )/denominator
+        intercept = ( self.sum_y - slope*self.sum_x )/self.sum_w
+        return intercept + slope*x
+    ## _fit ##
+
+    # Map device time(s) in seconds onto the host clock. Works on floats and
+    # NumPy arrays alike
+    def to_host( self, device_time ):
+        x = device_time - self.origin[0]
+        return self.origin[1] + self._fit( x ) + self.envelope
+    ## to_host ##
+
+    # Estimated host minus device clock offset at device time zero (s)
+    def get_offset( self ):
+        return self.to_host( 0.0 )
+    ## get_offset ##
+
+    # Estimated device clock drift relative to the host clock (parts per million)
+    def get_drift_ppm( self ):
+        if ( self.num_points < 2 ):
+            return 0.0
+        return ( ( self._fit( 1.0 ) - self._fit( 0.0 ) ) - 1.0 )*1e6
+    ## get_drift_ppm ##
+
+    # True once enough points have been seen to map device time
+    def is_ready( self ):
+        return self.num_points > 0
+    ## is_ready ##
+## Clock_Sync ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
@@ -0,0 +1,388 @@
+####################################################################################
+#                                                                                  #
+# compressed_log.py -- delta encoded, block compressed sample logs                 #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+# File layout:                                                                     #
+#       binary_log header (magic SDRZLG) | block | block | ...                     #
+#   block:                                                                         #
+#       sync (4) | rows (u32) | compressed size (u32) | CRC-32 (u32) |             #
+#       start time (f8) | end time (f8) | compressed payload                       #
+#   payload, before compression, per channel in field order:                       #
+#       byte planes of the differences between consecutive values                  #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import bisect
+import lzma
+import os
+import struct
+import time
+import zlib
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import binary_log as SDR_binary_log
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# File identification
+MAGIC          = b"SDRZLG"
+FILE_EXTENSION = ".sdrz"
+
+# Block header
+BLOCK_SYNC   = b"SDRB"
+BLOCK_FORMAT = "<4sIIIdd"
+BLOCK_SIZE   = struct.calcsize( BLOCK_FORMAT )
+
+# Rows per block. Larger blocks compress better; smaller ones make random
+# access cheaper
+DEFAULT_BLOCK_ROWS = 8192
+
+# A partly filled block is written once its oldest row is this old, bounding the
+# data lost in a crash at low sample rates
+DEFAULT_BLOCK_PERIOD = 5.0 # seconds
+
+# Compression codecs: ( compress( data, level ), decompress( data ), default level )
+codecs = {
+         "zlib" : ( lambda data, level: zlib.compress( data, level ),
+                    zlib.decompress                                  ,
+                    6                                                ),
+         "lzma" : ( lambda data, level: lzma.compress( data, preset = level ),
+                    lzma.decompress                                          ,
+                    1                                                        )
+         }
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         _integer_dtype                                                           #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Unsigned integer dtype with the size of a field, which its values are    #
+#         reinterpreted as for delta encoding. None for sizes with no such dtype   #
+#                                                                                  #
+####################################################################################
+def _integer_dtype( field_dtype ):
+    if ( field_dtype.itemsize in ( 1, 2, 4, 8 ) ):
+        return np.dtype( "<u" + str( field_dtype.itemsize ) )
+    return None
+## _integer_dtype ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         encode_block                                                             #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Delta encodes each channel of a block of samples and compresses the      #
+#         result. Differences are taken between the raw bit patterns with          #
+#         wraparound, so floats round trip exactly. Slowly changing channels give  #
+#         differences whose high bytes are mostly zero; storing each byte position #
+#         as its own plane turns those into long runs for the compressor           #
+#                                                                                  #
+####################################################################################
+def encode_block( samples, codec = "zlib", level = None ):
+    compress, _, default_level = codecs[codec]
+    if ( level is None ):
+        level = default_level
+    planes = []
+    for name in samples.dtype.names:
+        column        = np.ascontiguousarray( samples[name] )
+        integer_dtype = _integer_dtype( column.dtype )
+        if ( integer_dtype is not None ):
+            values = column.view( integer_dtype )
+            deltas = np.diff( values, prepend = integer_dtype.type( 0 ) )
+            planes.append( deltas.view( np.uint8 ).reshape(
+                               -1, integer_dtype.itemsize ).T.tobytes() )
+        else:
+            planes.append( column.tobytes() )
+    return compress( b"".join( planes ), level )
+## encode_block ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         decode_block                                                             #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Inverse of encode_block, returns rows samples of dtype                   #
+#                                                                                  #
+####################################################################################
+def decode_block( payload, dtype, rows, codec = "zlib" ):
+    raw     = codecs[codec][1]( payload )
+    samples = np.empty( rows, dtype = dtype )
+    offset  = 0
+    for name in dtype.names:
+        field_dtype   = dtype[name]
+        size          = rows*field_dtype.itemsize
+        data          = np.frombuffer( raw, dtype = np.uint8, count = size,
+                                       offset = offset )
+        offset       += size
+        integer_dtype = _integer_dtype( field_dtype )
+        if ( integer_dtype is not None ):
+            deltas = np.ascontiguousarray(
+                         data.reshape( integer_dtype.itemsize, rows ).T
+                                         ).view( integer_dtype ).ravel()
+            values = np.cumsum( deltas, dtype = integer_dtype )
+            samples[name] = values.view( field_dtype )
+        else:
+            samples[name] = data.view( field_dtype )
+    return samples
+## decode_block ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         scan_blocks                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Reads the block headers of a compressed log, seeking past the payloads.  #
+#         Returns a list of ( offset, rows, size, crc, start time, end time )      #
+#         tuples and the offset just past the last complete block                  #
+#                                                                                  #
+####################################################################################
+def scan_blocks( file, offset ):
+    blocks    = []
+    file_size = os.fstat( file.fileno() ).st_size
+    while ( offset + BLOCK_SIZE <= file_size ):
+        file.seek( offset )
+        sync, rows, size, crc, start_time, end_time = struct.unpack(
+                                             BLOCK_FORMAT, file.read( BLOCK_SIZE ) )
+        if ( ( sync != BLOCK_SYNC ) or ( offset + BLOCK_SIZE + size > file_size ) ):
+            break
+        blocks.append( ( offset, rows, size, crc, start_time, end_time ) )
+        offset += BLOCK_SIZE + size
+    return blocks, offset
+## scan_blocks ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Compressed_Log_File                                                        #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Log file object for log_writer.Log_Writer that buffers samples into        #
+#       blocks of block_rows rows and writes each as one compressed block, so the  #
+#       compression runs on the writer thread. Reopening an existing log appends   #
+#       after its last complete block                                              #
+#                                                                                  #
+####################################################################################
+class Compressed_Log_File:
+
+    # Initialization
+    def __init__(
+                 self                                 ,
+                 filename                             , # log filename
+                 dtype                                , # structured record dtype
+                 units          = None                , # field name to unit string
+                 metadata       = None                , # extra header entries
+                 notes_filename = None                , # text file for notes
+                 codec          = "zlib"              , # entry of codecs
+                 level          = None                , # compression level
+                 block_rows     = DEFAULT_BLOCK_ROWS  ,
+                 block_period   = DEFAULT_BLOCK_PERIOD
+                ):
+        self.filename       = filename
+        self.dtype          = np.dtype( dtype ).newbyteorder( "<" )
+        self.notes_filename = notes_filename
+        self.notes_file     = None
+        self.level          = level
+        self.block_rows     = block_rows
+        self.block_period   = block_period
+        self.pending        = []
+        self.pending_rows   = 0
+        self.pending_time   = None # arrival of the oldest pending row
+        if ( os.path.exists( filename ) and ( os.path.getsize( filename ) > 0 ) ):
+            header, file_dtype, offset = SDR_binary_log.read_header( filename, MAGIC )
+            if ( file_dtype != self.dtype ):
+                raise ValueError( filename + " holds records of a different dtype" )
+            self.codec = header["codec"]
+            self.file  = open( filename, "r+b" )
+            _, end     = scan_blocks( self.file, offset )
+            self.file.truncate( end )
+            self.file.seek( end )
+        else:
+            self.codec = codec
+            self.file  = open( filename, "wb" )
+            self.file.write( SDR_binary_log.build_header(
+                                        self.dtype                            ,
+                                        units    = units                      ,
+                                        metadata = metadata                   ,
+                                        magic    = MAGIC                      ,
+                                        extra    = { "codec"     : codec     ,
+                                                     "encoding"  : "delta"   ,
+                                                     "block_rows": block_rows }
+                                                        ) )
+
+        # Compression metrics
+        self.num_raw_bytes        = 0
+        self.num_compressed_bytes = 0
+    ## __init__ ##
+
+    # Compress and write the pending samples as one block
+    def _write_block( self ):
+        samples   = np.concatenate( self.pending )
+        payload   = encode_block( samples, self.codec, self.level )
+        self.file.write( struct.pack(
+                                    BLOCK_FORMAT                       ,
+                                    BLOCK_SYNC                         ,
+                                    len( samples )                     ,
+                                    len( payload )                     ,
+                                    zlib.crc32( payload )              ,
+                                    float( samples["time"].min() )     ,
+                                    float( samples["time"].max() )
+                                    ) )
+        self.file.write( payload )
+        self.num_raw_bytes        += samples.nbytes
+        self.num_compressed_bytes += BLOCK_SIZE + len( payload )
+        self.pending      = []
+        self.pending_rows = 0
+        self.pending_time = None
+    ## _write_block ##
+
+    # Append a structured array of samples, writing blocks as they fill
+    def write_samples( self, samples ):
+        if ( samples.dtype != self.dtype ):
+            samples = samples.astype( self.dtype )
+        while ( len( samples ) > 0 ):
+            if ( self.pending_time is None ):
+                self.pending_time = time.monotonic()
+            rows = min( len( samples ), self.block_rows - self.pending_rows )
+            self.pending.append( samples[:rows] )
+            self.pending_rows += rows
+            samples            = samples[rows:]
+            if ( self.pending_rows >= self.block_rows ):
+                self._write_block()
+    ## write_samples ##
+
+    # Append a line to the notes file
+    def write_text( self, text ):
+        if ( self.notes_filename is None ):
+            return
+        if ( self.notes_file is None ):
+            self.notes_file = open( self.notes_filename, "a" )
+        self.notes_file.write( text )
+    ## write_text ##
+
+    # Flush complete blocks to the operating system. A partly filled block is
+    # only written once it has waited block_period, so a block_period of 0
+    # writes it on every flush. Returns the time.monotonic time a flush is next
+    # needed to write the partial block, or None
+    def flush( self ):
+        if ( ( self.pending_time is not None ) and
+             ( time.monotonic() - self.pending_time >= self.block_period ) ):
+            self._write_block()
+        self.file.flush()
+        if ( self.notes_file is not None ):
+            self.notes_file.flush()
+        if ( self.pending_time is None ):
+            return None
+        return self.pending_time + self.block_period
+    ## flush ##
+
+    # Force flushed data to disk
+    def sync( self ):
+        os.fsync( self.file.fileno() )
+        if ( self.notes_file is not None ):
+            os.fsync( self.notes_file.fileno() )
+    ## sync ##
+
+    # Write the last block and close the log
+    def close( self ):
+        if ( self.pending_rows > 0 ):
+            self._write_block()
+        self.file.close()
+        if ( self.notes_file is not None ):
+            self.notes_file.close()
+    ## close ##
+## Compressed_Log_File ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Compressed_Log                                                             #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Reader for a compressed log. The block headers are scanned once; a time    #
+#       range is then located by binary search and only the blocks overlapping it  #
+#       are decompressed                                                           #
+#                                                                                  #
+####################################################################################
+class Compressed_Log:
+
+    # Initialization
+    def __init__( self, filename ):
+        self.filename                     = filename
+        self.header, self.dtype, offset   = SDR_binary_log.read_header( filename,
+                                                                        MAGIC )
+        self.codec                        = self.header["codec"]
+        with open( filename, "rb" ) as file:
+            self.blocks, _ = scan_blocks( file, offset )
+        self.start_times = [ block[4] for block in self.blocks ]
+        self.end_times   = [ block[5] for block in self.blocks ]
+    ## __init__ ##
+
+    # Total number of rows
+    def __len__( self ):
+        return sum( block[1] for block in self.blocks )
+    ## __len__ ##
+
+    # Decompress one block, returns its samples
+    def read_block( self, block_num ):
+        offset, rows, size, crc, _, _ = self.blocks[block_num]
+        with open( self.filename, "rb" ) as file:
+            file.seek( offset + BLOCK_SIZE )
+            payload = file.read( size )
+        if ( zlib.crc32( payload ) != crc ):
+            raise ValueError( self.filename + " block " + str( block_num ) +
+                              " is corrupted" )
+        return decode_block( payload, self.dtype, rows, self.codec )
+    ## read_block ##
+
+    # Samples between start_time and end_time (seconds, None for unbounded)
+    def load( self, start_time = None, end_time = None ):
+        first = 0
+        last  = len( self.blocks )
+        if ( start_time is not None ):
+            first = bisect.bisect_left( self.end_times, start_time )
+        if ( end_time is not None ):
+            last  = bisect.bisect_right( self.start_times, end_time )
+        parts = [ np.zeros( 0, dtype = self.dtype ) ]
+        for block_num in range( first, last ):
+            samples = self.read_block( block_num )
+            mask    = np.ones( len( samples ), dtype = bool )
+            if ( start_time is not None ):
+                mask &= samples["time"] >= start_time
+            if ( end_time is not None ):
+                mask &= samples["time"] <= end_time
+            parts.append( samples[mask] )
+        return np.concatenate( parts )
+    ## load ##
+## Compressed_Log ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
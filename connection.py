@@ -0,0 +1,246 @@
+####################################################################################
+#                                                                                  #
+# connection.py -- engine controller connection manager with hotplug detection    #
+#                  and reconnect backoff                                           #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import os
+import threading
+import time
+
+# Serial (USB)
+import serial.tools.list_ports
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import commands
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Connection states
+DISCONNECTED = "Disconnected"
+CONNECTED    = "Connected"
+BACKOFF      = "Backoff"
+
+# USB to UART bridges used by the engine controller
+controller_port_descriptions = [ 'CP2102', 'CP210x' ]
+
+# Reconnect backoff
+MIN_BACKOFF    = 0.1 # seconds
+MAX_BACKOFF    = 5.0 # seconds
+BACKOFF_FACTOR = 2.0
+
+# Period between checks of /dev and the device node
+WATCH_PERIOD = 0.1 # seconds
+
+# Consecutive poll failures before the link is declared lost
+MAX_FAILURES = 3
+
+# Device directory watched for hotplug events, None where it does not exist
+DEVICE_DIR = "/dev" if os.path.isdir( "/dev" ) else None
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         find_controller_port                                                     #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Returns the device name of the first serial port that looks like an      #
+#         engine controller, or None                                               #
+#                                                                                  #
+####################################################################################
+def find_controller_port():
+    for port in serial.tools.list_ports.comports():
+        for description in controller_port_descriptions:
+            if ( description in port.description ):
+                return port.device
+    return None
+## find_controller_port ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Connection_Manager                                                         #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Worker thread that owns finding, connecting and reconnecting to the engine #
+#       controller. Ports are only enumerated when /dev changes or the reconnect   #
+#       backoff expires, never on every GUI frame. on_connect( device ) and        #
+#       on_disconnect() are called from the manager thread                         #
+#                                                                                  #
+####################################################################################
+class Connection_Manager( threading.Thread ):
+
+    # Initialization
+    def __init__(
+                 self                 ,
+                 serialObj            , # sdec terminalData object
+                 serial_lock          , # lock shared with other serial users
+                 on_connect    = None , # called after a successful connect
+                 on_disconnect = None , # called after the link is lost
+                 port          = None   # fixed port, skips enumeration
+                ):
+        super().__init__( daemon = True, name = "connection manager" )
+        self.serialObj     = serialObj
+        self.serial_lock   = serial_lock
+        self.on_connect    = on_connect
+        self.on_disconnect = on_disconnect
+        self.port          = port
+        self.state         = DISCONNECTED
+        self.device        = None
+        self.backoff       = MIN_BACKOFF
+        self.next_attempt  = 0.0
+        self.dev_mtime     = None
+        self.failures      = 0
+        self.failure_event = threading.Event()
+        self.stop_event    = threading.Event()
+
+        # Health metrics
+        self.num_scans       = 0
+        self.num_attempts    = 0
+        self.num_connects    = 0
+        self.num_disconnects = 0
+        self.connect_time    = None
+    ## __init__ ##
+
+    # Thread body
+    def run( self ):
+        while ( not self.stop_event.is_set() ):
+            if ( self.state == CONNECTED ):
+                self._check_link()
+            elif ( self._hotplug() or ( time.monotonic() >= self.next_attempt ) ):
+                self._attempt()
+            self.stop_event.wait( WATCH_PERIOD )
+    ## run ##
+
+    # True if entries were added to or removed from /dev since the last check
+    def _hotplug( self ):
+        if ( DEVICE_DIR is None ):
+            return False
+        try:
+            mtime = os.stat( DEVICE_DIR ).st_mtime_ns
+        except OSError:
+            return False
+        changed        = ( self.dev_mtime is not None ) and ( mtime != self.dev_mtime )
+        self.dev_mtime = mtime
+        return changed
+    ## _hotplug ##
+
+    # Look for the controller and try to connect
+    def _attempt( self ):
+        self.num_attempts += 1
+        device = self.port
+        if ( device is None ):
+            self.num_scans += 1
+            device = find_controller_port()
+        if ( device is not None ):
+            connect_args = [ '-p', device ]
+            try:
+                with self.serial_lock:
+                    commands.connect( connect_args, self.serialObj )
+            except Exception:
+                pass
+        if ( ( device is not None ) and ( self.serialObj.comport != None ) ):
+            self.state        = CONNECTED
+            self.device       = device
+            self.backoff      = MIN_BACKOFF
+            self.failures     = 0
+            self.connect_time = time.monotonic()
+            self.num_connects += 1
+            self.failure_event.clear()
+            if ( self.on_connect is not None ):
+                try:
+                    self.on_connect( device )
+                except Exception:
+                    self._disconnect()
+        else:
+            self.state        = BACKOFF
+            self.next_attempt = time.monotonic() + self.backoff
+            self.backoff      = min( self.backoff*BACKOFF_FACTOR, MAX_BACKOFF )
+    ## _attempt ##
+
+    # Drop the connection if the device node vanished or polls keep failing
+    def _check_link( self ):
+        if ( self.failure_event.is_set() ):
+            self.failure_event.clear()
+            self.failures += 1
+        lost = self.failures >= MAX_FAILURES
+        if ( ( DEVICE_DIR is not None ) and ( self.device.startswith( DEVICE_DIR ) ) ):
+            lost = lost or not os.path.exists( self.device )
+        if ( lost ):
+            self._disconnect()
+    ## _check_link ##
+
+    # Close the port and start reconnecting. The port is closed before
+    # on_disconnect so nothing it tears down is left blocked on the dead link
+    def _disconnect( self ):
+        with self.serial_lock:
+            try:
+                self.serialObj.serialObj.close()
+            except Exception:
+                pass
+            self.serialObj.comport = None
+        if ( self.on_disconnect is not None ):
+            self.on_disconnect()
+        self.state         = DISCONNECTED
+        self.device        = None
+        self.connect_time  = None
+        self.next_attempt  = 0.0
+        self.num_disconnects += 1
+    ## _disconnect ##
+
+    # Report a failed poll, called from the acquisition thread
+    def report_failure( self ):
+        self.failure_event.set()
+    ## report_failure ##
+
+    # Report a successful poll, called from the acquisition thread
+    def report_success( self ):
+        self.failures = 0
+    ## report_success ##
+
+    # Connection health metrics
+    def get_health( self ):
+        uptime = 0.0
+        if ( self.connect_time is not None ):
+            uptime = time.monotonic() - self.connect_time
+        return {
+               "state"       : self.state          ,
+               "device"      : self.device         ,
+               "uptime"      : uptime              ,
+               "backoff"     : self.backoff        ,
+               "scans"       : self.num_scans      ,
+               "attempts"    : self.num_attempts   ,
+               "connects"    : self.num_connects   ,
+               "disconnects" : self.num_disconnects
+               }
+    ## get_health ##
+
+    # Stop the thread and wait for it to exit
+    def stop( self, timeout = 1.0 ):
+        self.stop_event.set()
+        if ( self.is_alive() ):
+            self.join( timeout )
+    ## stop ##
+## Connection_Manager ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
@@ -0,0 +1,180 @@
+####################################################################################
+#                                                                                  #
+# controller_protocol.py -- opcodes and payload layouts of the engine controller   #
+#                           serial protocol                                        #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import binascii
+import struct
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Command opcodes, these must match the sdec command modules
+PING_OP    = b'\x01'
+CONNECT_OP = b'\x02'
+SENSOR_OP  = b'\x03'
+ENGINE_OP  = b'\x04'
+
+# Name of the liquid engine controller in the sdec controller tables
+CONTROLLER_NAME = "Liquid Engine Controller"
+
+# Identity reported in response to the connect command
+LIQUID_ENGINE_CONTROLLER_ID = b'\x04'
+FIRMWARE_ID                 = b'\x01'
+
+# Sensor subcommand codes
+sensor_subcommand_codes = {
+                          "dump"         : b'\x01',
+                          "poll"         : b'\x02',
+                          "stream_start" : b'\x03',
+                          "stream_stop"  : b'\x04',
+                          "stream_rate"  : b'\x05'
+                          }
+
+# Engine controller subcommand codes, keyed by the engineController function name
+engine_subcommand_codes = {
+                          "pfpurge"          : b'\x01',
+                          "fillchill"        : b'\x02',
+                          "standby"          : b'\x03',
+                          "hotfire"          : b'\x04',
+                          "hotfire_abort"    : b'\x05',
+                          "hotfire_getstate" : b'\x06',
+                          "stop_hotfire"     : b'\x07',
+                          "stop_purge"       : b'\x08',
+                          "kbottle_close"    : b'\x09'
+                          }
+
+# Engine state codes returned in response to every engine subcommand
+engine_state_codes = {
+                     b'\x00' : "Initialization State",
+                     b'\x01' : "Ready State"         ,
+                     b'\x02' : "Pre-Fire Purge State",
+                     b'\x03' : "Fill and Chill State",
+                     b'\x04' : "Standby State"       ,
+                     b'\x05' : "Fire State"          ,
+                     b'\x06' : "Disarm State"        ,
+                     b'\x07' : "Post-Fire State"     ,
+                     b'\x08' : "Manual State"        ,
+                     b'\x09' : "Abort State"
+                     }
+
+# Sensors reported by the liquid engine controller, in frame order
+sensor_names = [ "pt0", "pt1", "pt2", "pt3", "pt4", "pt5", "pt6", "pt7", "lc", "tc" ]
+
+# Sensor dump payload: the controller's microsecond timestamp taken when the
+# sensors were sampled, then one little-endian float32 per sensor
+SENSOR_DUMP_FORMAT = "<I" + "f"*len( sensor_names )
+SENSOR_DUMP_SIZE   = struct.calcsize( SENSOR_DUMP_FORMAT )
+
+# Controller timestamp counter
+TIMESTAMP_TICKS_PER_SEC = 1000000
+TIMESTAMP_WRAP          = 2**32
+
+# Responses to the connect and engine commands
+CONNECT_RESPONSE_SIZE = 2 # controller id, firmware id
+ENGINE_RESPONSE_SIZE  = 1 # engine state code
+STREAM_ACK_SIZE       = 1 # acknowledges stream start/stop/rate
+
+# Stream rate subcommand argument: telemetry frame rate in Hz
+STREAM_RATE_FORMAT = "<H"
+STREAM_RATE_SIZE   = struct.calcsize( STREAM_RATE_FORMAT )
+
+# Streaming mode framing. While streaming, the controller pushes telemetry frames
+# continuously and wraps command responses in response frames:
+#   sync word (2) | frame type (1) | payload length (1) | sequence (2) | payload |
+#   CRC-16/CCITT of frame type through payload (2)
+STREAM_SYNC         = b'\xa5\x5a'
+FRAME_HEADER_FORMAT = "<2sBBH"
+FRAME_HEADER_SIZE   = struct.calcsize( FRAME_HEADER_FORMAT )
+FRAME_CRC_FORMAT    = "<H"
+FRAME_CRC_SIZE      = struct.calcsize( FRAME_CRC_FORMAT )
+FRAME_CRC_INIT      = 0xFFFF
+TELEMETRY_FRAME     = 0x01
+RESPONSE_FRAME      = 0x02
+frame_types         = ( TELEMETRY_FRAME, RESPONSE_FRAME )
+
+# Size of a complete telemetry frame
+TELEMETRY_FRAME_SIZE = FRAME_HEADER_SIZE + SENSOR_DUMP_SIZE + FRAME_CRC_SIZE
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         parse_sensor_dump                                                        #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Converts a sensor dump payload into the controller timestamp (ticks)     #
+#         and a sensor readouts dictionary                                         #
+#                                                                                  #
+####################################################################################
+def parse_sensor_dump( payload ):
+    values = struct.unpack( SENSOR_DUMP_FORMAT, payload )
+    return values[0], dict( zip( sensor_names, values[1:] ) )
+## parse_sensor_dump ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         frame_crc                                                                #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         CRC of a streaming frame body (frame type through payload)               #
+#                                                                                  #
+####################################################################################
+def frame_crc( body ):
+    return binascii.crc_hqx( body, FRAME_CRC_INIT )
+## frame_crc ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         build_frame                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Builds a complete streaming frame around a payload                       #
+#                                                                                  #
+####################################################################################
+def build_frame( frame_type, sequence, payload ):
+    header = struct.pack(
+                        FRAME_HEADER_FORMAT,
+                        STREAM_SYNC        ,
+                        frame_type         ,
+                        len( payload )     ,
+                        sequence & 0xFFFF
+                        )
+    body   = header[len( STREAM_SYNC ):] + payload
+    return header + payload + struct.pack( FRAME_CRC_FORMAT, frame_crc( body ) )
+## build_frame ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         parse_engine_state                                                       #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Converts an engine state code into the engine state name                 #
+#                                                                                  #
+####################################################################################
+def parse_engine_state( payload ):
+    return engine_state_codes.get( payload, "Unknown State" )
+## parse_engine_state ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
@@ -0,0 +1,329 @@
+####################################################################################
+#                                                                                  #
+# controller_sim.py -- simulated liquid engine controller behind a pseudo-terminal #
+#                      for hardware-free load and latency testing                  #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+# Usage:                                                                           #
+#       python controller_sim.py --rate 2000 --link /tmp/engine_sim                #
+#       python main.py --port /tmp/engine_sim --stream                             #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import argparse
+import os
+import select
+import struct
+import time
+import tty
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import controller_protocol as SDR_protocol
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Recorded profile replayed by default
+DEFAULT_PROFILE = "test/DAQexperimental/data/injector_test_700psi.txt"
+
+# Default streaming rate
+DEFAULT_RATE = 1000 # Hz
+
+# Longest time the simulator waits for a request before servicing the stream
+SERVICE_PERIOD = 0.002 # seconds
+
+# Engine state transitions, keyed by engine subcommand: ( required state, new
+# state ). A required state of None accepts any state
+engine_transitions = {
+              "pfpurge"          : ( "Ready State"         , "Pre-Fire Purge State" ),
+              "fillchill"        : ( "Pre-Fire Purge State", "Fill and Chill State" ),
+              "standby"          : ( "Fill and Chill State", "Standby State"        ),
+              "hotfire"          : ( "Standby State"       , "Fire State"           ),
+              "hotfire_abort"    : ( None                  , "Abort State"          ),
+              "hotfire_getstate" : ( None                  , None                   ),
+              "stop_hotfire"     : ( "Fire State"          , "Post-Fire State"      ),
+              "stop_purge"       : ( "Post-Fire State"     , "Disarm State"         ),
+              "kbottle_close"    : ( "Disarm State"        , "Ready State"          )
+                     }
+
+# Reverse lookups of the protocol tables
+engine_subcommand_names = { code: name for name, code in
+                            SDR_protocol.engine_subcommand_codes.items() }
+engine_state_values     = { state: code for code, state in
+                            SDR_protocol.engine_state_codes.items() }
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         load_profile                                                             #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Loads a recorded space-separated profile. The first column is time in    #
+#         seconds; the remaining columns fill the sensor channels in order, and    #
+#         any channel without a column reads zero. A text header row is skipped    #
+#                                                                                  #
+####################################################################################
+def load_profile( filename ):
+    with open( filename ) as file:
+        first_line = file.readline().split()
+    try:
+        [ float( value ) for value in first_line ]
+        skiprows = 0
+    except ValueError:
+        skiprows = 1
+    data     = np.loadtxt( filename, skiprows = skiprows, ndmin = 2 )
+    times    = data[:, 0] - data[0, 0]
+    channels = np.zeros( ( len( times ), len( SDR_protocol.sensor_names ) ),
+                         dtype = np.float32 )
+    num_columns = min( data.shape[1] - 1, channels.shape[1] )
+    channels[:, :num_columns] = data[:, 1:num_columns + 1]
+    return times, channels
+## load_profile ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Controller_Simulator                                                       #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Serves the engine controller protocol on the master side of a pty. The     #
+#       recorded profile is replayed in a loop, scaled in time by speed; in        #
+#       streaming mode telemetry frames are pushed at rate Hz, sent in small       #
+#       batches so kHz rates do not need a syscall per frame                       #
+#                                                                                  #
+####################################################################################
+class Controller_Simulator:
+
+    # Initialization
+    def __init__(
+                 self                     ,
+                 profile = DEFAULT_PROFILE, # recorded profile filename
+                 rate    = DEFAULT_RATE   , # streaming rate in Hz
+                 speed   = 1.0            , # profile replay speed
+                 link    = None             # optional symlink to the pty
+                ):
+        self.times, self.channels = load_profile( profile )
+        self.duration     = self.times[-1]
+        self.rate         = rate
+        self.speed        = speed
+        self.master_fd, slave_fd = os.openpty()
+        tty.setraw( slave_fd )
+        os.set_blocking( self.master_fd, False )
+        self.slave_fd     = slave_fd
+        self.device       = os.ttyname( slave_fd )
+        self.link         = link
+        if ( link is not None ):
+            if ( os.path.lexists( link ) ):
+                os.remove( link )
+            os.symlink( self.device, link )
+        self.engine_state = "Ready State"
+        self.streaming    = False
+        self.sequence     = 0
+        self.start_time   = time.perf_counter()
+        self.next_frame   = 0.0
+        self.requests     = bytearray()
+        self.num_frames   = 0
+        self.num_dropped  = 0 # bytes the host was too slow to accept
+    ## __init__ ##
+
+    # Write to the host, dropping whatever does not fit in the pty buffer like
+    # a UART with nobody listening
+    def _write( self, data ):
+        try:
+            written = os.write( self.master_fd, data )
+        except BlockingIOError:
+            written = 0
+        self.num_dropped += len( data ) - written
+    ## _write ##
+
+    # Controller timestamp of a perf_counter time
+    def _ticks( self, now ):
+        return int( ( now - self.start_time )*SDR_protocol.TIMESTAMP_TICKS_PER_SEC
+                  ) % SDR_protocol.TIMESTAMP_WRAP
+    ## _ticks ##
+
+    # Sensor dump payload for a perf_counter time
+    def _dump( self, now ):
+        profile_time = ( ( now - self.start_time )*self.speed ) % self.duration
+        index        = np.searchsorted( self.times, profile_time )
+        index        = min( index, len( self.times ) - 1 )
+        return struct.pack(
+                          SDR_protocol.SENSOR_DUMP_FORMAT,
+                          self._ticks( now )             ,
+                          *self.channels[index].tolist()
+                          )
+    ## _dump ##
+
+    # Send a command response, framed while streaming
+    def _respond( self, payload ):
+        if ( self.streaming ):
+            payload = SDR_protocol.build_frame( SDR_protocol.RESPONSE_FRAME, 0, payload )
+        self._write( payload )
+    ## _respond ##
+
+    # Apply an engine subcommand, returns the engine state code
+    def _engine_command( self, subcommand ):
+        required, new_state = engine_transitions.get(
+                                  engine_subcommand_names.get( subcommand ),
+                                  ( None, None ) )
+        if ( ( new_state is not None ) and
+             ( ( required is None ) or ( required == self.engine_state ) ) ):
+            self.engine_state = new_state
+        return engine_state_values[self.engine_state]
+    ## _engine_command ##
+
+    # Handle all complete requests received so far
+    def _handle_requests( self ):
+        requests = self.requests
+        while ( len( requests ) > 0 ):
+            opcode = bytes( requests[:1] )
+            if   ( opcode == SDR_protocol.PING_OP ):
+                del requests[:1]
+                self._respond( SDR_protocol.PING_OP )
+            elif ( opcode == SDR_protocol.CONNECT_OP ):
+                del requests[:1]
+                self._respond( SDR_protocol.LIQUID_ENGINE_CONTROLLER_ID +
+                               SDR_protocol.FIRMWARE_ID )
+            elif ( opcode in ( SDR_protocol.SENSOR_OP, SDR_protocol.ENGINE_OP ) ):
+                if ( len( requests ) < 2 ):
+                    return
+                subcommand = bytes( requests[1:2] )
+                if ( ( opcode == SDR_protocol.SENSOR_OP ) and
+                     ( subcommand ==
+                       SDR_protocol.sensor_subcommand_codes["stream_rate"] ) and
+                     ( len( requests ) < 2 + SDR_protocol.STREAM_RATE_SIZE ) ):
+                    return
+                del requests[:2]
+                if ( opcode == SDR_protocol.ENGINE_OP ):
+                    self._respond( self._engine_command( subcommand ) )
+                elif ( subcommand == SDR_protocol.sensor_subcommand_codes["dump"] ):
+                    self._respond( self._dump( time.perf_counter() ) )
+                elif ( subcommand ==
+                       SDR_protocol.sensor_subcommand_codes["stream_start"] ):
+                    self._respond( b'\x01' )
+                    self.streaming  = True
+                    self.next_frame = time.perf_counter()
+                elif ( subcommand ==
+                       SDR_protocol.sensor_subcommand_codes["stream_stop"] ):
+                    self._respond( b'\x01' )
+                    self.streaming  = False
+                elif ( subcommand ==
+                       SDR_protocol.sensor_subcommand_codes["stream_rate"] ):
+                    rate = struct.unpack_from( SDR_protocol.STREAM_RATE_FORMAT,
+                                               requests )[0]
+                    del requests[:SDR_protocol.STREAM_RATE_SIZE]
+                    if ( rate > 0 ):
+                        self.rate = rate
+                    self.next_frame = max( self.next_frame, time.perf_counter() )
+                    self._respond( b'\x01' )
+            else:
+                # Unknown opcode, drop it
+                del requests[:1]
+    ## _handle_requests ##
+
+    # Push every telemetry frame that is due
+    def _stream( self ):
+        now    = time.perf_counter()
+        frames = []
+        while ( self.next_frame <= now ):
+            frames.append( SDR_protocol.build_frame(
+                                                   SDR_protocol.TELEMETRY_FRAME,
+                                                   self.sequence               ,
+                                                   self._dump( self.next_frame )
+                                                   ) )
+            self.sequence   += 1
+            self.next_frame += 1.0/self.rate
+        if ( len( frames ) > 0 ):
+            self._write( b"".join( frames ) )
+            self.num_frames += len( frames )
+    ## _stream ##
+
+    # Serve requests until interrupted
+    def serve( self ):
+        while ( True ):
+            readable, _, _ = select.select( [ self.master_fd ], [], [],
+                                            SERVICE_PERIOD )
+            if ( len( readable ) > 0 ):
+                try:
+                    self.requests.extend( os.read( self.master_fd, 4096 ) )
+                except OSError:
+                    pass
+                self._handle_requests()
+            if ( self.streaming ):
+                self._stream()
+    ## serve ##
+
+    # Close the pty and remove the symlink
+    def close( self ):
+        if ( ( self.link is not None ) and os.path.islink( self.link ) ):
+            os.remove( self.link )
+        os.close( self.master_fd )
+        os.close( self.slave_fd )
+    ## close ##
+## Controller_Simulator ##
+
+
+####################################################################################
+# Simulator entry point                                                            #
+####################################################################################
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(
+                         description = "Simulated SDR liquid engine controller" )
+    arg_parser.add_argument(
+                           "--profile"                        ,
+                           default = DEFAULT_PROFILE          ,
+                           help    = "recorded profile to replay"
+                           )
+    arg_parser.add_argument(
+                           "--rate"                           ,
+                           type    = float                    ,
+                           default = DEFAULT_RATE             ,
+                           help    = "streaming rate in Hz"
+                           )
+    arg_parser.add_argument(
+                           "--speed"                          ,
+                           type    = float                    ,
+                           default = 1.0                      ,
+                           help    = "profile replay speed multiplier"
+                           )
+    arg_parser.add_argument(
+                           "--link"                           ,
+                           default = None                     ,
+                           help    = "symlink to create for the pty device"
+                           )
+    args = arg_parser.parse_args()
+
+    simulator = Controller_Simulator( args.profile, args.rate, args.speed, args.link )
+    print( "Simulated engine controller on " + simulator.device )
+    if ( args.link is not None ):
+        print( "Linked to " + args.link )
+    try:
+        simulator.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print( "Streamed " + str( simulator.num_frames ) + " frames, dropped " +
+               str( simulator.num_dropped ) + " bytes" )
+        simulator.close()
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
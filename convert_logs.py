@@ -0,0 +1,407 @@
+####################################################################################
+#                                                                                  #
+# convert_logs.py -- batch converter from text engine logs to the binary log       #
+#                    formats                                                       #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+# Usage: python convert_logs.py [paths ...] [--format compressed] [--jobs N]       #
+#       Converts every engine_dataN.txt under the given files and directories      #
+#       (default output/) next to the original, or under --output-dir. Converted   #
+#       files are recorded in a manifest, so an interrupted batch picks up where   #
+#       it stopped and unchanged logs are skipped on later runs                    #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import re
+import shutil
+import sys
+import time
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import sensor_frames  as SDR_sensor_frames
+import log_writer     as SDR_log_writer
+import compressed_log as SDR_compressed_log
+import run_journal    as SDR_run_journal
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Text logs to convert
+TEXT_LOG_PATTERN = "engine_data*.txt"
+
+# Logs modified this recently may still be written by a running GUI
+ACTIVE_PERIOD = 10.0 # seconds
+
+# Manifest of converted logs, kept in the output directory
+MANIFEST_FILENAME = "convert_manifest.json"
+
+# Suffix of a conversion in progress
+PARTIAL_SUFFIX = ".partial"
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         find_text_logs                                                           #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Lists the text logs named by paths, searching directories recursively    #
+#                                                                                  #
+####################################################################################
+def find_text_logs( paths ):
+    filenames = []
+    for path in paths:
+        if ( os.path.isdir( path ) ):
+            filenames += glob.glob( os.path.join( path, "**", TEXT_LOG_PATTERN ),
+                                    recursive = True )
+        elif ( os.path.isfile( path ) ):
+            filenames.append( path )
+    return sorted( set( filenames ) )
+## find_text_logs ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         output_filenames                                                         #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Converted log and notes filenames of a text log. Notes follow main.py's  #
+#         engine_notesN.txt naming                                                 #
+#                                                                                  #
+####################################################################################
+def output_filenames( source, log_format, input_root = None, output_dir = None ):
+    directory = os.path.dirname( source )
+    if ( output_dir is not None ):
+        relative  = os.path.relpath( directory, input_root or directory )
+        directory = os.path.normpath( os.path.join( output_dir, relative ) )
+    name      = os.path.splitext( os.path.basename( source ) )[0]
+    extension = SDR_log_writer.log_extensions[log_format]
+    dest      = os.path.join( directory, name + extension )
+    if ( name.startswith( "engine_data" ) ):
+        notes_name = re.sub( "^engine_data", "engine_notes", name ) + ".txt"
+    else:
+        notes_name = name + "_notes.txt"
+    return dest, os.path.join( directory, notes_name )
+## output_filenames ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         remove_path                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Removes a file or a directory log if it exists                           #
+#                                                                                  #
+####################################################################################
+def remove_path( path ):
+    if ( os.path.isdir( path ) ):
+        shutil.rmtree( path )
+    elif ( os.path.exists( path ) ):
+        os.remove( path )
+## remove_path ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         convert_log                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Converts one text log. The log and its notes are written under partial   #
+#         names and renamed into place once complete, so an interrupted            #
+#         conversion never looks finished. Runs in a worker process; returns a     #
+#         dictionary of results                                                    #
+#                                                                                  #
+####################################################################################
+def convert_log(
+               source                          ,
+               dest                            ,
+               notes                           ,
+               log_format = "compressed"       ,
+               codec      = "zlib"             ,
+               chunk_rows = SDR_sensor_frames.DEFAULT_CHUNK_ROWS
+               ):
+    start_time    = time.perf_counter()
+    dtype         = SDR_sensor_frames.sample_dtype
+    partial_dest  = dest  + PARTIAL_SUFFIX
+    partial_notes = notes + PARTIAL_SUFFIX
+    for path in ( partial_dest, partial_dest + SDR_run_journal.INDEX_EXTENSION,
+                  partial_notes ):
+        remove_path( path )
+    os.makedirs( os.path.dirname( dest ) or ".", exist_ok = True )
+    units         = { "time": "s" }
+    log_file      = SDR_log_writer.open_log_file(
+                                   log_format                                  ,
+                                   partial_dest                                ,
+                                   dtype                                       ,
+                                   units          = units                      ,
+                                   notes_filename = partial_notes              ,
+                                   codec          = codec                      ,
+                                   metadata       = { "source":
+                                                      os.path.basename( source ) }
+                                                  )
+    stats    = { "skipped": 0 }
+    num_rows = 0
+    for item in SDR_sensor_frames.read_text_log( source, dtype, stats,
+                                                 chunk_rows ):
+        if ( isinstance( item, np.ndarray ) ):
+            log_file.write_samples( item )
+            num_rows += len( item )
+        else:
+            log_file.write_text( item )
+    log_file.close()
+    for suffix in ( "", SDR_run_journal.INDEX_EXTENSION ):
+        if ( os.path.exists( partial_dest + suffix ) ):
+            remove_path( dest + suffix )
+            os.replace( partial_dest + suffix, dest + suffix )
+    has_notes = os.path.exists( partial_notes )
+    if ( has_notes ):
+        os.replace( partial_notes, notes )
+    return {
+           "source"  : source                             ,
+           "dest"    : dest                               ,
+           "notes"   : notes if has_notes else None       ,
+           "rows"    : num_rows                           ,
+           "skipped" : stats["skipped"]                   ,
+           "bytes"   : os.path.getsize( source )          ,
+           "seconds" : time.perf_counter() - start_time
+           }
+## convert_log ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         source_signature                                                         #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Size and modification time of a text log, compared against the           #
+#         manifest to tell whether it changed since it was converted               #
+#                                                                                  #
+####################################################################################
+def source_signature( source ):
+    status = os.stat( source )
+    return [ status.st_size, status.st_mtime ]
+## source_signature ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         read_manifest                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Reads the manifest of converted logs, keyed by absolute source path      #
+#                                                                                  #
+####################################################################################
+def read_manifest( manifest_filename ):
+    if ( not os.path.exists( manifest_filename ) ):
+        return {}
+    with open( manifest_filename, "r" ) as file:
+        return json.load( file )
+## read_manifest ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         write_manifest                                                           #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Writes the manifest, replacing the previous one in a single step         #
+#                                                                                  #
+####################################################################################
+def write_manifest( manifest_filename, manifest ):
+    temp_filename = manifest_filename + ".tmp"
+    with open( temp_filename, "w" ) as file:
+        json.dump( manifest, file, indent = 4, sort_keys = True )
+    os.replace( temp_filename, manifest_filename )
+## write_manifest ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         convert_all                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Converts the text logs under paths across a pool of jobs worker          #
+#         processes, largest first. Logs already in the manifest with the same     #
+#         size, modification time and format, and logs still being written, are    #
+#         skipped. The manifest is saved after every converted log. Prints one     #
+#         line per log and a summary with the overall throughput in MB/s           #
+#                                                                                  #
+####################################################################################
+def convert_all(
+               paths                           ,
+               log_format = "compressed"       ,
+               codec      = "zlib"             ,
+               jobs       = None               ,
+               output_dir = None               ,
+               chunk_rows = SDR_sensor_frames.DEFAULT_CHUNK_ROWS,
+               force      = False
+               ):
+    input_root = paths[0]
+    if ( not os.path.isdir( input_root ) ):
+        input_root = os.path.dirname( input_root ) or "."
+    manifest_filename = os.path.join( output_dir or input_root, MANIFEST_FILENAME )
+    manifest          = read_manifest( manifest_filename )
+
+    # Logs left to convert
+    pending     = []
+    num_skipped = 0
+    now         = time.time()
+    for source in find_text_logs( paths ):
+        signature   = source_signature( source )
+        dest, notes = output_filenames( source, log_format, input_root, output_dir )
+        entry       = manifest.get( os.path.abspath( source ) )
+        if ( ( not force ) and ( entry is not None ) and
+             ( entry["signature"] == signature ) and
+             ( entry["format"] == log_format ) and
+             os.path.exists( entry["dest"] ) ):
+            num_skipped += 1
+            continue
+        if ( now - signature[1] < ACTIVE_PERIOD ):
+            print( "skipping {}, still being written".format( source ) )
+            num_skipped += 1
+            continue
+        pending.append( ( signature[0], source, dest, notes, signature ) )
+    pending.sort( reverse = True )
+
+    # Convert across the worker pool
+    total_bytes = 0
+    num_failed  = 0
+    start_time  = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor( max_workers = jobs ) as pool:
+        futures = {}
+        for _, source, dest, notes, signature in pending:
+            future = pool.submit( convert_log, source, dest, notes, log_format,
+                                  codec, chunk_rows )
+            futures[future] = ( source, signature )
+        for future in concurrent.futures.as_completed( futures ):
+            source, signature = futures[future]
+            try:
+                result = future.result()
+            except Exception as error:
+                print( "failed   {}: {}".format( source, error ) )
+                num_failed += 1
+                continue
+            total_bytes += result["bytes"]
+            manifest[os.path.abspath( source )] = {
+                                     "signature": signature          ,
+                                     "format"   : log_format         ,
+                                     "dest"     : result["dest"]     ,
+                                     "rows"     : result["rows"]     ,
+                                     "skipped"  : result["skipped"]
+                                                  }
+            write_manifest( manifest_filename, manifest )
+            line = "{} -> {}  {} rows  {:.1f} MB  {:.1f} MB/s".format(
+                       source                                             ,
+                       result["dest"]                                     ,
+                       result["rows"]                                     ,
+                       result["bytes"]/1e6                                ,
+                       result["bytes"]/1e6/max( result["seconds"], 1e-9 )
+                                                                       )
+            if ( result["skipped"] > 0 ):
+                line += "  ({} bad rows skipped)".format( result["skipped"] )
+            print( line )
+    elapsed = time.perf_counter() - start_time
+    print( "converted {} logs, {:.1f} MB in {:.1f} s ({:.1f} MB/s), {} skipped, "
+           "{} failed".format( len( pending ) - num_failed                 ,
+                               total_bytes/1e6                              ,
+                               elapsed                                      ,
+                               total_bytes/1e6/max( elapsed, 1e-9 )         ,
+                               num_skipped                                  ,
+                               num_failed                                   ) )
+    return num_failed == 0
+## convert_all ##
+
+
+####################################################################################
+# Main application entry point                                                     #
+####################################################################################
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(
+                 description = "Convert text engine logs to a binary log format" )
+    arg_parser.add_argument(
+                           "paths"                                           ,
+                           nargs   = "*"                                     ,
+                           default = [ "output" ]                            ,
+                           help    = "text logs or directories to search"
+                           )
+    arg_parser.add_argument(
+                           "--format"                                        ,
+                           choices = [ log_format for log_format in
+                                       SDR_log_writer.log_extensions
+                                       if ( log_format != "text" ) ]         ,
+                           default = "compressed"                            ,
+                           help    = "output log format, compressed logs store " +
+                                     "each block column by column"
+                           )
+    arg_parser.add_argument(
+                           "--compression"                                   ,
+                           choices = list( SDR_compressed_log.codecs )       ,
+                           default = "zlib"                                  ,
+                           help    = "codec of --format compressed"
+                           )
+    arg_parser.add_argument(
+                           "--jobs"                                          ,
+                           type    = int                                     ,
+                           default = None                                    ,
+                           help    = "worker processes, default one per CPU core"
+                           )
+    arg_parser.add_argument(
+                           "--output-dir"                                    ,
+                           default = None                                    ,
+                           help    = "write converted logs under this directory " +
+                                     "instead of next to the originals"
+                           )
+    arg_parser.add_argument(
+                           "--chunk-rows"                                    ,
+                           type    = int                                     ,
+                           default = SDR_sensor_frames.DEFAULT_CHUNK_ROWS    ,
+                           help    = "text lines parsed at a time per log"
+                           )
+    arg_parser.add_argument(
+                           "--force"                                         ,
+                           action  = "store_true"                            ,
+                           help    = "convert logs already in the manifest"
+                           )
+    args = arg_parser.parse_args()
+    success = convert_all(
+                         args.paths                    ,
+                         log_format = args.format      ,
+                         codec      = args.compression ,
+                         jobs       = args.jobs        ,
+                         output_dir = args.output_dir  ,
+                         chunk_rows = args.chunk_rows  ,
+                         force      = args.force
+                         )
+    sys.exit( 0 if success else 1 )
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
@@ -13,13 +13,179 @@
 ###############################################################
 # Standard Imports                                            #
 ###############################################################
+import collections
+import math
 from tkinter import *
 
+# Sprite rendering
+from PIL import Image, ImageDraw, ImageTk
+
+
+###############################################################
+# Global variables                                            #
+###############################################################
+
+# Gauge angle resolution, about half a pixel along the arc.
+# Angle changes smaller than this are not redrawn
+DEFAULT_ANGLE_STEP = 0.5 # degrees
+
+# Readout resolution in sensor units. Readout changes smaller
+# than this are not redrawn, 0 redraws any change in the text
+DEFAULT_TEXT_STEP  = 0.0
+
+# Space taken by one gauge
+GAUGE_WIDTH  = 190
+GAUGE_HEIGHT = 200
+
+# Sprites are drawn this many times larger, then scaled
+# down, to antialias the arcs
+SPRITE_SUPERSAMPLING = 3
+
 
 ###############################################################
 # Objects                                                     #
 ###############################################################
 
+# Least recently used cache of gauge sprite images, shared by
+# gauges of any number of styles. Every fill level of each
+# style added is rendered ahead of use in Tk idle callbacks,
+# one level per callback, so frames keep their pace meanwhile
+class sprite_cache:
+
+	###########################################################
+	# Class attribute initializations                         #
+	###########################################################
+    def __init__(self,
+                 max_sprites = None # sprites kept before
+                                # evicting, every level of the
+                                # styles added when None
+                 ):
+        self.max_sprites = max_sprites
+        self.sprites     = collections.OrderedDict()
+        self.styles      = {}   # style: number of fill levels
+        self.pending     = collections.deque() # (key, render)
+        self.widget      = None # schedules pre-rendering
+
+		# Cache metrics
+        self.num_hits      = 0
+        self.num_misses    = 0
+        self.num_evictions = 0
+
+	###########################################################
+	# API methods                                             #
+	###########################################################
+
+	# Sprites kept before evicting
+    def getCapacity(self):
+        if( self.max_sprites is not None ):
+            return self.max_sprites
+        return sum(self.styles.values())
+
+	# Queue every fill level of a style for rendering from
+	# widget's idle callbacks. A style holds everything the
+	# sprites depend on but the fill level: gauge size,
+	# colours and angle resolution. render(level) draws one
+	# level; the emptiest levels come first, as gauges start
+	# near empty
+    def addStyle(self, widget, style, num_levels, render):
+        if( style in self.styles ):
+            return
+        self.styles[style] = num_levels
+        for level in reversed(range(num_levels)):
+            self.pending.append((style + (level,),
+                                 lambda level=level: render(level)))
+        if( self.widget is None ):
+            self.widget = widget
+            self.widget.after_idle(self.prerender)
+
+	# Render the next queued level not yet in the cache
+    def prerender(self):
+        while( self.pending ):
+            key, render = self.pending.popleft()
+            if( key not in self.sprites ):
+                self.putSprite(key, render())
+                break
+        if( self.pending ):
+            self.widget.after_idle(self.prerender)
+        else:
+            self.widget = None
+
+	# Sprite of key, made by render() and cached on a miss,
+	# which only happens for a level not yet pre-rendered.
+	# Keys are a style followed by the fill level
+    def getSprite(self, key, render):
+        sprite = self.sprites.get(key)
+        if( sprite is not None ):
+            self.sprites.move_to_end(key)
+            self.num_hits += 1
+            return sprite
+        self.num_misses += 1
+        sprite = render()
+        self.putSprite(key, sprite)
+        return sprite
+
+	# Cache a sprite, evicting the least recently used ones
+	# beyond the capacity
+    def putSprite(self, key, sprite):
+        self.sprites[key] = sprite
+        while( len(self.sprites) > self.getCapacity() ):
+            self.sprites.popitem(last=False)
+            self.num_evictions += 1
+
+	# Cache hits, misses and evictions
+    def getCounts(self):
+        return self.num_hits, self.num_misses, self.num_evictions
+
+# Sprites of gauges not given their own cache
+default_sprites = sprite_cache()
+
+# Minimum and maximum of the values of the last window seconds.
+# Each is kept with a monotonic deque of (time, value) pairs,
+# dropping values that can no longer be an extremum, so an
+# update costs amortised O(1) for any window length
+class rolling_extrema:
+
+	###########################################################
+	# Class attribute initializations                         #
+	###########################################################
+    def __init__(self,
+                 window         # window length in seconds
+                 ):
+        self.window    = window
+        self.max_queue = collections.deque() # decreasing values
+        self.min_queue = collections.deque() # increasing values
+
+	###########################################################
+	# API methods                                             #
+	###########################################################
+
+	# Add a value at time_sec, times must not decrease.
+	# NaN values are ignored
+    def add(self, time_sec, value):
+        if( value != value ):
+            return
+        while( self.max_queue and self.max_queue[-1][1] <= value ):
+            self.max_queue.pop()
+        self.max_queue.append((time_sec, value))
+        while( self.min_queue and self.min_queue[-1][1] >= value ):
+            self.min_queue.pop()
+        self.min_queue.append((time_sec, value))
+
+		# Drop extrema older than the window
+        window_start = time_sec - self.window
+        while( self.max_queue[0][0] < window_start ):
+            self.max_queue.popleft()
+        while( self.min_queue[0][0] < window_start ):
+            self.min_queue.popleft()
+
+	# Window maximum, None before any value
+    def getMax(self):
+        return self.max_queue[0][1] if( self.max_queue ) else None
+
+	# Window minimum, None before any value
+    def getMin(self):
+        return self.min_queue[0][1] if( self.min_queue ) else None
+
 # Gauge for displaying sensor data
 class gauge:
 
@@ -29,8 +195,22 @@ class gauge:
     def __init__(self,          # gauge class 
                  root,          # window to draw gauge on
                  background,    # background color
-                 max_sensor_val # maximum value to display on 
+                 max_sensor_val,# maximum value to display on 
                                 # gauge
+                 angle_step = DEFAULT_ANGLE_STEP,# drawn angle
+                                # resolution in degrees
+                 canvas = None, # shared canvas to draw on,
+                                # a new canvas when None
+                 x = 0, y = 0,  # gauge position on canvas
+                 tag = 'gauge', # tag of all gauge items
+                 render_mode = 'arc', # 'arc' redraws canvas arcs,
+                                # 'sprite' swaps cached images
+                 sprites = None,# sprite_cache, default_sprites
+                                # when None
+                 peak_window = None,# seconds of min/max markers,
+                                # no markers when None
+                 text_step = DEFAULT_TEXT_STEP # readout
+                                # resolution in sensor units
                  ):
 		
 		# simple variables
@@ -41,72 +221,143 @@ class gauge:
         self.max_sensor_val =  max_sensor_val # maximum display 
                                               # value
         size                =  180            # size of gauge
+        self.angle_step     =  angle_step     # angle resolution
+        self.text_step      =  text_step      # readout resolution
+        self.size           =  size
+        self.background     =  background
+        self.arc_color      =  "#8a1919"      # dark red hex code
+        self.fill_color     =  "#ff0000"      # light red hex code
+        self.arc_width      =  20
+        self.render_mode    =  render_mode
+
+		# Last drawn angle and text, redrawn only when they change
+        self.drawn_angle    = None
+        self.drawn_readout  = None
+        self.drawn_value    = None
+        self.drawn_label    = None
+
+		# Canvas item updates applied and skipped as unchanged
+        self.num_redraws    = 0
+        self.num_skipped    = 0
 
 		# Canvas widget for drawing
-        self.canvas = Canvas(root,          # parent window 
-                             width=190,     # canvas dimensions
-                             height=200, 
-                             bg=background, # background color 
-                             highlightthickness=0 
-                            )
+        if( canvas is None ):
+            canvas = Canvas(root,               # parent window 
+                            width=GAUGE_WIDTH,  # canvas dimensions
+                            height=GAUGE_HEIGHT, 
+                            bg=background,      # background color 
+                            highlightthickness=0 
+                           )
+        self.canvas = canvas
+        self.tag    = tag
+
+		# Gauge arcs as one image item, swapped for the cached
+		# sprite of each drawn angle. Each angle step is one
+		# fill level, all rendered ahead of use
+        if( render_mode == 'sprite' ):
+            if( angle_step <= 0 ):
+                raise ValueError("sprite gauges need an angle_step")
+            if( sprites is None ):
+                sprites = default_sprites
+            self.sprites      = sprites
+            self.sprite_style = (size, background, self.arc_color,
+                                 self.fill_color, self.arc_width,
+                                 angle_step)
+            self.sprites.addStyle(
+                        canvas,
+                        self.sprite_style,
+                        int(round((self.endAngle - self.startAngle)/
+                                  angle_step)) + 1,
+                        lambda level: self.renderSprite(
+                                self.startAngle + level*angle_step)
+                                 )
+            self.drawn_sprite = None # keeps the shown image alive
+            self.sprite_item  = self.canvas.create_image(
+                        x + 30 - self.arc_width/2,  # upper left
+                        y + 20 - self.arc_width/2,  # corner
+                        anchor=NW,
+                        tags=(tag, tag + '.sprite')
+                                                        )
 
 		# Base gauge arc -- always draws start angle to end angle
-        self.gauge_arc = self.canvas.create_arc(
-						30, 20,                 # upper left corner
+        else:
+            self.gauge_arc = self.canvas.create_arc(
+						x + 30, y + 20,         # upper left corner
                                                 # coordinates 
-						size - 10, size - 10,   # lower right corner
-                                                # coordinates 
-						style="arc", width=20,  # arc width 
+						x + size - 10,          # lower right corner
+                        y + size - 10,          # coordinates 
+						style="arc",            # arc width
+                        width=self.arc_width,
 						start=self.startAngle,  # minimum drawing 
                                                 # angle 
 						# drawing angle
 						extent=(self.endAngle - self.startAngle)/2.0,
-                        outline="#8a1919",      # dark red hex code
-                        tags=('arc1', 'arc2')   # arc tags
+                        outline=self.arc_color, # dark red
+                        tags=('arc1', 'arc2',   # arc tags
+                              tag, tag + '.arc')
                                               )
 		
 		# Fill gauge arc -- draws start angle to display angle
-        self.gauge_fill_arc = self.canvas.create_arc(
-						30, 20,                 # upper left corner
+            self.gauge_fill_arc = self.canvas.create_arc(
+						x + 30, y + 20,         # upper left corner
                                                 # coordinates 
-						size - 10, size - 10,   # lower right corner
-												# coordinates 
-						width=20, style="arc",  # arc width 
+						x + size - 10,          # lower right corner
+						y + size - 10,          # coordinates 
+						style="arc",            # arc width
+                        width=self.arc_width,
 						start=90,               # minimum drawing angle 
 						# drawing angle 
 						extent=(self.endAngle - self.startAngle)/2.0,
-                        outline="#ff0000",      # light red hex code
-                        tags=('arc1', 'arc2')   # arc tags
+                        outline=self.fill_color,# light red
+                        tags=('arc1', 'arc2',   # arc tags
+                              tag, tag + '.fill')
                                                     )
 
+		# Peak-hold markers, ticks across the arc at the window
+		# maximum and minimum, hidden until values arrive
+        self.extrema = None
+        if( peak_window ):
+            self.extrema     = rolling_extrema(peak_window)
+            self.center      = (x + size/2 + 10, y + size/2 + 5)
+            self.radii       = (size/2 - 20, size/2 - 15)
+            self.drawn_marks = [None, None]
+            self.marks       = [
+                self.canvas.create_line(0, 0, 0, 0, width=3,
+                                        fill=color, state=HIDDEN,
+                                        tags=(tag, tag + name))
+                for name, color in (('.max', 'white'),
+                                    ('.min', '#808080'))
+                               ]
+
         # Gauge text for sensor value
         self.readout = self.canvas.create_text(
-                        100, 85,               # x-y coordinates
+                        x + 100, y + 85,       # x-y coordinates
                         font=("Arial",         # font properties
                                int(size / 10), 
                                'bold'), 
                         fill="white",          # text color
-                        text=''                # text contents
+                        text='',               # text contents
+                        tags=(tag, tag + '.readout')
                                              )
 
         # Gauge text for sensor name
         self.label = self.canvas.create_text(
-						100, 150,             # x-y coordinates
+						x + 100, y + 150,     # x-y coordinates
 						font=("Arial",        # font properties
                               int(size / 15), 
 							  'bold'), 
                         fill="white",         # text color
-                        text=''               # text contents
+                        text='',              # text contents
+                        tags=(tag, tag + '.label')
                                             )
 
 	###########################################################
 	# API methods                                             #
 	###########################################################
 
-	# Set the gauge display angle from sensor values 
-    def setAngle(self,        # gauge class 
-                 sensor_value # sensor value
-                ):
+	# Gauge angle of a sensor value, quantized to the angle
+	# resolution and saturated to the gauge arc
+    def getGaugeAngle(self, sensor_value):
 
         # Set gauge diplay angle
         gauge_angular_width = abs(self.endAngle - self.startAngle)
@@ -116,6 +367,11 @@ class gauge:
                       (gauge_percent_fill*gauge_angular_width)
                       )
 
+		# Quantize to the angle resolution
+        if( self.angle_step > 0 and math.isfinite(gauge_angle) ):
+            gauge_angle = ( round(gauge_angle/self.angle_step)*
+                            self.angle_step )
+
 		# Saturate gauge fill if sensor value goes out of bounds
         if( gauge_angle > self.endAngle):
             gauge_angle = self.endAngle
@@ -123,6 +379,27 @@ class gauge:
         if( gauge_angle < self.startAngle):
             gauge_angle = self.startAngle
 			# TODO: log this failure condition
+        return gauge_angle
+
+	# Set the gauge display angle from sensor values 
+    def setAngle(self,        # gauge class 
+                 sensor_value # sensor value
+                ):
+        gauge_angle = self.getGaugeAngle(sensor_value)
+
+		# Skip angles already drawn
+        num_items = 1 if( self.render_mode == 'sprite' ) else 2
+        if( gauge_angle == self.drawn_angle ):
+            self.num_skipped += num_items
+            return
+        self.drawn_angle  = gauge_angle
+
+		# Swap in the sprite of this angle
+        if( self.render_mode == 'sprite' ):
+            self.drawSprite(gauge_angle)
+            self.num_redraws += num_items
+            return
+        self.num_redraws += num_items
 
 		# Draw gauge using sensor value
         self.canvas.itemconfig(
@@ -136,17 +413,205 @@ class gauge:
                 extent=self.endAngle - gauge_angle  # angular width
                               ) 
 
+	# Add sensor values at times (seconds) to the peak-hold
+	# window and move the min/max markers if they changed
+    def addValues(self, times, sensor_values):
+        if( self.extrema is None ):
+            return
+        for time_sec, sensor_value in zip(times, sensor_values):
+            self.extrema.add(time_sec, sensor_value)
+        extrema = (self.extrema.getMax(), self.extrema.getMin())
+        for index, sensor_value in enumerate(extrema):
+            if( sensor_value is None ):
+                continue
+            mark_angle = self.getGaugeAngle(sensor_value)
+            if( mark_angle == self.drawn_marks[index] ):
+                self.num_skipped += 1
+                continue
+            self.drawMark(self.marks[index], mark_angle)
+            if( self.drawn_marks[index] is None ):
+                self.canvas.itemconfig(self.marks[index],
+                                       state=NORMAL)
+            self.drawn_marks[index] = mark_angle
+            self.num_redraws       += 1
+
+	# Place a marker tick across the gauge arc at mark_angle
+    def drawMark(self, mark, mark_angle):
+        cos    = math.cos(math.radians(mark_angle))
+        sin    = math.sin(math.radians(mark_angle))
+        reach  = self.arc_width/2 + 2
+        coords = []
+        for offset in (-reach, reach):
+            coords.append(self.center[0] +
+                          (self.radii[0] + offset)*cos)
+            coords.append(self.center[1] -
+                          (self.radii[1] + offset)*sin)
+        self.canvas.coords(mark, *coords)
+
+	# Window maximum and minimum, None before any values
+    def getExtrema(self):
+        if( self.extrema is None ):
+            return None, None
+        return self.extrema.getMax(), self.extrema.getMin()
+
+	# Show the gauge arcs at gauge_angle as a cached sprite
+    def drawSprite(self, gauge_angle):
+        if( not math.isfinite(gauge_angle) ):
+            gauge_angle = self.endAngle
+        level = round((gauge_angle - self.startAngle)/
+                      self.angle_step)
+        key   = self.sprite_style + (level,)
+        self.drawn_sprite = self.sprites.getSprite(
+                        key,
+                        lambda: self.renderSprite(gauge_angle)
+                                                  )
+        self.canvas.itemconfig(self.sprite_item,
+                               image=self.drawn_sprite)
+
+	# Draw the gauge arcs at gauge_angle into an image, the
+	# same as the canvas arcs: base arc from the start angle,
+	# fill arc on to the end angle
+    def renderSprite(self, gauge_angle):
+        scale  = SPRITE_SUPERSAMPLING
+        width  = self.size - 40 + self.arc_width
+        height = self.size - 30 + self.arc_width
+        image  = Image.new("RGB", (width*scale, height*scale),
+                           self.background)
+        draw   = ImageDraw.Draw(image)
+        bounds = [0, 0, width*scale - 1, height*scale - 1]
+
+		# PIL angles run clockwise, canvas angles counterclockwise
+        if( gauge_angle > self.startAngle ):
+            draw.arc(bounds, -gauge_angle, -self.startAngle,
+                     fill=self.arc_color,
+                     width=self.arc_width*scale)
+        if( gauge_angle < self.endAngle ):
+            draw.arc(bounds, -self.endAngle, -gauge_angle,
+                     fill=self.fill_color,
+                     width=self.arc_width*scale)
+        image = image.resize((width, height),
+                             Image.Resampling.LANCZOS)
+        return ImageTk.PhotoImage(image)
+
 	# Allow public access to canvas object
     def getWidget(self):
         return self.canvas
 
-	# Set the gauge text
+	# Set the gauge text. Given the sensor value, a readout
+	# within text_step of the drawn one is left as is
     def setText(self, 
                 sensor_val,  # sensor display value
-                sensor_label # sensor label
+                sensor_label,# sensor label
+                sensor_value = None # sensor value of the readout
                ):
-        self.canvas.itemconfig(self.readout, text=sensor_val)
-        self.canvas.itemconfig(self.label, text=sensor_label)
+        changed = sensor_val != self.drawn_readout
+        if( changed and sensor_value is not None and
+            self.text_step > 0 and self.drawn_value is not None and
+            math.isfinite(sensor_value) and
+            math.isfinite(self.drawn_value) ):
+            changed = ( abs(sensor_value - self.drawn_value) >=
+                        self.text_step )
+        if( changed ):
+            self.canvas.itemconfig(self.readout, text=sensor_val)
+            self.drawn_readout = sensor_val
+            self.drawn_value   = sensor_value
+            self.num_redraws  += 1
+        else:
+            self.num_skipped  += 1
+        if( sensor_label != self.drawn_label ):
+            self.canvas.itemconfig(self.label, text=sensor_label)
+            self.drawn_label   = sensor_label
+            self.num_redraws  += 1
+        else:
+            self.num_skipped  += 1
+
+	# Canvas item updates applied and skipped since creation
+    def getRedrawCounts(self):
+        return self.num_redraws, self.num_skipped
+
+
+# Panel of gauges drawn on one canvas
+class gauge_panel:
+
+	###########################################################
+	# Class attribute initializations                         #
+	###########################################################
+    def __init__(self,           # gauge panel class
+                 root,           # window to draw panel on
+                 background,     # background color
+                 max_sensor_vals,# maximum display value of
+                                 # each gauge
+                 columns = 4,    # gauges per row
+                 angle_step = DEFAULT_ANGLE_STEP,# drawn angle
+                                 # resolution in degrees
+                 render_mode = 'arc', # see gauge
+                 sprites = None, # sprite cache of sprite mode
+                 peak_window = None,# see gauge
+                 text_step = DEFAULT_TEXT_STEP # see gauge
+                 ):
+
+		# One canvas holding every gauge, row by row
+        rows        = -(-len(max_sensor_vals)//columns)
+        self.canvas = Canvas(root,                        # parent window
+                             width=columns*GAUGE_WIDTH,   # canvas dimensions
+                             height=rows*GAUGE_HEIGHT,
+                             bg=background,               # background color
+                             highlightthickness=0
+                            )
+
+		# Gauge i is tagged 'gauge<i>', its items 'gauge<i>.arc',
+		# 'gauge<i>.fill', 'gauge<i>.readout' and 'gauge<i>.label'
+        self.gauges = []
+        for index, max_sensor_val in enumerate(max_sensor_vals):
+            self.gauges.append(gauge(
+                               root,
+                               background,
+                               max_sensor_val,
+                               angle_step = angle_step,
+                               canvas = self.canvas,
+                               x = (index % columns)*GAUGE_WIDTH,
+                               y = (index//columns)*GAUGE_HEIGHT,
+                               tag = 'gauge' + str(index),
+                               render_mode = render_mode,
+                               sprites = sprites,
+                               peak_window = peak_window,
+                               text_step = text_step
+                                    ))
+
+	###########################################################
+	# API methods                                             #
+	###########################################################
+
+	# Apply a frame of readings in one pass, one
+	# (sensor value, display value, label) per gauge
+    def setReadings(self, readings):
+        for panel_gauge, reading in zip(self.gauges, readings):
+            sensor_value, sensor_val, sensor_label = reading
+            panel_gauge.setText(sensor_val, sensor_label,
+                                sensor_value)
+            panel_gauge.setAngle(sensor_value)
+
+	# Add a frame of samples to the peak-hold windows, one
+	# (times, sensor values) per gauge, None for no samples
+    def addValues(self, values):
+        for panel_gauge, gauge_values in zip(self.gauges, values):
+            if( gauge_values is not None ):
+                panel_gauge.addValues(*gauge_values)
+
+	# Gauges in panel order
+    def getGauges(self):
+        return self.gauges
+
+	# Allow public access to canvas object
+    def getWidget(self):
+        return self.canvas
+
+	# Canvas item updates applied and skipped, all gauges
+    def getRedrawCounts(self):
+        counts = [panel_gauge.getRedrawCounts()
+                  for panel_gauge in self.gauges]
+        return (sum(count[0] for count in counts),
+                sum(count[1] for count in counts))
 
 ###############################################################
 # END OF FILE                                                 #
@@ -0,0 +1,324 @@
+####################################################################################
+#                                                                                  #
+# log_reader.py -- one reader for every run log format                             #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+# Usage:                                                                           #
+#       log   = log_reader.open_log( "output/10-18-2026/engine_data0.sdrlog" )     #
+#       pt0   = log["pt0"]                                                         #
+#       burn  = log.time_slice( 12.0, 18.5 )                                       #
+#       units = log.get_units( "pt0" )                                             #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import bisect
+import os
+import re
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import sensor_frames  as SDR_sensor_frames
+import binary_log     as SDR_binary_log
+import segmented_log  as SDR_segmented_log
+import compressed_log as SDR_compressed_log
+import run_journal    as SDR_run_journal
+import log_writer     as SDR_log_writer
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Binary sidecar holding the parsed samples of a text log, written under the
+# partial suffix until complete
+CACHE_SUFFIX   = ".cache" + SDR_binary_log.FILE_EXTENSION
+PARTIAL_SUFFIX = ".partial"
+
+# Text log column name with units, e.g. "PT1(psi)"
+COLUMN_PATTERN = re.compile( r"^(.*?)\((.*)\)$" )
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         log_format                                                               #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Format of a log from its file extension, see log_writer.log_extensions.  #
+#         Unknown extensions are read as text                                      #
+#                                                                                  #
+####################################################################################
+def log_format( filename ):
+    extension = os.path.splitext( filename.rstrip( "/\\" ) )[1]
+    for name, format_extension in SDR_log_writer.log_extensions.items():
+        if ( extension == format_extension ):
+            return name
+    return "text"
+## log_format ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         text_log_layout                                                          #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Works out the columns of a text log from its first data line. A header   #
+#         line such as "Time(s) PT1(psi) PT2(psi) DP(psi)" names the columns,      #
+#         lower case, with units taken from the parentheses. A log without one     #
+#         holding one column per sensor_frames.sample_dtype field is an engine     #
+#         log; any other starts with time. Returns the dtype and units             #
+#                                                                                  #
+####################################################################################
+def text_log_layout( filename ):
+    fields = []
+    with open( filename, "r", errors = "replace" ) as file:
+        for line in file:
+            if ( ( not line.isspace() ) and
+                 ( not line.lstrip().startswith( "#" ) ) ):
+                fields = line.split()
+                break
+    try:
+        [ float( field ) for field in fields ]
+    except ValueError:
+        names = []
+        units = {}
+        for field in fields:
+            match = COLUMN_PATTERN.match( field )
+            name  = ( match.group( 1 ) if match else field ).lower()
+            names.append( name )
+            if ( match ):
+                units[name] = match.group( 2 )
+        return np.dtype( [ ( name, "<f8" ) for name in names ] ), units
+    if ( len( fields ) == len( SDR_sensor_frames.sample_dtype.names ) ):
+        return SDR_sensor_frames.sample_dtype, { "time": "s" }
+    return ( np.dtype( [ ( "time", "<f8" ) ] +
+                       [ ( "column" + str( column ), "<f8" )
+                         for column in range( 1, len( fields ) ) ] ),
+             { "time": "s" } )
+## text_log_layout ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         load_text_log                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Samples of a text log, parsed once into a binary_log sidecar next to it  #
+#         and memory mapped from there on. The sidecar records the size and        #
+#         modification time of the text log and is rebuilt when they change. If    #
+#         the sidecar cannot be written the samples are parsed into memory.        #
+#         Returns the header dictionary and the records                            #
+#                                                                                  #
+####################################################################################
+def load_text_log( filename ):
+    cache_filename = filename + CACHE_SUFFIX
+    status         = os.stat( filename )
+    source         = { "source"      : os.path.basename( filename ),
+                       "source_size" : status.st_size              ,
+                       "source_mtime": status.st_mtime             }
+
+    # Use the sidecar if it matches the text log
+    if ( os.path.exists( cache_filename ) ):
+        try:
+            header, _, _ = SDR_binary_log.read_header( cache_filename )
+            if ( header["metadata"] == source ):
+                return SDR_binary_log.load( cache_filename )
+        except ( OSError, ValueError ):
+            pass
+
+    # Parse the text log
+    dtype, units = text_log_layout( filename )
+    stats        = { "skipped": 0 }
+    samples      = SDR_sensor_frames.read_text_log( filename, dtype, stats )
+    partial      = cache_filename + PARTIAL_SUFFIX
+    try:
+        if ( os.path.exists( partial ) ):
+            os.remove( partial )
+        log_file = SDR_binary_log.Binary_Log_File( partial, dtype, units, source )
+    except OSError:
+        parts = [ np.zeros( 0, dtype = dtype ) ]
+        parts += [ item for item in samples if isinstance( item, np.ndarray ) ]
+        return ( { "metadata": source, "channels": [ { "name": name,
+                                                      "units": units.get( name ) }
+                                                    for name in dtype.names ] },
+                 np.concatenate( parts ) )
+    for item in samples:
+        if ( isinstance( item, np.ndarray ) ):
+            log_file.write_samples( item )
+    log_file.close()
+    os.replace( partial, cache_filename )
+    return SDR_binary_log.load( cache_filename )
+## load_text_log ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         time_range                                                               #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Row range [ first, last ) of time-ordered records between start_time     #
+#         and end_time (seconds, None for unbounded), found by binary search so    #
+#         only a handful of rows of a memory mapped log are read                   #
+#                                                                                  #
+####################################################################################
+def time_range( records, start_time = None, end_time = None ):
+    times = records["time"]
+    first = 0
+    last  = len( records )
+    if ( start_time is not None ):
+        first = bisect.bisect_left( times, start_time )
+    if ( end_time is not None ):
+        last  = bisect.bisect_right( times, end_time, first )
+    return first, last
+## time_range ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Log                                                                        #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		A run log of any format, read lazily. Channels are NumPy arrays: views of  #
+#       a memory map for binary logs and text logs (through their sidecar), of     #
+#       decoded blocks for compressed logs. Time slices of a single mapping are    #
+#       views and copy nothing; a slice spanning several segments, or of a         #
+#       compressed log or journal, has to be assembled and is a copy. Records are  #
+#       assumed to be in time order, as every log the GUI writes is                #
+#                                                                                  #
+####################################################################################
+class Log:
+
+    # Initialization
+    def __init__( self, filename, log_format_name = None ):
+        if ( log_format_name is None ):
+            log_format_name = log_format( filename )
+        self.filename = filename
+        self.format   = log_format_name
+        self.header   = None
+        self.records  = None # all records, loaded on first use
+        self.reader   = None # format reader for partial loads
+
+        # Read only the header until the samples are needed
+        if   ( self.format == "segmented" ):
+            self.reader = SDR_segmented_log.Segmented_Log( filename,
+                                                           include_partial = True )
+            segments    = self.reader.find_segments()
+            if ( len( segments ) > 0 ):
+                self.header, self.dtype, _ = SDR_binary_log.read_header(
+                                    os.path.join( filename, segments[0] ) )
+            else:
+                self.dtype = SDR_sensor_frames.sample_dtype
+        elif ( self.format == "compressed" ):
+            self.reader = SDR_compressed_log.Compressed_Log( filename )
+            self.header = self.reader.header
+            self.dtype  = self.reader.dtype
+        elif ( self.format == "journal" ):
+            self.reader = SDR_run_journal.Run_Journal( filename )
+            self.header = self.reader.header
+            self.dtype  = self.reader.dtype
+        elif ( self.format == "binary" ):
+            self.header, self.records = SDR_binary_log.load( filename )
+            self.dtype                = self.records.dtype
+        else:
+            self.header, self.records = load_text_log( filename )
+            self.dtype                = self.records.dtype
+    ## __init__ ##
+
+    # All records as one structured array
+    def get_records( self ):
+        if ( self.records is None ):
+            if ( self.format == "segmented" ):
+                _, records = self.reader.load()
+                if ( records is None ):
+                    records = np.zeros( 0, dtype = self.dtype )
+                self.records = records
+            elif ( self.format == "journal" ):
+                self.records = self.reader.load_samples()
+            else:
+                self.records = self.reader.load()
+        return self.records
+    ## get_records ##
+
+    # Channel names
+    def get_names( self ):
+        return list( self.dtype.names )
+    ## get_names ##
+
+    # Units of a channel, or None
+    def get_units( self, name ):
+        if ( self.header is None ):
+            return None
+        for channel in self.header["channels"]:
+            if ( channel["name"] == name ):
+                return channel["units"]
+        return None
+    ## get_units ##
+
+    # One channel over the whole log
+    def __getitem__( self, name ):
+        return self.get_records()[name]
+    ## __getitem__ ##
+
+    # Number of records
+    def __len__( self ):
+        return len( self.get_records() )
+    ## __len__ ##
+
+    # Records between start_time and end_time (seconds, None for unbounded).
+    # Logs that are not loaded yet only read the segments or blocks that
+    # overlap the range
+    def time_slice( self, start_time = None, end_time = None ):
+        if ( self.records is None ):
+            if ( self.format == "segmented" ):
+                segments = self.reader.find_segments( start_time, end_time )
+                if ( len( segments ) == 1 ):
+                    _, records  = SDR_binary_log.load( os.path.join( self.filename,
+                                                                     segments[0] ) )
+                    first, last = time_range( records, start_time, end_time )
+                    return records[first:last]
+                _, records = self.reader.load( start_time, end_time )
+                if ( records is None ):
+                    return np.zeros( 0, dtype = self.dtype )
+                return records
+            if ( self.format == "compressed" ):
+                return self.reader.load( start_time, end_time )
+        records     = self.get_records()
+        first, last = time_range( records, start_time, end_time )
+        return records[first:last]
+    ## time_slice ##
+## Log ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         open_log                                                                 #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Opens a log of any supported format, see Log                             #
+#                                                                                  #
+####################################################################################
+def open_log( filename, log_format_name = None ):
+    return Log( filename, log_format_name )
+## open_log ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
@@ -0,0 +1,370 @@
+####################################################################################
+#                                                                                  #
+# log_writer.py -- background writer thread for the run logs                       #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import os
+import queue
+import threading
+import time
+import traceback
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import sensor_frames  as SDR_sensor_frames
+import binary_log     as SDR_binary_log
+import segmented_log  as SDR_segmented_log
+import compressed_log as SDR_compressed_log
+import run_journal    as SDR_run_journal
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Flush policy, whichever limit is reached first
+DEFAULT_FLUSH_SIZE   = 4096 # samples
+DEFAULT_FLUSH_PERIOD = 0.25 # seconds
+
+# Period between fsync calls, 0 syncs after every flush and None never syncs
+DEFAULT_FSYNC_PERIOD = 1.0  # seconds
+
+# Queue item that stops the writer
+_STOP = None
+
+# Log formats and their file extensions
+log_extensions = {
+                 "text"      : ".txt"                                ,
+                 "binary"    : SDR_binary_log.FILE_EXTENSION         ,
+                 "segmented" : SDR_segmented_log.DIRECTORY_EXTENSION,
+                 "compressed": SDR_compressed_log.FILE_EXTENSION     ,
+                 "journal"   : SDR_run_journal.FILE_EXTENSION
+                 }
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         open_log_file                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Opens a log file of the given format for appending samples of dtype.     #
+#         units and notes_filename only apply to the binary formats, which keep    #
+#         text lines in the separate notes file; codec and block_period only to    #
+#         compressed logs. Journals keep text lines as note events. metadata is    #
+#         stored in the header of the binary formats                               #
+#                                                                                  #
+####################################################################################
+def open_log_file(
+                 log_format            ,
+                 filename              ,
+                 dtype                 ,
+                 units          = None ,
+                 notes_filename = None ,
+                 codec          = "zlib",
+                 metadata       = None  ,
+                 block_period   = SDR_compressed_log.DEFAULT_BLOCK_PERIOD
+                 ):
+    if ( log_format == "journal" ):
+        return SDR_run_journal.Run_Journal_File( filename, dtype, units = units,
+                                                 metadata = metadata )
+    if ( log_format == "compressed" ):
+        return SDR_compressed_log.Compressed_Log_File(
+                                             filename                       ,
+                                             dtype                          ,
+                                             units          = units         ,
+                                             metadata       = metadata      ,
+                                             notes_filename = notes_filename,
+                                             codec          = codec         ,
+                                             block_period   = block_period
+                                             )
+    if ( log_format == "segmented" ):
+        return SDR_segmented_log.Segmented_Log_File(
+                                             filename                       ,
+                                             dtype                          ,
+                                             units          = units         ,
+                                             metadata       = metadata      ,
+                                             notes_filename = notes_filename
+                                             )
+    if ( log_format == "binary" ):
+        return SDR_binary_log.Binary_Log_File(
+                                             filename                       ,
+                                             dtype                          ,
+                                             units          = units         ,
+                                             metadata       = metadata      ,
+                                             notes_filename = notes_filename
+                                             )
+    return Text_Log_File( filename )
+## open_log_file ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Text_Log_File                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Space-separated text log, one row per sample in field order. Text lines    #
+#       are written into the log as they are                                       #
+#                                                                                  #
+####################################################################################
+class Text_Log_File:
+
+    # Initialization
+    def __init__( self, filename ):
+        self.filename = filename
+        self.file     = open( filename, "a" )
+    ## __init__ ##
+
+    # Append a structured array of samples
+    def write_samples( self, samples ):
+        SDR_sensor_frames.write_text_rows( self.file, samples )
+    ## write_samples ##
+
+    # Append a line of text
+    def write_text( self, text ):
+        self.file.write( text )
+    ## write_text ##
+
+    # Flush buffered data to the operating system
+    def flush( self ):
+        self.file.flush()
+    ## flush ##
+
+    # Force flushed data to disk
+    def sync( self ):
+        os.fsync( self.file.fileno() )
+    ## sync ##
+
+    # Close the log
+    def close( self ):
+        self.file.close()
+    ## close ##
+## Text_Log_File ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Log_Writer                                                                 #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Owns one open log file (Text_Log_File, binary_log.Binary_Log_File) on a    #
+#       dedicated thread. The GUI loop only enqueues sample arrays and text lines; #
+#       the writer batches them, writes a batch once flush_size samples are        #
+#       waiting or flush_period has passed since the first of them arrived, and    #
+#       fsyncs every fsync_period and on stop. A log file whose flush() returns    #
+#       a time is flushed again at that time even if no new items arrive.          #
+#       on_write( samples, time ) is called from the writer thread after each      #
+#       batch of samples is written, with the run time the write completed.       #
+#       If writing fails the thread stops, keeps the last traceback line in error  #
+#       and counts everything queued from then on as dropped                       #
+#                                                                                  #
+####################################################################################
+class Log_Writer( threading.Thread ):
+
+    # Initialization
+    def __init__(
+                 self                               ,
+                 log_file                           , # open log file object
+                 start_time                         , # perf_counter reference time
+                 flush_size   = DEFAULT_FLUSH_SIZE  ,
+                 flush_period = DEFAULT_FLUSH_PERIOD,
+                 fsync_period = DEFAULT_FSYNC_PERIOD,
+                 on_write     = None
+                ):
+        super().__init__( daemon = True, name = "log writer" )
+        self.log_file      = log_file
+        self.start_time    = start_time
+        self.flush_size    = flush_size
+        self.flush_period  = flush_period
+        self.fsync_period  = fsync_period
+        self.on_write      = on_write
+        self.queue         = queue.Queue()
+        self.pending       = []
+        self.pending_count = 0
+        self.flush_time    = None # flush deadline of the pending items
+        self.block_time    = None # time the log file next needs a flush
+        self.next_fsync    = time.monotonic()
+        self.error         = None # last traceback line once writing failed
+
+        # Writer metrics
+        self.num_samples   = 0
+        self.num_flushes   = 0
+        self.num_fsyncs    = 0
+        self.num_dropped   = 0 # items queued or pending after writing failed
+    ## __init__ ##
+
+    # Queue an item for the writer thread, or drop it once writing has failed
+    def _put( self, item ):
+        if ( self.error is not None ):
+            self.num_dropped += 1
+        else:
+            self.queue.put( item )
+    ## _put ##
+
+    # Queue a structured array of samples, called from any thread
+    def write_samples( self, samples ):
+        if ( len( samples ) > 0 ):
+            self._put( samples )
+    ## write_samples ##
+
+    # Queue a line of text, written in order with the samples
+    def write_text( self, text ):
+        self._put( text )
+    ## write_text ##
+
+    # Queue a run_journal.Run_Event, written in order with the samples. Logs
+    # without event records get the event as a text line
+    def write_event( self, event ):
+        self._put( event )
+    ## write_event ##
+
+    # Items that never reached the log file
+    def get_num_dropped( self ):
+        return self.num_dropped
+    ## get_num_dropped ##
+
+    # Thread body
+    def run( self ):
+        try:
+            self._write_loop()
+        except Exception:
+            self.error = traceback.format_exc().strip().splitlines()[-1]
+            self.num_dropped += len( self.pending )
+            self.pending      = []
+            while ( True ):
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if ( item is not _STOP ):
+                    self.num_dropped += 1
+            try:
+                self.log_file.close()
+            except Exception:
+                pass
+    ## run ##
+
+    # Write queued items until stopped
+    def _write_loop( self ):
+        running = True
+        while ( running ):
+            deadline = self.flush_time
+            if ( ( self.block_time is not None ) and
+                 ( ( deadline is None ) or ( self.block_time < deadline ) ) ):
+                deadline = self.block_time
+            timeout = None
+            if ( deadline is not None ):
+                timeout = max( deadline - time.monotonic(), 0.0 )
+            try:
+                item = self.queue.get( timeout = timeout )
+            except queue.Empty:
+                item = None
+            else:
+                if ( item is _STOP ):
+                    running = False
+                else:
+                    self._add( item )
+            if ( ( not running ) or
+                 ( self.pending_count >= self.flush_size ) or
+                 ( ( self.flush_time is not None ) and
+                   ( time.monotonic() >= self.flush_time ) ) ):
+                self._flush()
+
+            # Nothing new, but the log file holds data due to be written
+            elif ( ( self.block_time is not None ) and
+                   ( time.monotonic() >= self.block_time ) ):
+                self.block_time = self.log_file.flush()
+                self._sync_if_due()
+        self._sync()
+        self.log_file.close()
+    ## _write_loop ##
+
+    # Add a queued item to the pending batch
+    def _add( self, item ):
+        if ( self.flush_time is None ):
+            self.flush_time = time.monotonic() + self.flush_period
+        self.pending.append( item )
+        if ( isinstance( item, np.ndarray ) ):
+            self.pending_count += len( item )
+    ## _add ##
+
+    # Write the pending batch, keeping text lines in order with the samples.
+    # Consecutive sample arrays are joined and formatted in one call
+    def _flush( self ):
+        if ( len( self.pending ) == 0 ):
+            return
+        written = []
+        run     = []
+        for item in self.pending + [ None ]:
+            if ( isinstance( item, np.ndarray ) ):
+                run.append( item )
+                continue
+            if ( len( run ) > 0 ):
+                samples = np.concatenate( run )
+                self.log_file.write_samples( samples )
+                written.append( samples )
+                run = []
+            if ( isinstance( item, str ) ):
+                self.log_file.write_text( item )
+            elif ( item is not None ):
+                write_event = getattr( self.log_file, "write_event", None )
+                if ( write_event is not None ):
+                    write_event( item )
+                else:
+                    self.log_file.write_text( item.to_text() )
+        self.block_time    = self.log_file.flush()
+        write_time         = time.perf_counter() - self.start_time
+        self.num_samples  += self.pending_count
+        self.num_flushes  += 1
+        self.pending       = []
+        self.pending_count = 0
+        self.flush_time    = None
+        self._sync_if_due()
+        if ( self.on_write is not None ):
+            for samples in written:
+                self.on_write( samples, write_time )
+    ## _flush ##
+
+    # Force written data to disk if fsync_period has passed since the last time
+    def _sync_if_due( self ):
+        if ( ( self.fsync_period is not None ) and
+             ( time.monotonic() >= self.next_fsync ) ):
+            self._sync()
+    ## _sync_if_due ##
+
+    # Force written data to disk
+    def _sync( self ):
+        self.log_file.sync()
+        self.num_fsyncs += 1
+        if ( self.fsync_period is not None ):
+            self.next_fsync = time.monotonic() + self.fsync_period
+    ## _sync ##
+
+    # Write everything queued so far, sync and stop the thread
+    def stop( self, timeout = 5.0 ):
+        self.queue.put( _STOP )
+        if ( self.is_alive() ):
+            self.join( timeout )
+    ## stop ##
+## Log_Writer ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
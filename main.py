@@ -28,10 +28,10 @@ import os
 import sys
 import datetime
 import math
+import argparse
+import traceback
 
 # Serial (USB)
-import serial
-import serial.tools.list_ports
 from serial    import SerialException
 
 # Interface/GUI
@@ -56,11 +56,24 @@ import engine_display as SDR_engine_display
 import sequence       as SDR_sequence
 import buttons        as SDR_buttons
 import sensor         as SDR_sensor
+import serial_transport as SDR_serial_transport
+import acquisition    as SDR_acquisition
+import connection     as SDR_connection
+import multi_device   as SDR_multi_device
+import sensor_frames  as SDR_sensor_frames
+import rate_scheduler as SDR_rate_scheduler
+import telemetry_stats as SDR_telemetry_stats
+import log_writer     as SDR_log_writer
+import compressed_log as SDR_compressed_log
+import run_journal    as SDR_run_journal
+import write_ahead    as SDR_write_ahead
+import run_catalog    as SDR_run_catalog
+import capture        as SDR_capture
+import render_scheduler as SDR_render_scheduler
+import controller_protocol as SDR_controller_protocol
 
 # SDEC 
 import sdec
-import commands
-import hw_commands
 import sensor_conv
 
 
@@ -82,7 +95,8 @@ class Liquid_Engine_State:
 
     # Initialzation Function
     def __init__( self ):
-        self.state = "Initialization State"
+        self.state     = "Initialization State"
+        self.on_change = None # called with ( old state, new state )
     ## __init__ ##
 
     # Get the engine state
@@ -92,7 +106,11 @@ class Liquid_Engine_State:
 
     # Set the engine state
     def set_engine_state( self, new_engine_state ):
-        self.state = new_engine_state
+        old_engine_state = self.state
+        self.state       = new_engine_state
+        if ( ( self.on_change is not None ) and
+             ( new_engine_state != old_engine_state ) ):
+            self.on_change( old_engine_state, new_engine_state )
     ## set_engine_state ## 
 ## liquid_engine_state ##
 
@@ -108,33 +126,102 @@ def close_window_callback():
     plumbing.win.destroy()
     exitFlag = True
 
-# Sequencing callbacks
+# Append a run event to the run log, events before the log opens are dropped
+def log_event( event_type, **fields ):
+    if ( log_writer is not None ):
+        log_writer.write_event( SDR_run_journal.Run_Event(
+                                        event_type                        ,
+                                        time.perf_counter() - start_time ,
+                                        **fields
+                                                         ) )
+
+# Fire a full-rate capture trigger, triggers before the capture starts are dropped
+def capture_trigger( reason ):
+    if ( trigger_capture is not None ):
+        trigger_capture.trigger( reason, time.perf_counter() - start_time )
+
+# Log acquired samples, decimated to the engine state's logging rate, after
+# keeping them at full rate for trigger captures. Called from the acquisition
+# thread as samples arrive
+def log_samples_callback( samples ):
+    trigger_capture.add( samples )
+    if ( rate_scheduler is not None ):
+        samples = rate_scheduler.decimate( samples )
+    log_writer.write_samples( samples )
+    logged_ranges.add( samples )
+
+# Engine state changed, called from whichever thread set it
+def engine_state_callback( old_state, new_state ):
+    log_event( "state_transition", old_state = old_state, new_state = new_state )
+
+# Operator toggled a valve
+def valve_action_callback( valve, state ):
+    log_event( "valve_command", valve = valve,
+               state = "OPEN" if ( state == SDR_valve.VALVE_OPEN ) else "CLOSED" )
+
+# Controller connected, called from the connection manager thread
+def controller_connect_callback( device ):
+    global command_port
+    log_event( "reconnect", device = device )
+
+    # Transition into the ready state
+    liquid_engine_state.set_engine_state( "Ready State" )
+
+    # Multiplex commands and telemetry over the open port
+    if ( args.async_serial ):
+        command_port = SDR_serial_transport.Serial_Transport( terminalSerObj )
+        acquisition_thread.set_transport( command_port, args.stream )
+
+# Controller link lost, called from the connection manager thread
+def controller_disconnect_callback():
+    global command_port
+    log_event( "disconnect" )
+    if ( command_port is not terminalSerObj ):
+        acquisition_thread.set_transport( None )
+        command_port.close()
+        command_port = terminalSerObj
+    liquid_engine_state.set_engine_state( "Initialization State" )
+
+# Sequencing callbacks, serialized with the acquisition thread's sensor polls.
+# command_port is the asyncio transport when enabled, otherwise terminalSerObj
 def pre_fire_purge_callback():
-    SDR_sequence.pre_fire_purge( liquid_engine_state, terminalSerObj )
+    with acquisition_thread.serial_lock:
+        SDR_sequence.pre_fire_purge( liquid_engine_state, command_port )
 
 def fill_and_chill_callback():
-    SDR_sequence.fill_and_chill( liquid_engine_state, terminalSerObj )
+    with acquisition_thread.serial_lock:
+        SDR_sequence.fill_and_chill( liquid_engine_state, command_port )
 
 def standby_callback():
-    SDR_sequence.standby       ( liquid_engine_state, terminalSerObj )
+    with acquisition_thread.serial_lock:
+        SDR_sequence.standby       ( liquid_engine_state, command_port )
 
 def fire_engine_callback():
-    SDR_sequence.fire_engine   ( liquid_engine_state, terminalSerObj )
+    capture_trigger( "ignite" )
+    with acquisition_thread.serial_lock:
+        SDR_sequence.fire_engine   ( liquid_engine_state, command_port )
 
 def hotfire_abort_callback():
-    SDR_sequence.hotfire_abort ( liquid_engine_state, terminalSerObj )
+    log_event( "abort", engine_state = liquid_engine_state.get_engine_state() )
+    capture_trigger( "abort" )
+    with acquisition_thread.serial_lock:
+        SDR_sequence.hotfire_abort ( liquid_engine_state, command_port )
 
 def get_state_callback():
-    SDR_sequence.get_state     ( liquid_engine_state, terminalSerObj )
+    with acquisition_thread.serial_lock:
+        SDR_sequence.get_state     ( liquid_engine_state, command_port )
 
 def stop_hotfire_callback():
-    SDR_sequence.stop_hotfire  ( liquid_engine_state, terminalSerObj )
+    with acquisition_thread.serial_lock:
+        SDR_sequence.stop_hotfire  ( liquid_engine_state, command_port )
 
 def stop_purge_callback():
-    SDR_sequence.stop_purge    ( liquid_engine_state, terminalSerObj )
+    with acquisition_thread.serial_lock:
+        SDR_sequence.stop_purge    ( liquid_engine_state, command_port )
 
 def kbottle_close_callback():
-    SDR_sequence.kbottle_close ( liquid_engine_state, terminalSerObj )
+    with acquisition_thread.serial_lock:
+        SDR_sequence.kbottle_close ( liquid_engine_state, command_port )
 
 
 ####################################################################################
@@ -142,7 +229,16 @@ def kbottle_close_callback():
 ####################################################################################
 
 # State of the engine
-liquid_engine_state = Liquid_Engine_State()
+liquid_engine_state           = Liquid_Engine_State()
+liquid_engine_state.on_change = engine_state_callback
+
+# Run log writer, opened at the start of the main loop
+log_writer      = None
+rate_scheduler  = None
+trigger_capture = None
+
+# Channel ranges logged since the run catalog was last updated
+logged_ranges   = SDR_run_catalog.Channel_Ranges()
 
 
 ####################################################################################
@@ -150,24 +246,159 @@ liquid_engine_state = Liquid_Engine_State()
 ####################################################################################
 if __name__ == '__main__':
 
+    ################################################################################
+	# Command line arguments                                                       #
+    ################################################################################
+    arg_parser = argparse.ArgumentParser( description = "SDR liquid engine GUI" )
+    arg_parser.add_argument(
+                           "--poll-rate"                                     ,
+                           type    = float                                   ,
+                           default = SDR_acquisition.DEFAULT_POLL_RATE       ,
+                           help    = "sensor poll rate in Hz (0 = unthrottled)"
+                           )
+    arg_parser.add_argument(
+                           "--fixed-rate"                                    ,
+                           action  = "store_true"                            ,
+                           help    = "poll at --poll-rate and log every sample " +
+                                     "in every engine state"
+                           )
+    arg_parser.add_argument(
+                           "--frame-rate"                                    ,
+                           type    = float                                   ,
+                           default = SDR_render_scheduler.DEFAULT_FRAME_RATE ,
+                           help    = "GUI redraw rate in frames per second"
+                           )
+    arg_parser.add_argument(
+                           "--buffer-size"                                   ,
+                           type    = int                                     ,
+                           default = SDR_acquisition.DEFAULT_BUFFER_SIZE     ,
+                           help    = "acquisition ring buffer size in samples"
+                           )
+    arg_parser.add_argument(
+                           "--port"                                          ,
+                           default = None                                    ,
+                           help    = "controller serial port, skips port detection"
+                           )
+    arg_parser.add_argument(
+                           "--async-serial"                                  ,
+                           action  = "store_true"                            ,
+                           help    = "multiplex commands and telemetry over an " +
+                                     "asyncio serial transport"
+                           )
+    arg_parser.add_argument(
+                           "--stream"                                        ,
+                           action  = "store_true"                            ,
+                           help    = "stream binary telemetry frames instead of " +
+                                     "polling, implies --async-serial"
+                           )
+    arg_parser.add_argument(
+                           "--log-format"                                    ,
+                           choices = list( SDR_log_writer.log_extensions )   ,
+                           default = "segmented"                             ,
+                           help    = "sensor log format, binary logs load with " +
+                                     "binary_log.load, segmented logs with " +
+                                     "segmented_log.Segmented_Log and compressed " +
+                                     "logs with compressed_log.Compressed_Log"
+                           )
+    arg_parser.add_argument(
+                           "--compression"                                   ,
+                           choices = list( SDR_compressed_log.codecs )       ,
+                           default = "zlib"                                  ,
+                           help    = "codec of --log-format compressed"
+                           )
+    arg_parser.add_argument(
+                           "--fsync-period"                                  ,
+                           type    = float                                   ,
+                           default = SDR_log_writer.DEFAULT_FSYNC_PERIOD     ,
+                           help    = "seconds between log fsyncs (0 = every " +
+                                     "flush, negative = only at exit)"
+                           )
+    arg_parser.add_argument(
+                           "--recorder"                                      ,
+                           action  = "store_true"                            ,
+                           help    = "write the run log from a separate " +
+                                     "recorder process that survives a GUI " +
+                                     "crash, a restarted GUI reattaches to its run"
+                           )
+    arg_parser.add_argument(
+                           "--durability-window"                             ,
+                           type    = float                                   ,
+                           default = SDR_write_ahead.DEFAULT_DURABILITY_WINDOW*1e3,
+                           help    = "with --recorder, longest time in ms an " +
+                                     "acquired sample waits to be on disk"
+                           )
+    arg_parser.add_argument(
+                           "--daq-port"                                      ,
+                           action  = "append"                                ,
+                           default = []                                      ,
+                           help    = "serial port of an additional Arduino DAQ, " +
+                                     "may be repeated"
+                           )
+    arg_parser.add_argument(
+                           "--capture-pre"                                   ,
+                           type    = float                                   ,
+                           default = SDR_capture.DEFAULT_PRE_TRIGGER         ,
+                           help    = "seconds of full-rate samples captured " +
+                                     "before ignition, aborts and thresholds"
+                           )
+    arg_parser.add_argument(
+                           "--capture-post"                                  ,
+                           type    = float                                   ,
+                           default = SDR_capture.DEFAULT_POST_TRIGGER        ,
+                           help    = "seconds of full-rate samples captured " +
+                                     "after a trigger"
+                           )
+    arg_parser.add_argument(
+                           "--capture-rate"                                  ,
+                           type    = float                                   ,
+                           default = SDR_capture.DEFAULT_MAX_RATE            ,
+                           help    = "highest sample rate in Hz the capture " +
+                                     "buffer holds its full window at"
+                           )
+    arg_parser.add_argument(
+                           "--capture-threshold"                             ,
+                           type    = SDR_capture.parse_threshold             ,
+                           action  = "append"                                ,
+                           default = []                                      ,
+                           help    = "capture when a channel crosses a " +
+                                     "threshold, e.g. pt4>300, may be repeated"
+                           )
+    arg_parser.add_argument(
+                           "--gauge-render"                                  ,
+                           choices = [ "arc", "sprite" ]                     ,
+                           default = "arc"                                   ,
+                           help    = "redraw gauge arcs, or swap pre-rendered " +
+                                     "gauge images cached per fill level"
+                           )
+    arg_parser.add_argument(
+                           "--peak-window"                                   ,
+                           type    = float                                   ,
+                           default = 5.0                                     ,
+                           help    = "seconds of sensor gauge min/max " +
+                                     "markers (0 = no markers)"
+                           )
+    arg_parser.add_argument(
+                           "--gauge-text-step"                               ,
+                           type    = float                                   ,
+                           default = SDR_gauge.DEFAULT_TEXT_STEP             ,
+                           help    = "sensor gauge readout changes smaller " +
+                                     "than this are not redrawn (0 = redraw " +
+                                     "any change)"
+                           )
+    args = arg_parser.parse_args()
+    if ( args.stream ):
+        args.async_serial = True
+    if ( args.fsync_period < 0 ):
+        args.fsync_period = None
+    args.durability_window /= 1e3
+
     ################################################################################
 	# Serial Port Setup                                                            #
     ################################################################################
 
     # Initialize Serial Port Object
     terminalSerObj = sdec.terminalData()
-
-    # Look for possible connections
-    avail_ports = serial.tools.list_ports.comports()
-    for port_num, port in enumerate( avail_ports ):
-        if ( 'CP2102' in port.description ):
-            # Connect
-            port_num = port.device
-            connect_args  = [ '-p', port_num]
-            commands.connect( connect_args, terminalSerObj )
-
-            # Enter the ready state
-            liquid_engine_state.set_engine_state( "Ready State" )
+    command_port   = terminalSerObj
     
     ################################################################################
 	# Data logging setup                                                           #
@@ -184,13 +415,54 @@ if __name__ == '__main__':
     if ( not ( os.path.exists( output_dir ) ) ):
         os.mkdir( "output/" + run_date )
 
-    # Determine output filename based on existing files
+    # A restarted GUI continues the run its recorder is still writing
+    run_info = None
+    if ( args.recorder ):
+        live_run_filename = SDR_write_ahead.find_live_run( "output" )
+        if ( live_run_filename is not None ):
+            run_info = SDR_write_ahead.read_run_file( live_run_filename )
+
+    # Determine output filename from the run catalog's run counter
+    run_catalog          = SDR_run_catalog.Run_Catalog( "output" )
     base_output_filename = output_dir + "/engine_data"
-    test_num             = 0
-    output_filename      = base_output_filename + str( test_num ) + ".txt"
-    while ( os.path.exists( output_filename ) ):
-        test_num        += 1
-        output_filename  = base_output_filename + str( test_num ) + ".txt"
+    if ( run_info is None ):
+        test_num = run_catalog.allocate_test_num( output_dir )
+    else:
+        test_num = run_info["test_num"]
+    log_extension        = SDR_log_writer.log_extensions[args.log_format]
+    output_filename      = base_output_filename + str( test_num ) + log_extension
+
+    # Notes (rate transitions) kept beside a binary format log
+    notes_filename  = output_dir + "/engine_notes" + str( test_num ) + ".txt"
+
+    # All devices on one timeline, written when additional DAQs are attached
+    merged_filename = output_dir + "/merged_data" + str( test_num ) + log_extension
+
+    # Sample loss and latency statistics of the run
+    stats_filename  = output_dir + "/engine_stats" + str( test_num ) + ".txt"
+
+    # Full-rate trigger captures, numbered after the run
+    capture_filename = output_dir + "/engine_capture" + str( test_num ) + "_"
+
+    # Recorded run, whose log is written by a recorder process from a
+    # write-ahead buffer
+    run_filename     = ( output_dir + "/" + SDR_write_ahead.RUN_FILE_PREFIX +
+                         str( test_num ) + SDR_write_ahead.RUN_FILE_EXTENSION )
+    wal_filename     = ( output_dir + "/engine_wal" + str( test_num ) +
+                         SDR_write_ahead.FILE_EXTENSION )
+    recorder_log_filename = ( output_dir + "/engine_recorder" + str( test_num ) +
+                              ".txt" )
+
+    # Files of the run being continued
+    if ( run_info is not None ):
+        run_filename     = live_run_filename
+        args.log_format  = run_info["log_format"]
+        args.compression = run_info["codec"]
+        output_filename  = run_info["output_filename"]
+        notes_filename   = run_info["notes_filename"]
+        merged_filename  = run_info["merged_filename"]
+        stats_filename   = run_info["stats_filename"]
+        wal_filename     = run_info["wal_filename"]
 
 
     ################################################################################
@@ -211,6 +483,9 @@ if __name__ == '__main__':
     pad     = 10 
     gridLen = 85
 
+    # Period between rewrites of the run stats file
+    stats_write_period = 1.0 # seconds
+
 
     ################################################################################
 	# Window frames                                                                #
@@ -263,14 +538,15 @@ if __name__ == '__main__':
 								  bg='black'
                                   )
 
-	# Gauge row frames
-    gauge_frame_row1    = tk.Frame(
+	# Gauge frame
+    gauge_frame         = tk.Frame(
                                   root, 
                                   bg='black'
                                   )
 
-    gauge_frame_row2    = tk.Frame(
-                                  root, 
+    # Acquisition status frame
+    status_frame        = tk.Frame(
+                                  root,
                                   bg='black'
                                   )
 
@@ -356,6 +632,12 @@ if __name__ == '__main__':
                                     plumbing.s1
                                     )
 
+    # Record valve commands in the run log
+    for valve_buttons in ( solenoid1_buttons, solenoid2_buttons, solenoid3_buttons,
+                           solenoid4_buttons, solenoid5_buttons, solenoid6_buttons,
+                           ball_valve1_buttons, ball_valve2_buttons ):
+        valve_buttons.on_action = valve_action_callback
+
 	# Pre-Fire purge button
     pre_fire_purge_button = SDR_buttons.Button(
                             sequence_frame_row1      ,
@@ -463,54 +745,44 @@ if __name__ == '__main__':
                             f_callback = hotfire_abort_callback 
                                               )
 
-	# Sensor gauges
-    gauge1 =      SDR_gauge.gauge( # Fuel Tank Pressure
-                                 gauge_frame_row1    , 
-                                 background = 'black',
-                                 max_sensor_val = SDR_sensor.max_sensor_vals["pt0"]
-                                 )
-
-    gauge2 =      SDR_gauge.gauge( # Fuel Flow Rate
-                                 gauge_frame_row1, 
-                                 background = 'black',
-                                 max_sensor_val = SDR_sensor.max_sensor_vals["ffr"]
-                                 )
-
-    gauge3 =      SDR_gauge.gauge( # Fuel Injection Pressure
-                                 gauge_frame_row1, 
-                                 background = 'black',
-                                 max_sensor_val = SDR_sensor.max_sensor_vals["pt2"]
-                                 )
-
-    gauge4 =      SDR_gauge.gauge( # Thrust
-                                 gauge_frame_row1, 
-                                 background = 'black', 
-                                 max_sensor_val = SDR_sensor.max_sensor_vals["lc"]
-                                 )
-
-    gauge5 =      SDR_gauge.gauge( # LOX Pressure
-                                 gauge_frame_row2, 
-                                 background = 'black', 
-                                 max_sensor_val = SDR_sensor.max_sensor_vals["pt4"]
-                                 )
-
-    gauge6 =      SDR_gauge.gauge( # LOX Flow Rate
-                                 gauge_frame_row2, 
-                                 background = 'black', 
-                                 max_sensor_val = SDR_sensor.max_sensor_vals["oxfr"]
-                                 )
-
-    gauge7 =      SDR_gauge.gauge( # Engine Pressure
-                                 gauge_frame_row2, 
-                                 background = 'black', 
-                                 max_sensor_val = SDR_sensor.max_sensor_vals["pt6"]
-                                 )
-
-    gauge8 =      SDR_gauge.gauge( # LOX Temperature
-                                 gauge_frame_row2, 
-                                 background = 'black', 
-                                 max_sensor_val = SDR_sensor.max_sensor_vals["tc"]
-                                 )
+	# Sensor gauges, all drawn on one canvas
+    gauge_panel = SDR_gauge.gauge_panel(
+                      gauge_frame                                          ,
+                      background      = 'black'                            ,
+                      render_mode     = args.gauge_render                  ,
+                      peak_window     = args.peak_window                   ,
+                      text_step       = args.gauge_text_step               ,
+                      max_sensor_vals = [
+                          SDR_sensor.max_sensor_vals["pt0" ], # Fuel Tank Pressure
+                          SDR_sensor.max_sensor_vals["ffr" ], # Fuel Flow Rate
+                          SDR_sensor.max_sensor_vals["pt2" ], # Fuel Injection Pressure
+                          SDR_sensor.max_sensor_vals["lc"  ], # Thrust
+                          SDR_sensor.max_sensor_vals["pt4" ], # LOX Pressure
+                          SDR_sensor.max_sensor_vals["oxfr"], # LOX Flow Rate
+                          SDR_sensor.max_sensor_vals["pt6" ], # Engine Pressure
+                          SDR_sensor.max_sensor_vals["tc"  ]  # LOX Temperature
+                                        ]
+                                       )
+    ( gauge1, gauge2, gauge3, gauge4,
+      gauge5, gauge6, gauge7, gauge8 ) = gauge_panel.getGauges()
+
+    # Acquisition and display rates
+    rate_label =              tk.Label(
+                                      status_frame,
+                                      text = "",
+                                      bg   = "black",
+                                      fg   = "white",
+                                      font = "Arial 12"
+                                      )
+
+    # Sample loss and latency
+    stats_label =             tk.Label(
+                                      status_frame,
+                                      text = "",
+                                      bg   = "black",
+                                      fg   = "white",
+                                      font = "Arial 12"
+                                      )
 
     gauge1.setText("Nan", "Fuel Tank Pressure"     )
     gauge2.setText("Nan", "Fuel Flow Rate"         )
@@ -552,67 +824,192 @@ if __name__ == '__main__':
     stop_purge_button.pack    ( side = "left", padx = 30 )
     kbottle_close_button.pack ( side = "left", padx = 30 )
 
-	# Gauge frame rows 
-    gauge_frame_row1.pack()
-    gauge_frame_row2.pack()
+	# Gauge frame
+    gauge_frame.pack()
 
 	# Gauges
-    gauge1.getWidget().pack(side='left')
-    gauge2.getWidget().pack(side='left')
-    gauge3.getWidget().pack(side='left')
-    gauge4.getWidget().pack(side='left')
-    gauge5.getWidget().pack(side='left')
-    gauge6.getWidget().pack(side='left')
-    gauge7.getWidget().pack(side='left')
-    gauge8.getWidget().pack(side='left')
+    gauge_panel.getWidget().pack()
+
+	# Acquisition status
+    status_frame.pack()
+    rate_label.pack ( side = 'top' )
+    stats_label.pack( side = 'top' )
 
 
     ################################################################################
 	# Main Program Loop                                                            #
     ################################################################################
-    prevCon = True
 
-    # Start timer
+    # Start timer. A reattached run keeps its time base, perf_counter is the
+    # system-wide monotonic clock on the supported platforms
     start_time = time.perf_counter()
-
-    # Update GUI
-    while (not exitFlag):
+    if ( run_info is not None ):
+        start_time = run_info["start_time"]
+
+    # Telemetry accounting
+    telemetry_stats = SDR_telemetry_stats.Telemetry_Stats()
+
+    # Log files are written by background threads, the loop only queues samples
+    sensor_units         = SDR_sensor.get_sensor_units(
+                                   SDR_controller_protocol.CONTROLLER_NAME )
+    sensor_units["time"] = "s"
+    if ( not args.recorder ):
+        log_writer = SDR_log_writer.Log_Writer(
+                                   SDR_log_writer.open_log_file(
+                                       args.log_format                ,
+                                       output_filename                ,
+                                       SDR_sensor_frames.sample_dtype ,
+                                       units          = sensor_units  ,
+                                       notes_filename = notes_filename,
+                                       codec          = args.compression
+                                                               )   ,
+                                   start_time                              ,
+                                   fsync_period = args.fsync_period        ,
+                                   on_write     = telemetry_stats.record_disk
+                                   )
+        log_writer.start()
+    elif ( run_info is None ):
+        log_writer = SDR_write_ahead.Write_Ahead_Log( wal_filename )
+        log_writer.start()
+        run_info   = {
+                     "test_num"         : test_num              ,
+                     "log_format"       : args.log_format       ,
+                     "codec"            : args.compression      ,
+                     "units"            : sensor_units          ,
+                     "output_filename"  : output_filename       ,
+                     "notes_filename"   : notes_filename        ,
+                     "merged_filename"  : merged_filename       ,
+                     "stats_filename"   : stats_filename        ,
+                     "wal_filename"     : wal_filename          ,
+                     "durability_window": args.durability_window,
+                     "start_time"       : start_time
+                     }
+        SDR_write_ahead.write_run_file( run_filename, run_info )
+        SDR_write_ahead.start_recorder( run_filename, recorder_log_filename )
+    else:
+        log_writer = SDR_write_ahead.Write_Ahead_Log( wal_filename )
+        log_writer.start()
+        log_event( "gui_reattach" )
+
+    # Catalog the run, a continued run keeps its entry
+    run_id = run_catalog.add_run( output_filename, args.log_format )
+
+    # Full-rate captures around ignition, aborts and threshold crossings
+    trigger_capture = SDR_capture.Trigger_Capture(
+                               args.log_format                        ,
+                               capture_filename                       ,
+                               units        = sensor_units            ,
+                               codec        = args.compression        ,
+                               pre_trigger  = args.capture_pre        ,
+                               post_trigger = args.capture_post       ,
+                               max_rate     = args.capture_rate       ,
+                               thresholds   = args.capture_threshold
+                               )
+    trigger_capture.start()
+
+    # Start sensor acquisition
+    acquisition_thread = SDR_acquisition.Acquisition_Thread(
+                                     terminalSerObj                     ,
+                                     start_time                         ,
+                                     poll_rate   = args.poll_rate       ,
+                                     buffer_size = args.buffer_size
+                                     )
+    acquisition_thread.start()
+
+    # Follow the engine state with the telemetry and logging rates
+    rate_scheduler = None
+    if ( not args.fixed_rate ):
+        rate_scheduler = SDR_rate_scheduler.Rate_Scheduler( liquid_engine_state,
+                                                            acquisition_thread )
+    acquisition_thread.set_log_sink( log_samples_callback )
+
+    # Find and connect to the engine controller
+    connection_manager = SDR_connection.Connection_Manager(
+                                     terminalSerObj                                ,
+                                     acquisition_thread.serial_lock                ,
+                                     on_connect    = controller_connect_callback   ,
+                                     on_disconnect = controller_disconnect_callback,
+                                     port          = args.port
+                                     )
+    acquisition_thread.set_link_monitor( connection_manager )
+    connection_manager.start()
+
+    # Additional DAQ devices, merged with the engine controller on one timeline
+    daq_readers = []
+    for daq_num, daq_port in enumerate( args.daq_port ):
+        daq_reader = SDR_multi_device.DAQ_Reader(
+                                                "daq" + str( daq_num ),
+                                                daq_port              ,
+                                                start_time
+                                                )
+        daq_reader.start()
+        daq_readers.append( daq_reader )
+    merge_sources = { "engine": SDR_sensor_frames.sample_dtype }
+    for daq_reader in daq_readers:
+        merge_sources[daq_reader.device_name] = daq_reader.dtype
+    timeline_merger = SDR_multi_device.Timeline_Merger( merge_sources )
+    next_stats_write   = start_time + stats_write_period
+
+    # Merged log of all devices
+    merged_log_writer = None
+    if ( len( daq_readers ) > 0 ):
+        merged_units = { "time": "s" }
+        for sensor, units in sensor_units.items():
+            merged_units["engine." + sensor] = units
+        for daq_reader in daq_readers:
+            merged_units[daq_reader.device_name + ".device_time"] = "s"
+            merged_units[daq_reader.device_name + ".v1"         ] = "V"
+            merged_units[daq_reader.device_name + ".v2"         ] = "V"
+        merged_log_writer = SDR_log_writer.Log_Writer(
+                                   SDR_log_writer.open_log_file(
+                                       args.log_format        ,
+                                       merged_filename        ,
+                                       timeline_merger.dtype  ,
+                                       units = merged_units   ,
+                                       codec = args.compression
+                                                               ),
+                                   start_time                      ,
+                                   fsync_period = args.fsync_period
+                                   )
+        if ( args.log_format == "text" ):
+            merged_log_writer.write_text( timeline_merger.get_header() + "\n" )
+        merged_log_writer.start()
+
+    # Draw one frame of both windows, called by the render scheduler. An error
+    # other than closing the window leaves a recorded run open for a restarted
+    # GUI to reattach to
+    gui_crashed = False
+    def render_frame():
+        global exitFlag, gui_crashed, gui_error, next_stats_write
         try:
-            # Look for new serial connections 
-            if ( terminalSerObj.comport == None ):
-                avail_ports = serial.tools.list_ports.comports()
-                for port_num, port in enumerate( avail_ports ):
-                    if ( ( 'CP2102' in port.description ) or 
-                         ( 'CP210x' in port.description ) ):
-                        # Connect
-                        port_num = port.device
-                        connect_args  = [ '-p', port_num]
-                        commands.connect( connect_args, terminalSerObj )
-
-                        # Transition into the ready state
-                        liquid_engine_state.set_engine_state( "Ready State" )
-
-            else:
-                # Record time of data reception
-                time_sec = time.perf_counter() - start_time
-
-                # Get sensor data
-                sensor_args = ['dump']
-                hw_commands.sensor( sensor_args, terminalSerObj, show_readouts = False )
+            frame_start = time.perf_counter()
+
+            # Retune the telemetry rates after an engine state change
+            if ( rate_scheduler is not None ):
+                rate_transition = rate_scheduler.update( frame_start - start_time )
+                if ( rate_transition is not None ):
+                    log_writer.write_text( rate_transition )
+
+            # Samples acquired since the last frame
+            samples = acquisition_thread.drain()
+            if ( len( samples ) > 0 ):
+
+                # Display the newest sample
+                sensor_readouts = SDR_sensor_frames.sample_to_readouts( samples[-1] )
                 sensor_readouts_formatted = {}
-                for sensor in terminalSerObj.sensor_readouts:
+                for sensor in sensor_readouts:
                     sensor_readouts_formatted[sensor] = SDR_sensor.format_sensor_readout(
                         terminalSerObj.controller,
                         sensor                   ,
-                        terminalSerObj.sensor_readouts[sensor] ) 
+                        sensor_readouts[sensor] ) 
 
                 # Calculate Flow Rates
                 ox_flow_rate   = sensor_conv.ox_pressure_to_flow( 
-                                            terminalSerObj.sensor_readouts["pt1"] -
-                                            terminalSerObj.sensor_readouts["pt2"] )
+                                            sensor_readouts["pt1"] -
+                                            sensor_readouts["pt2"] )
                 fuel_flow_rate = sensor_conv.fuel_pressure_to_flow(
-                                            terminalSerObj.sensor_readouts["pt6"] -
-                                            terminalSerObj.sensor_readouts["pt5"] )
+                                            sensor_readouts["pt6"] -
+                                            sensor_readouts["pt5"] )
                 ox_flow_rate_formatted   = SDR_sensor.format_sensor_readout(
                                             terminalSerObj.controller, 
                                             "oxfr"                   ,
@@ -622,55 +1019,156 @@ if __name__ == '__main__':
                                             "ffr"                    , 
                                             fuel_flow_rate )
 
-                # Update sensor gauge readings
-                gauge1.setText( sensor_readouts_formatted["pt7"], "Fuel Tank Pressure" )
-                gauge2.setText( fuel_flow_rate_formatted        , "Fuel Flow Rate"     )
-                gauge3.setText( "NaN"                           , "None"               )
-                gauge4.setText( sensor_readouts_formatted["lc"] , "Thrust"             )
-                gauge5.setText( sensor_readouts_formatted["pt0"], "LOX Pressure"       )
-                gauge6.setText( ox_flow_rate_formatted          , "LOX Flow Rate"      )
-                gauge7.setText( sensor_readouts_formatted["pt4"], "Engine Pressure"    )
-                gauge8.setText( sensor_readouts_formatted["tc" ], "LOX Temperature"    )
-
-                gauge1.setAngle( terminalSerObj.sensor_readouts["pt7"] )
-                gauge2.setAngle( fuel_flow_rate                        )
-                gauge3.setAngle( 0 )
-                gauge4.setAngle( terminalSerObj.sensor_readouts["lc" ] )
-                gauge5.setAngle( terminalSerObj.sensor_readouts["pt0"] )
-                gauge6.setAngle( ox_flow_rate                          )
-                gauge7.setAngle( terminalSerObj.sensor_readouts["pt4"] )
-                gauge8.setAngle( terminalSerObj.sensor_readouts["tc" ] )
-
-                # Log Data
-                with open( output_filename, "a" ) as file:
-                    file.write(str(time_sec) + " ")
-                    file.write(str(terminalSerObj.sensor_readouts["pt0"]) + " ")
-                    file.write(str(terminalSerObj.sensor_readouts["pt1"]) + " ")
-                    file.write(str(terminalSerObj.sensor_readouts["pt2"]) + " ")
-                    file.write(str(terminalSerObj.sensor_readouts["pt3"]) + " ")
-                    file.write(str(terminalSerObj.sensor_readouts["pt4"]) + " ")
-                    file.write(str(terminalSerObj.sensor_readouts["pt5"]) + " ")
-                    file.write(str(terminalSerObj.sensor_readouts["pt6"]) + " ")
-                    file.write(str(terminalSerObj.sensor_readouts["pt7"]) + " ")
-                    file.write(str(terminalSerObj.sensor_readouts["lc" ]) + " ")
-                    file.write(str(terminalSerObj.sensor_readouts["tc" ]) + " ")
-                    file.write("\n")
+                # Update sensor gauge readings in one pass over the panel
+                gauge_panel.setReadings( [
+                    ( sensor_readouts["pt7"], sensor_readouts_formatted["pt7"],
+                      "Fuel Tank Pressure" ),
+                    ( fuel_flow_rate        , fuel_flow_rate_formatted        ,
+                      "Fuel Flow Rate" ),
+                    ( 0                     , "NaN"                           ,
+                      "None" ),
+                    ( sensor_readouts["lc" ], sensor_readouts_formatted["lc"] ,
+                      "Thrust" ),
+                    ( sensor_readouts["pt0"], sensor_readouts_formatted["pt0"],
+                      "LOX Pressure" ),
+                    ( ox_flow_rate          , ox_flow_rate_formatted          ,
+                      "LOX Flow Rate" ),
+                    ( sensor_readouts["pt4"], sensor_readouts_formatted["pt4"],
+                      "Engine Pressure" ),
+                    ( sensor_readouts["tc" ], sensor_readouts_formatted["tc" ],
+                      "LOX Temperature" )
+                                         ] )
+
+                # Peak-hold markers over every sample of the frame, flow rates
+                # included
+                sample_times    = samples["time"].tolist()
+                ox_flow_rates   = [ sensor_conv.ox_pressure_to_flow( pressure )
+                                    for pressure in
+                                    ( samples["pt1"] - samples["pt2"] ).tolist() ]
+                fuel_flow_rates = [ sensor_conv.fuel_pressure_to_flow( pressure )
+                                    for pressure in
+                                    ( samples["pt6"] - samples["pt5"] ).tolist() ]
+                gauge_panel.addValues( [
+                    ( sample_times, samples["pt7"].tolist() ), # Fuel Tank Pressure
+                    ( sample_times, fuel_flow_rates         ), # Fuel Flow Rate
+                    None                                     , # None
+                    ( sample_times, samples["lc" ].tolist() ), # Thrust
+                    ( sample_times, samples["pt0"].tolist() ), # LOX Pressure
+                    ( sample_times, ox_flow_rates           ), # LOX Flow Rate
+                    ( sample_times, samples["pt4"].tolist() ), # Engine Pressure
+                    ( sample_times, samples["tc" ].tolist() )  # LOX Temperature
+                                       ] )
+
+            # Merge all devices onto one timeline
+            if ( len( daq_readers ) > 0 ):
+                timeline_merger.add( "engine", samples )
+                for daq_reader in daq_readers:
+                    timeline_merger.add( daq_reader.device_name, daq_reader.drain() )
+                merged_log_writer.write_samples( timeline_merger.merge() )
+
+            # Report connection health, acquisition and display rates
+            connection_health = connection_manager.get_health()
+            redraw_counts     = gauge_panel.getRedrawCounts()
+            rate_label.configure(
+                text = ( "{}    Reconnects: {}    Acquisition: {:.1f} Hz    " +
+                         "Clock drift: {:.1f} ppm    " +
+                         "Gauge redraws/skipped: {}/{}\n{}" ).format(
+                       connection_health["state"]                  ,
+                       connection_health["disconnects"]            ,
+                       acquisition_thread.get_rate()               ,
+                       acquisition_thread.clock.get_drift_ppm()    ,
+                       redraw_counts[0]                            ,
+                       redraw_counts[1]                            ,
+                       render_scheduler.get_summary()              )
+                                )
+            telemetry_stats.update_counters( acquisition_thread, log_writer )
+            stats_text = telemetry_stats.get_summary()
+            if ( acquisition_thread.sink_error is not None ):
+                stats_text += "\nLog error: " + acquisition_thread.sink_error
+            for writer in ( log_writer, merged_log_writer ):
+                writer_error = getattr( writer, "error", None )
+                if ( writer_error is not None ):
+                    stats_text += "\nLog writer stopped: " + writer_error
+            stats_label.configure( text = stats_text )
 
             # Update engine schematic
             plumbing.updatePipeStatus()
 
-            # Draw to main window
-            root.update()
-
-            # Draw to plumbing window
-            plumbing.getWindow().update()
-
-            time.sleep( 0.1 )
+            # Both windows redraw in the idle pass after this frame, the samples
+            # are on screen once it has run
+            root.after_idle( lambda: telemetry_stats.record_display(
+                                         samples                          ,
+                                         time.perf_counter() - start_time ) )
+
+            # Save the run stats and bring the run's catalog entry up to date
+            if ( time.perf_counter() >= next_stats_write ):
+                telemetry_stats.write( stats_filename )
+                ranges, num_samples = logged_ranges.take()
+                run_catalog.update_run(
+                       run_id                                            ,
+                       ranges      = ranges                              ,
+                       units       = sensor_units                        ,
+                       new_samples = num_samples                         ,
+                       final_state = liquid_engine_state.get_engine_state()
+                                      )
+                next_stats_write += stats_write_period
 
         # Exit App
+        except KeyboardInterrupt:
+            exitFlag = True
         except:
+            if ( not exitFlag ):
+                gui_crashed = True
+                gui_error   = traceback.format_exc().strip().splitlines()[-1]
             exitFlag = True
-            pass
+        if ( exitFlag ):
+            render_scheduler.stop()
+            root.quit()
+
+    # Update GUI until the windows close
+    render_scheduler = SDR_render_scheduler.Render_Scheduler( root             ,
+                                                              render_frame     ,
+                                                              args.frame_rate  )
+    render_scheduler.start()
+    try:
+        root.mainloop()
+    except KeyboardInterrupt:
+        exitFlag = True
+    render_scheduler.stop()
+
+    # Stop sensor acquisition
+    for daq_reader in daq_readers:
+        daq_reader.stop()
+    connection_manager.stop()
+    acquisition_thread.stop()
+    if ( command_port is not terminalSerObj ):
+        command_port.close()
+    trigger_capture.stop()
+
+    # Write out the queued log data
+    if ( args.recorder and gui_crashed ):
+        log_event( "gui_detach", error = gui_error )
+        log_writer.detach()
+    else:
+        log_writer.stop()
+    if ( merged_log_writer is not None ):
+        merged_log_writer.stop()
+    telemetry_stats.update_counters( acquisition_thread, log_writer )
+    telemetry_stats.write( stats_filename )
+
+    # Catalog the finished run. A recorded run is finished by its recorder once
+    # the log is on disk
+    ranges, num_samples = logged_ranges.take()
+    run_catalog.update_run(
+                          run_id                                            ,
+                          ranges      = ranges                              ,
+                          units       = sensor_units                        ,
+                          new_samples = num_samples                         ,
+                          final_state = liquid_engine_state.get_engine_state()
+                          )
+    if ( not args.recorder ):
+        run_catalog.finish_run( run_id, output_filename )
+    run_catalog.close()
 
 	# Clear the console to get rid of weird tk/tcl errors
     os.system('cls' if os.name == 'nt' else 'clear')
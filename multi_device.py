@@ -0,0 +1,241 @@
+####################################################################################
+#                                                                                  #
+# multi_device.py -- concurrent acquisition from additional serial devices and    #
+#                    merging of all devices onto one timeline                      #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import threading
+import time
+
+# Data processing
+import numpy as np
+
+# Serial (USB)
+import serial
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import acquisition as SDR_acquisition
+import clock_sync  as SDR_clock_sync
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Arduino DAQ (test/DAQexperimental/DAQexperimental.ino) serial settings
+DAQ_BAUDRATE    = 9600
+DAQ_TIMEOUT     = 1.0  # seconds
+DAQ_RETRY_DELAY = 1.0  # seconds between reopen attempts
+
+# Arduino DAQ sample: aligned host time, device time, analog input voltages
+daq_sample_dtype = np.dtype( [
+                             ( "time"       , "<f8" ),
+                             ( "device_time", "<f8" ),
+                             ( "v1"         , "<f4" ),
+                             ( "v2"         , "<f4" )
+                             ] )
+
+# Arduino millis() counter
+DAQ_TICKS_PER_SEC = 1000
+DAQ_TICKS_WRAP    = 2**32
+
+# 10-bit ADC counts to volts
+ADC_VOLTS_PER_COUNT = 5.0/1023.0
+
+# A device that has been silent this long no longer holds back the merge
+STALE_TIMEOUT = 0.5 # seconds
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		DAQ_Reader                                                                 #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Reader thread for an Arduino DAQ running DAQexperimental.ino, which prints #
+#       "<millis> <A0 counts> <A5 counts>" lines. Samples are stamped with the     #
+#       device clock and aligned to the host timeline                              #
+#                                                                                  #
+####################################################################################
+class DAQ_Reader( threading.Thread ):
+
+    # Initialization
+    def __init__(
+                 self                                              ,
+                 name                                              , # device name
+                 port                                              , # serial port
+                 start_time                                        , # perf_counter ref
+                 baudrate    = DAQ_BAUDRATE                        ,
+                 buffer_size = SDR_acquisition.DEFAULT_BUFFER_SIZE
+                ):
+        super().__init__( daemon = True, name = name )
+        self.device_name  = name
+        self.port         = port
+        self.baudrate     = baudrate
+        self.start_time   = start_time
+        self.dtype        = daq_sample_dtype
+        self.buffer       = SDR_acquisition.Ring_Buffer( buffer_size, self.dtype )
+        self.clock        = SDR_clock_sync.Clock_Sync( DAQ_TICKS_PER_SEC,
+                                                       DAQ_TICKS_WRAP )
+        self.rate_meter   = SDR_acquisition.Rate_Meter()
+        self.num_bad_line = 0
+        self.stop_event   = threading.Event()
+    ## __init__ ##
+
+    # Thread body
+    def run( self ):
+        sample = np.zeros( 1, dtype = self.dtype )
+        while ( not self.stop_event.is_set() ):
+            try:
+                serialObj = serial.Serial(
+                                         self.port                ,
+                                         baudrate = self.baudrate ,
+                                         timeout  = DAQ_TIMEOUT
+                                         )
+            except serial.SerialException:
+                self.stop_event.wait( DAQ_RETRY_DELAY )
+                continue
+            with serialObj:
+                while ( not self.stop_event.is_set() ):
+                    try:
+                        line = serialObj.readline()
+                    except serial.SerialException:
+                        break
+                    if ( len( line ) == 0 ):
+                        continue
+                    host_time = time.perf_counter() - self.start_time
+                    fields    = line.split()
+                    if ( len( fields ) != 3 ):
+                        self.num_bad_line += 1
+                        continue
+                    try:
+                        device_time = self.clock.unwrap( int( fields[0] ) )
+                        counts1     = int( fields[1] )
+                        counts2     = int( fields[2] )
+                    except ValueError:
+                        self.num_bad_line += 1
+                        continue
+                    self.clock.update( device_time, host_time )
+                    sample["time"       ] = self.clock.to_host( device_time )
+                    sample["device_time"] = device_time
+                    sample["v1"         ] = counts1*ADC_VOLTS_PER_COUNT
+                    sample["v2"         ] = counts2*ADC_VOLTS_PER_COUNT
+                    self.buffer.push( sample )
+                    self.rate_meter.tick()
+    ## run ##
+
+    # Remove and return all samples acquired since the last drain
+    def drain( self ):
+        return self.buffer.drain()
+    ## drain ##
+
+    # Measured acquisition rate in Hz
+    def get_rate( self ):
+        return self.rate_meter.get_rate()
+    ## get_rate ##
+
+    # Stop the thread and wait for it to exit
+    def stop( self, timeout = 2.0 ):
+        self.stop_event.set()
+        if ( self.is_alive() ):
+            self.join( timeout )
+    ## stop ##
+## DAQ_Reader ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Timeline_Merger                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Merges sample batches from several devices into one time-ordered stream.   #
+#       Every device's channels become "<device>.<channel>" fields of a single     #
+#       wide array; channels a row's device did not sample are NaN. A row is only  #
+#       released once every active device has reported past its time, so rows     #
+#       come out in order even though devices deliver at different latencies       #
+#                                                                                  #
+####################################################################################
+class Timeline_Merger:
+
+    # Initialization, sources maps device name to its sample dtype
+    def __init__( self, sources ):
+        self.device_names = list( sources )
+        fields            = [ ( "time", "<f8" ), ( "device", "u1" ) ]
+        self.field_map    = {}
+        for name in self.device_names:
+            self.field_map[name] = []
+            for field in sources[name].names:
+                if ( field == "time" ):
+                    continue
+                merged_field = name + "." + field
+                fields.append( ( merged_field, sources[name][field] ) )
+                self.field_map[name].append( ( field, merged_field ) )
+        self.dtype       = np.dtype( fields )
+        self.channels    = [ field for field, _ in fields[2:] ]
+        self.pending     = np.zeros( 0, dtype = self.dtype )
+        self.latest      = dict.fromkeys( self.device_names, None )
+        self.last_seen   = dict.fromkeys( self.device_names, None )
+        self.num_late    = 0
+        self.released_to = -np.inf
+    ## __init__ ##
+
+    # Add a batch of samples from one device
+    def add( self, name, samples ):
+        if ( len( samples ) == 0 ):
+            return
+        rows           = np.zeros( len( samples ), dtype = self.dtype )
+        for channel in self.channels:
+            rows[channel] = np.nan
+        rows["time"  ] = samples["time"]
+        rows["device"] = self.device_names.index( name )
+        for field, merged_field in self.field_map[name]:
+            rows[merged_field] = samples[field]
+        self.num_late       += int( np.count_nonzero( rows["time"] < self.released_to ) )
+        self.pending         = np.concatenate( ( self.pending, rows ) )
+        self.latest[name]    = float( samples["time"][-1] )
+        self.last_seen[name] = time.monotonic()
+    ## add ##
+
+    # Release all rows that no active device can still precede, in time order
+    def merge( self ):
+        now    = time.monotonic()
+        active = [ self.latest[name] for name in self.device_names
+                   if ( ( self.last_seen[name] is not None ) and
+                        ( now - self.last_seen[name] < STALE_TIMEOUT ) ) ]
+        if ( len( active ) == 0 ):
+            watermark = np.inf
+        else:
+            watermark = min( active )
+        order        = np.argsort( self.pending["time"], kind = "stable" )
+        ordered      = self.pending[order]
+        split        = np.searchsorted( ordered["time"], watermark, side = "right" )
+        released     = ordered[:split]
+        self.pending = ordered[split:]
+        if ( len( released ) > 0 ):
+            self.released_to = max( self.released_to, released["time"][-1] )
+        return released
+    ## merge ##
+
+    # Column names of the merged stream
+    def get_header( self ):
+        return " ".join( self.dtype.names )
+    ## get_header ##
+## Timeline_Merger ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
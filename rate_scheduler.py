@@ -0,0 +1,125 @@
+####################################################################################
+#                                                                                  #
+# rate_scheduler.py -- selects telemetry and logging rates from the engine state   #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import threading
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Fastest rates, a poll rate of 0 polls as fast as the controller responds
+MAX_POLL_RATE   = 0    # Hz
+MAX_STREAM_RATE = 5000 # Hz
+
+# Telemetry plan for each engine state:
+#   ( poll rate (Hz), stream rate (Hz), log decimation )
+# The decimation keeps every Nth streamed sample, so the logged rate while
+# streaming is the stream rate divided by the decimation. Polled samples are
+# logged as they arrive. Standby comes right before ignition, so it streams at
+# full rate for the pre-trigger window of capture.Trigger_Capture while logging
+# at the same 10 Hz as the other idle states
+rate_schedule = {
+    "Initialization State" : ( 1            , 100            , 100 ),
+    "Ready State"          : ( 1            , 100            , 100 ),
+    "Pre-Fire Purge State" : ( MAX_POLL_RATE, MAX_STREAM_RATE, 1   ),
+    "Fill and Chill State" : ( 50           , 500            , 10  ),
+    "Standby State"        : ( 10           , MAX_STREAM_RATE, 500 ),
+    "Fire State"           : ( MAX_POLL_RATE, MAX_STREAM_RATE, 1   ),
+    "Post-Fire State"      : ( MAX_POLL_RATE, MAX_STREAM_RATE, 1   ),
+    "Abort State"          : ( MAX_POLL_RATE, MAX_STREAM_RATE, 1   ),
+    "Disarm State"         : ( 1            , 100            , 100 ),
+    "Manual State"         : ( 10           , 100            , 10  )
+                }
+
+# Plan for states missing from the schedule, err on the side of more data
+default_plan = ( MAX_POLL_RATE, MAX_STREAM_RATE, 1 )
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Rate_Scheduler                                                             #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Watches the engine state and retunes the acquisition poll rate, the        #
+#       controller stream rate and the log decimation whenever it changes.         #
+#       update() is called once per GUI frame and returns a log comment line       #
+#       describing the transition, or None. The decimation and its phase change    #
+#       together under a lock, as decimate() runs on the acquisition thread        #
+#                                                                                  #
+####################################################################################
+class Rate_Scheduler:
+
+    # Initialization
+    def __init__( self, engine_state, acquisition_thread, schedule = None ):
+        if ( schedule is None ):
+            schedule = rate_schedule
+        self.engine_state       = engine_state
+        self.acquisition_thread = acquisition_thread
+        self.schedule           = schedule
+        self.state              = None
+        self.streaming          = False
+        self.poll_rate, self.stream_rate, self.decimation = default_plan
+        self.phase              = 0 # samples to skip before the next logged one
+        self.lock               = threading.Lock()
+    ## __init__ ##
+
+    # Apply the plan for the current engine state if it changed, returns a log
+    # comment line describing the transition, or None
+    def update( self, time_sec ):
+        state     = self.engine_state.get_engine_state()
+        transport = self.acquisition_thread.transport
+        streaming = ( transport is not None ) and self.acquisition_thread.streaming
+        if ( ( state == self.state ) and ( streaming == self.streaming ) ):
+            return None
+        previous_state  = self.state
+        self.state      = state
+        self.streaming  = streaming
+        self.poll_rate, self.stream_rate, decimation = self.schedule.get(
+                                                               state, default_plan )
+        self.acquisition_thread.set_poll_rate( self.poll_rate )
+        if ( streaming ):
+            transport.set_stream_rate( self.stream_rate )
+            rate_text  = "stream {} Hz".format( self.stream_rate )
+        else:
+            # Polled samples already arrive at the logging rate
+            decimation = 1
+            rate_text  = "poll {} Hz".format( self.poll_rate or "max" )
+        with self.lock:
+            self.decimation = decimation
+            self.phase      = 0
+        return "# {:.6f} rate transition: {} -> {}, {}, log every {}\n".format(
+                   time_sec      ,
+                   previous_state,
+                   state         ,
+                   rate_text     ,
+                   self.decimation
+                                                                           )
+    ## update ##
+
+    # Keep every decimation-th sample, carrying the phase across batches. Called
+    # only from the thread that logs the samples
+    def decimate( self, samples ):
+        with self.lock:
+            kept       = samples[self.phase::self.decimation]
+            self.phase = ( self.phase - len( samples ) ) % self.decimation
+        return kept
+    ## decimate ##
+## Rate_Scheduler ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
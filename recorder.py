@@ -0,0 +1,129 @@
+####################################################################################
+#                                                                                  #
+# recorder.py -- recorder process that writes a run log from its write-ahead       #
+#                buffer, independent of the GUI process                            #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+# Usage: python recorder.py output/<date>/engine_runN.json                         #
+#       Started by main.py --recorder. Runs until the GUI ends the run, or until   #
+#       no GUI has been attached for --orphan-timeout seconds                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import argparse
+import os
+import time
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import sensor_frames as SDR_sensor_frames
+import log_writer    as SDR_log_writer
+import write_ahead   as SDR_write_ahead
+import run_catalog   as SDR_run_catalog
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         record                                                                   #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Moves records from the run's write-ahead buffer into its log file every  #
+#         half durability window. Each batch is flushed and fsynced before its     #
+#         ring space is released, so a record is on disk within the durability     #
+#         window of being acquired and a restarted recorder never loses one. The   #
+#         write-ahead buffer and run file are removed once the run has ended and   #
+#         everything is on disk. Compressed logs write their partial block on      #
+#         every flush, trading some compression for the same guarantee.            #
+#         A finished log is marked complete in the run catalog                     #
+#                                                                                  #
+####################################################################################
+def record( run_filename, orphan_timeout = SDR_write_ahead.DEFAULT_ORPHAN_TIMEOUT ):
+    run_info    = SDR_write_ahead.read_run_file( run_filename )
+    dtype       = SDR_sensor_frames.sample_dtype
+    poll_period = run_info["durability_window"]/2.0
+    buffer      = SDR_write_ahead.Write_Ahead_Buffer( run_info["wal_filename"] )
+    log_file    = SDR_log_writer.open_log_file(
+                                  run_info["log_format"]                     ,
+                                  run_info["output_filename"]                ,
+                                  dtype                                      ,
+                                  units          = run_info["units"]         ,
+                                  notes_filename = run_info["notes_filename"],
+                                  codec          = run_info["codec"]         ,
+                                  block_period   = 0.0
+                                                  )
+    finished = False
+    while ( True ):
+        buffer.recorder_beat()
+        closed            = buffer.is_closed()
+        records, position = buffer.read()
+        if ( len( records ) > 0 ):
+            for record_type, payload in records:
+                item = SDR_write_ahead.decode_record( record_type, payload, dtype )
+                if ( record_type == SDR_write_ahead.SAMPLE_RECORD ):
+                    log_file.write_samples( item )
+                elif ( record_type == SDR_write_ahead.TEXT_RECORD ):
+                    log_file.write_text( item )
+                elif ( hasattr( log_file, "write_event" ) ):
+                    log_file.write_event( item )
+                else:
+                    log_file.write_text( item.to_text() )
+            log_file.flush()
+            log_file.sync()
+            buffer.commit_read( position )
+
+        # The run ended and everything it wrote is on disk
+        elif ( closed ):
+            finished = True
+            break
+
+        # No GUI has reattached in time
+        elif ( buffer.gui_silence() > orphan_timeout ):
+            break
+        time.sleep( poll_period )
+    log_file.close()
+    buffer.close()
+    if ( finished ):
+        os.remove( run_info["wal_filename"] )
+        os.remove( run_filename )
+
+        # Run directories sit in the output root that holds the catalog
+        output_filename = run_info["output_filename"]
+        output_root     = os.path.dirname( os.path.dirname( output_filename ) )
+        run_catalog     = SDR_run_catalog.Run_Catalog( output_root )
+        run_id          = run_catalog.get_run_id( output_filename )
+        if ( run_id is not None ):
+            run_catalog.finish_run( run_id, output_filename )
+        run_catalog.close()
+## record ##
+
+
+####################################################################################
+# Main application entry point                                                     #
+####################################################################################
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser( description = "SDR run log recorder" )
+    arg_parser.add_argument( "run_file", help = "run file written by main.py" )
+    arg_parser.add_argument(
+                           "--orphan-timeout"                                ,
+                           type    = float                                   ,
+                           default = SDR_write_ahead.DEFAULT_ORPHAN_TIMEOUT  ,
+                           help    = "seconds to wait for a crashed GUI to " +
+                                     "reattach before closing the log"
+                           )
+    args = arg_parser.parse_args()
+    record( args.run_file, args.orphan_timeout )
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
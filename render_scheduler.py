@@ -0,0 +1,131 @@
+####################################################################################
+#                                                                                  #
+# render_scheduler.py -- frame-paced GUI redraws on the Tk event loop              #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import time
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import acquisition     as SDR_acquisition
+import telemetry_stats as SDR_telemetry_stats
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Default target frame rate
+DEFAULT_FRAME_RATE = 30 # frames per second
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Render_Scheduler                                                           #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Calls render_frame() at frame_rate from root's event loop with after()     #
+#       callbacks, so input is handled as it arrives instead of once per frame.    #
+#       A frame only changes widgets; Tk redraws every changed widget of every     #
+#       window in one idle pass after it. Frames are scheduled against a fixed     #
+#       timeline, so a slow frame is not carried into the next; frames that        #
+#       could not start in time are dropped rather than run back to back.          #
+#       Records the frame period and the time spent rendering each frame           #
+#                                                                                  #
+####################################################################################
+class Render_Scheduler:
+
+    # Initialization
+    def __init__( self, root, render_frame, frame_rate = DEFAULT_FRAME_RATE ):
+        self.root         = root
+        self.render_frame = render_frame
+        self.frame_period = 1.0/frame_rate
+        self.next_frame   = None # perf_counter time of the next frame
+        self.after_id     = None
+        self.last_start   = None
+
+        # Frame metrics
+        self.rate_meter   = SDR_acquisition.Rate_Meter()
+        self.frame_times  = SDR_telemetry_stats.Latency_Histogram()
+        self.render_times = SDR_telemetry_stats.Latency_Histogram()
+        self.num_frames   = 0
+        self.num_dropped  = 0
+    ## __init__ ##
+
+    # Schedule the first frame
+    def start( self ):
+        self.next_frame = time.perf_counter()
+        self.after_id   = self.root.after( 0, self._frame )
+    ## start ##
+
+    # Cancel the next frame, may be called from render_frame
+    def stop( self ):
+        self.next_frame = None
+        if ( self.after_id is not None ):
+            self.root.after_cancel( self.after_id )
+            self.after_id = None
+    ## stop ##
+
+    # Run one frame and schedule the next
+    def _frame( self ):
+        self.after_id = None
+        frame_start   = time.perf_counter()
+        if ( self.last_start is not None ):
+            self.frame_times.record( [ frame_start - self.last_start ] )
+        self.last_start = frame_start
+        self.rate_meter.tick( frame_start )
+        self.num_frames += 1
+        self.render_frame()
+        frame_end = time.perf_counter()
+        self.render_times.record( [ frame_end - frame_start ] )
+
+        # render_frame may have stopped the scheduler
+        if ( self.next_frame is None ):
+            return
+
+        # Next frame on the timeline, skipping frames already missed
+        self.next_frame += self.frame_period
+        if ( self.next_frame < frame_end ):
+            missed            = int( ( frame_end - self.next_frame )/
+                                         self.frame_period ) + 1
+            self.num_dropped += missed
+            self.next_frame  += missed*self.frame_period
+        delay         = max( self.next_frame - frame_end, 0.0 )
+        self.after_id = self.root.after( int( round( delay*1e3 ) ), self._frame )
+    ## _frame ##
+
+    # Achieved frame rate in frames per second
+    def get_rate( self ):
+        return self.rate_meter.get_rate()
+    ## get_rate ##
+
+    # Status line summary of the frame rate and frame times
+    def get_summary( self ):
+        return ( "Display: {:.1f} FPS    " +
+                 "Frame p50/p99/max: {:.1f}/{:.1f}/{:.1f} ms    " +
+                 "Render p99: {:.1f} ms    Dropped frames: {}" ).format(
+                       self.get_rate()                            ,
+                       self.frame_times.get_percentile( 50.0  )*1e3,
+                       self.frame_times.get_percentile( 99.0  )*1e3,
+                       self.frame_times.get_percentile( 100.0 )*1e3,
+                       self.render_times.get_percentile( 99.0 )*1e3,
+                       self.num_dropped                            )
+    ## get_summary ##
+## Render_Scheduler ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
@@ -0,0 +1,538 @@
+####################################################################################
+#                                                                                  #
+# run_catalog.py -- SQLite catalog of the runs under output/                       #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+# Usage:                                                                           #
+#       python run_catalog.py scan                 index new and changed logs      #
+#       python run_catalog.py query chamber_pressure --above 300                   #
+#                                                                                  #
+# The GUI registers each run as it starts and keeps its row up to date while it    #
+# is written; scan picks up logs written without the catalog, e.g. before it       #
+# existed or by convert_logs.py                                                    #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import argparse
+import datetime
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import log_writer  as SDR_log_writer
+import log_reader  as SDR_log_reader
+import run_journal as SDR_run_journal
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Catalog database, kept in the output root
+CATALOG_FILENAME = "run_catalog.sqlite"
+
+# Run directories are named by date
+DATE_FORMAT = "%m-%d-%Y"
+
+# Engine logs, engine_dataN plus the extension of any log format
+LOG_PATTERN = re.compile( r"^engine_data(\d+)(" +
+                          "|".join( re.escape( extension ) for extension in
+                                    SDR_log_writer.log_extensions.values() ) +
+                          r")$" )
+
+# Bytes hashed from each end of a log for its fingerprint
+FINGERPRINT_BYTES = 2**20
+
+# An open run whose GUI has not updated it for this long is treated as finished
+OPEN_RUN_TIMEOUT = 60.0 # seconds
+
+# Gauge names of the sensor channels
+channel_aliases = {
+                  "chamber_pressure"   : "pt4",
+                  "engine_pressure"    : "pt4",
+                  "fuel_tank_pressure" : "pt7",
+                  "lox_pressure"       : "pt0",
+                  "thrust"             : "lc" ,
+                  "lox_temperature"    : "tc"
+                  }
+
+# Final engine state in run events and rate transition comments
+STATE_PATTERN = re.compile( r"(?:new_state=|rate transition: .* -> )" +
+                            r"(.+? State)" )
+
+# Catalog schema
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    filename    TEXT UNIQUE NOT NULL,
+    date        TEXT,
+    test_num    INTEGER,
+    log_format  TEXT,
+    duration    REAL,
+    num_samples INTEGER,
+    final_state TEXT,
+    size        INTEGER,
+    mtime       REAL,
+    fingerprint TEXT,
+    status      TEXT,
+    updated     REAL
+);
+CREATE TABLE IF NOT EXISTS channels (
+    run_id INTEGER NOT NULL REFERENCES runs( run_id ) ON DELETE CASCADE,
+    name   TEXT    NOT NULL,
+    units  TEXT,
+    min    REAL,
+    max    REAL,
+    PRIMARY KEY ( run_id, name )
+);
+CREATE INDEX IF NOT EXISTS channels_max ON channels ( name, max );
+CREATE INDEX IF NOT EXISTS channels_min ON channels ( name, min );
+CREATE TABLE IF NOT EXISTS run_numbers (
+    directory TEXT PRIMARY KEY,
+    next_num  INTEGER NOT NULL
+);
+"""
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         file_status                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Size and modification time of a log; for a directory log, the total      #
+#         size and newest modification time of its files                           #
+#                                                                                  #
+####################################################################################
+def file_status( filename ):
+    if ( not os.path.isdir( filename ) ):
+        status = os.stat( filename )
+        return status.st_size, status.st_mtime
+    size  = 0
+    mtime = os.stat( filename ).st_mtime
+    for name in os.listdir( filename ):
+        status = os.stat( os.path.join( filename, name ) )
+        size  += status.st_size
+        mtime  = max( mtime, status.st_mtime )
+    return size, mtime
+## file_status ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         fingerprint                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Content fingerprint of a log: a hash of its size and of the first and    #
+#         last FINGERPRINT_BYTES of each file, so it costs the same for any log    #
+#         size and still changes when samples are appended or rewritten            #
+#                                                                                  #
+####################################################################################
+def fingerprint( filename ):
+    digest = hashlib.blake2b( digest_size = 16 )
+    if ( os.path.isdir( filename ) ):
+        filenames = [ os.path.join( filename, name )
+                      for name in sorted( os.listdir( filename ) ) ]
+    else:
+        filenames = [ filename ]
+    for path in filenames:
+        size = os.path.getsize( path )
+        digest.update( os.path.basename( path ).encode( "utf-8" ) )
+        digest.update( size.to_bytes( 8, "little" ) )
+        with open( path, "rb" ) as file:
+            digest.update( file.read( FINGERPRINT_BYTES ) )
+            if ( size > FINGERPRINT_BYTES ):
+                file.seek( max( size - FINGERPRINT_BYTES, FINGERPRINT_BYTES ) )
+                digest.update( file.read() )
+    return digest.hexdigest()
+## fingerprint ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         channel_ranges                                                           #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Minimum and maximum of every channel of a structured sample array,       #
+#         ignoring NaNs. Returns { name: ( min, max ) }, leaving out channels      #
+#         with no values                                                           #
+#                                                                                  #
+####################################################################################
+def channel_ranges( samples ):
+    ranges = {}
+    for name in samples.dtype.names:
+        values = np.asarray( samples[name], dtype = np.float64 )
+        values = values[~np.isnan( values )]
+        if ( len( values ) > 0 ):
+            ranges[name] = ( float( values.min() ), float( values.max() ) )
+    return ranges
+## channel_ranges ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         final_state                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Last engine state named by a run's events or rate transition comments,   #
+#         or None. Journals are read from their event index; other logs from       #
+#         their notes file or, for text logs, their own comment lines              #
+#                                                                                  #
+####################################################################################
+def final_state( filename, log_format ):
+    if ( log_format == "journal" ):
+        journal = SDR_run_journal.Run_Journal( filename )
+        events  = journal.events( "state_transition" )
+        if ( len( events ) > 0 ):
+            return events[-1].fields.get( "new_state" )
+        return None
+    if ( log_format == "text" ):
+        text_filename = filename
+    else:
+        text_filename = os.path.join( os.path.dirname( filename ),
+                                      re.sub( r"^engine_data(\d+).*$",
+                                              r"engine_notes\1.txt",
+                                              os.path.basename( filename ) ) )
+    if ( not os.path.exists( text_filename ) ):
+        return None
+    state = None
+    with open( text_filename, "r", errors = "replace" ) as file:
+        for line in file:
+            if ( line.startswith( "#" ) ):
+                match = STATE_PATTERN.search( line )
+                if ( match ):
+                    state = match.group( 1 )
+    return state
+## final_state ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Channel_Ranges                                                             #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Minimum and maximum of every channel, and the number of samples, logged    #
+#       since the catalog was last updated. Filled by the logging thread and       #
+#       taken by the GUI thread, so a run's catalog entry keeps up with its log    #
+#       without the log being read back                                            #
+#                                                                                  #
+####################################################################################
+class Channel_Ranges:
+
+    # Initialization
+    def __init__( self ):
+        self.lock        = threading.Lock()
+        self.ranges      = {}
+        self.num_samples = 0
+    ## __init__ ##
+
+    # Widen the ranges by a structured sample array
+    def add( self, samples ):
+        if ( len( samples ) == 0 ):
+            return
+        sample_ranges = channel_ranges( samples )
+        with self.lock:
+            for name, ( low, high ) in sample_ranges.items():
+                if ( name in self.ranges ):
+                    low  = min( low , self.ranges[name][0] )
+                    high = max( high, self.ranges[name][1] )
+                self.ranges[name] = ( low, high )
+            self.num_samples += len( samples )
+    ## add ##
+
+    # Ranges { name: ( min, max ) } and number of samples added since the last
+    # take
+    def take( self ):
+        with self.lock:
+            ranges, num_samples = self.ranges, self.num_samples
+            self.ranges         = {}
+            self.num_samples    = 0
+        return ranges, num_samples
+    ## take ##
+## Channel_Ranges ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Run_Catalog                                                                #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		SQLite catalog of the runs under an output root: one row per log with its  #
+#       date, duration, final engine state, size and fingerprint, and the range    #
+#       of every channel. Run numbers come from a per-directory counter, seeded    #
+#       once from the files already in the directory                               #
+#                                                                                  #
+####################################################################################
+class Run_Catalog:
+
+    # Initialization
+    def __init__( self, output_root = "output" ):
+        self.output_root = output_root
+        os.makedirs( output_root, exist_ok = True )
+        self.connection  = sqlite3.connect( os.path.join( output_root,
+                                                          CATALOG_FILENAME ),
+                                            timeout = 10.0 )
+        self.connection.execute( "PRAGMA foreign_keys = ON" )
+        self.connection.executescript( SCHEMA )
+    ## __init__ ##
+
+    # Catalog key of a log or run directory: its path relative to the output
+    # root, so the catalog does not depend on the working directory
+    def get_key( self, filename ):
+        return os.path.relpath( os.path.abspath( filename ),
+                                os.path.abspath( self.output_root ) )
+    ## get_key ##
+
+    # Reserve the next run number of a run directory. The first call for a
+    # directory counts past the engine logs already in it; numbers taken since
+    # by logs written without the catalog are skipped
+    def allocate_test_num( self, directory ):
+        key = self.get_key( directory )
+        with self.connection:
+            row = self.connection.execute(
+                      "SELECT next_num FROM run_numbers WHERE directory = ?",
+                      ( key, ) ).fetchone()
+            if ( row is None ):
+                test_num = 0
+                if ( os.path.isdir( directory ) ):
+                    for name in os.listdir( directory ):
+                        match = LOG_PATTERN.match( name )
+                        if ( match ):
+                            test_num = max( test_num, int( match.group( 1 ) ) + 1 )
+            else:
+                test_num = row[0]
+            base_filename = os.path.join( directory, "engine_data" )
+            extensions    = SDR_log_writer.log_extensions.values()
+            while ( any( os.path.exists( base_filename + str( test_num ) + ext )
+                         for ext in extensions ) ):
+                test_num += 1
+            self.connection.execute(
+                      "INSERT OR REPLACE INTO run_numbers VALUES ( ?, ? )",
+                      ( key, test_num + 1 ) )
+        return test_num
+    ## allocate_test_num ##
+
+    # Register a log, returns its run id. A log that is already registered
+    # keeps its row
+    def add_run( self, filename, log_format, status = "open" ):
+        directory = os.path.dirname( os.path.abspath( filename ) )
+        directory = os.path.basename( directory )
+        try:
+            date = datetime.datetime.strptime( directory, DATE_FORMAT ).date()
+        except ValueError:
+            date = datetime.date.fromtimestamp( time.time() )
+        match    = LOG_PATTERN.match( os.path.basename( filename ) )
+        test_num = int( match.group( 1 ) ) if match else None
+        with self.connection:
+            self.connection.execute(
+                      "INSERT OR IGNORE INTO runs ( filename, date, test_num, " +
+                      "log_format, status, updated ) VALUES ( ?, ?, ?, ?, ?, ? )",
+                      ( self.get_key( filename ), date.isoformat(), test_num,
+                        log_format, status, time.time() ) )
+        return self.get_run_id( filename )
+    ## add_run ##
+
+    # Run id of a log, or None
+    def get_run_id( self, filename ):
+        row = self.connection.execute( "SELECT run_id FROM runs WHERE filename = ?",
+                                       ( self.get_key( filename ), ) ).fetchone()
+        return None if ( row is None ) else row[0]
+    ## get_run_id ##
+
+    # Widen the channel ranges of a run by { name: ( min, max ) }, count
+    # new_samples more samples and record its latest engine state. Updates
+    # only ever widen and add, so a continued run picks up where it left off
+    def update_run(
+                  self                ,
+                  run_id              ,
+                  ranges      = None  ,
+                  units       = None  ,
+                  new_samples = 0     ,
+                  final_state = None
+                  ):
+        if ( units is None ):
+            units = {}
+        with self.connection:
+            if ( ranges is not None ):
+                self.connection.executemany(
+                      "INSERT INTO channels VALUES ( ?, ?, ?, ?, ? ) " +
+                      "ON CONFLICT ( run_id, name ) DO UPDATE SET " +
+                      "min = MIN( min, excluded.min ), " +
+                      "max = MAX( max, excluded.max ), " +
+                      "units = COALESCE( excluded.units, units )",
+                      [ ( run_id, name, units.get( name ), low, high )
+                        for name, ( low, high ) in ranges.items() ] )
+            self.connection.execute(
+                      "UPDATE runs SET " +
+                      "duration = ( SELECT max - min FROM channels " +
+                      "             WHERE run_id = ? AND name = 'time' ), " +
+                      "num_samples = COALESCE( num_samples, 0 ) + ?, " +
+                      "final_state = COALESCE( ?, final_state ), " +
+                      "updated = ? WHERE run_id = ?",
+                      ( run_id, new_samples, final_state, time.time(), run_id ) )
+    ## update_run ##
+
+    # Record the size, modification time and fingerprint of a finished log
+    def finish_run( self, run_id, filename ):
+        size, mtime = file_status( filename )
+        with self.connection:
+            self.connection.execute(
+                      "UPDATE runs SET size = ?, mtime = ?, fingerprint = ?, " +
+                      "status = 'complete', updated = ? WHERE run_id = ?",
+                      ( size, mtime, fingerprint( filename ), time.time(),
+                        run_id ) )
+    ## finish_run ##
+
+    # Catalog a log from its contents, replacing what was known about it
+    def index_log( self, filename ):
+        log_format = SDR_log_reader.log_format( filename )
+        log        = SDR_log_reader.open_log( filename, log_format )
+        records    = log.get_records()
+        units      = { name: log.get_units( name ) for name in log.get_names() }
+        run_id     = self.add_run( filename, log_format )
+        with self.connection:
+            self.connection.execute( "DELETE FROM channels WHERE run_id = ?",
+                                     ( run_id, ) )
+            self.connection.execute( "UPDATE runs SET num_samples = 0, " +
+                                     "final_state = NULL WHERE run_id = ?",
+                                     ( run_id, ) )
+        self.update_run(
+                       run_id                                         ,
+                       ranges      = channel_ranges( records )        ,
+                       units       = units                            ,
+                       new_samples = len( records )                   ,
+                       final_state = final_state( filename, log_format )
+                       )
+        self.finish_run( run_id, filename )
+        return run_id
+    ## index_log ##
+
+    # Catalog every engine log under the output root that is new or changed
+    # since it was cataloged. Runs still being written are left alone. Returns
+    # the number of logs indexed
+    def scan( self ):
+        num_indexed = 0
+        for directory in sorted( os.listdir( self.output_root ) ):
+            path = os.path.join( self.output_root, directory )
+            if ( not os.path.isdir( path ) ):
+                continue
+            for name in sorted( os.listdir( path ) ):
+                if ( not LOG_PATTERN.match( name ) ):
+                    continue
+                filename = os.path.join( path, name )
+                row      = self.connection.execute(
+                               "SELECT size, mtime, status, updated FROM runs " +
+                               "WHERE filename = ?",
+                               ( self.get_key( filename ), ) ).fetchone()
+                if ( row is not None ):
+                    size, mtime, status, updated = row
+                    if ( ( status == "open" ) and
+                         ( time.time() - updated < OPEN_RUN_TIMEOUT ) ):
+                        continue
+                    if ( ( status == "complete" ) and
+                         ( [ size, mtime ] == list( file_status( filename ) ) ) ):
+                        continue
+                try:
+                    self.index_log( filename )
+                    num_indexed += 1
+                except ( OSError, ValueError ) as error:
+                    print( "could not index {}: {}".format( filename, error ) )
+        return num_indexed
+    ## scan ##
+
+    # Runs whose channel went above and/or below a value, newest first. channel
+    # may be a sensor name or an entry of channel_aliases
+    def find_runs( self, channel, above = None, below = None ):
+        channel    = channel_aliases.get( channel, channel )
+        conditions = [ "channels.name = ?" ]
+        values     = [ channel ]
+        if ( above is not None ):
+            conditions.append( "channels.max > ?" )
+            values.append( above )
+        if ( below is not None ):
+            conditions.append( "channels.min < ?" )
+            values.append( below )
+        cursor = self.connection.execute(
+                      "SELECT runs.*, channels.min, channels.max, channels.units " +
+                      "FROM runs JOIN channels USING ( run_id ) WHERE " +
+                      " AND ".join( conditions ) +
+                      " ORDER BY runs.date DESC, runs.test_num DESC", values )
+        names = [ column[0] for column in cursor.description ]
+        return [ dict( zip( names, row ) ) for row in cursor.fetchall() ]
+    ## find_runs ##
+
+    # Close the database
+    def close( self ):
+        self.connection.close()
+    ## close ##
+## Run_Catalog ##
+
+
+####################################################################################
+# Main application entry point                                                     #
+####################################################################################
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser( description = "SDR run catalog" )
+    arg_parser.add_argument(
+                           "--output"                                        ,
+                           default = "output"                                ,
+                           help    = "output root holding the run directories"
+                           )
+    commands = arg_parser.add_subparsers( dest = "command", required = True )
+    commands.add_parser( "scan", help = "index new and changed logs" )
+    query_parser = commands.add_parser( "query",
+                                        help = "find runs by channel range" )
+    query_parser.add_argument( "channel", help = "sensor name or " +
+                                                 ", ".join( channel_aliases ) )
+    query_parser.add_argument( "--above", type = float, default = None )
+    query_parser.add_argument( "--below", type = float, default = None )
+    args = arg_parser.parse_args()
+
+    catalog = Run_Catalog( args.output )
+    if ( args.command == "scan" ):
+        start_time  = time.perf_counter()
+        num_indexed = catalog.scan()
+        print( "indexed {} logs in {:.1f} s".format(
+                   num_indexed                         ,
+                   time.perf_counter() - start_time    ) )
+    else:
+        for run in catalog.find_runs( args.channel, args.above, args.below ):
+            print( ( "{}  run {:<4} {:<10} {:>8.1f} s  {:<22} " +
+                     "min {:.6g} max {:.6g} {}  {}" ).format(
+                       run["date"]                       ,
+                       str( run["test_num"] )            ,
+                       run["log_format"]                 ,
+                       run["duration"] or 0.0            ,
+                       run["final_state"] or "-"         ,
+                       run["min"]                        ,
+                       run["max"]                        ,
+                       run["units"] or ""                ,
+                       run["filename"]                   ) )
+    catalog.close()
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
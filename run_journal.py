@@ -0,0 +1,334 @@
+####################################################################################
+#                                                                                  #
+# run_journal.py -- append-only journal of sensor samples and run events           #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+# File layout:                                                                     #
+#       binary_log header (magic SDRJNL) | record | record | ...                   #
+#   record:                                                                        #
+#       record type (u1) | pad (3) | payload length (u32) | time (f8) | payload    #
+#   sample record payload: fixed-width samples of the header dtype                 #
+#   event record payload:  event type (u1) | UTF-8 JSON of the event fields        #
+#                                                                                  #
+# Event index (<journal>.idx), one fixed-width entry per event:                    #
+#       time (f8) | event type (u1) | journal offset of the record (u8)            #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import json
+import os
+import struct
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import binary_log as SDR_binary_log
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# File identification
+MAGIC           = b"SDRJNL"
+FILE_EXTENSION  = ".sdrj"
+INDEX_EXTENSION = ".idx"
+
+# Record header
+RECORD_FORMAT = "<B3xId"
+RECORD_SIZE   = struct.calcsize( RECORD_FORMAT )
+SAMPLE_RECORD = 0
+EVENT_RECORD  = 1
+
+# Event type codes
+event_types = {
+              "note"             : 0, # free text, e.g. rate transitions
+              "state_transition" : 1, # engine state changed
+              "valve_command"    : 2, # operator toggled a valve
+              "abort"            : 3, # hotfire abort commanded
+              "reconnect"        : 4, # controller connected
+              "disconnect"       : 5, # controller link lost
+              "gui_detach"       : 6, # GUI exited on an error, run left open
+              "gui_reattach"     : 7  # restarted GUI resumed the run
+              }
+event_names = { code: name for name, code in event_types.items() }
+
+# Event index entry
+event_index_dtype = np.dtype( [
+                              ( "time"  , "<f8" ),
+                              ( "type"  , "u1"  ),
+                              ( "offset", "<u8" )
+                              ] )
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Run_Event                                                                  #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		A typed run event, stamped with the run time (perf_counter seconds since   #
+#       start) it happened at                                                      #
+#                                                                                  #
+####################################################################################
+class Run_Event:
+
+    # Initialization
+    def __init__( self, event_type, time_sec, **fields ):
+        self.event_type = event_type
+        self.time       = time_sec
+        self.fields     = fields
+    ## __init__ ##
+
+    # Log comment line, for logs without event records
+    def to_text( self ):
+        details = " ".join( "{}={}".format( name, value )
+                            for name, value in self.fields.items() )
+        return "# {:.6f} {}: {}\n".format( self.time, self.event_type, details )
+    ## to_text ##
+## Run_Event ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         scan_records                                                             #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Reads the record headers of a journal, seeking past the payloads.        #
+#         Returns a list of ( offset, record type, payload length, time ) tuples   #
+#         and the offset just past the last complete record                        #
+#                                                                                  #
+####################################################################################
+def scan_records( file, offset ):
+    records   = []
+    file_size = os.fstat( file.fileno() ).st_size
+    while ( offset + RECORD_SIZE <= file_size ):
+        file.seek( offset )
+        record_type, length, time_sec = struct.unpack( RECORD_FORMAT,
+                                                       file.read( RECORD_SIZE ) )
+        if ( ( record_type not in ( SAMPLE_RECORD, EVENT_RECORD ) ) or
+             ( offset + RECORD_SIZE + length > file_size ) ):
+            break
+        records.append( ( offset, record_type, length, time_sec ) )
+        offset += RECORD_SIZE + length
+    return records, offset
+## scan_records ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         decode_event                                                             #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Converts an event record payload and its time into a Run_Event           #
+#                                                                                  #
+####################################################################################
+def decode_event( payload, time_sec ):
+    fields = json.loads( payload[1:].decode( "utf-8" ) )
+    return Run_Event( event_names.get( payload[0], "unknown" ), time_sec, **fields )
+## decode_event ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Run_Journal_File                                                           #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Log file object for log_writer.Log_Writer that interleaves sample batches  #
+#       and typed events in one append-only file, in the order they were queued.   #
+#       Record times never decrease. Every event is also appended to the event     #
+#       index. Reopening a journal drops a torn final record and rebuilds the      #
+#       index from the records                                                     #
+#                                                                                  #
+####################################################################################
+class Run_Journal_File:
+
+    # Initialization
+    def __init__(
+                 self                 ,
+                 filename             , # journal filename
+                 dtype                , # structured sample dtype
+                 units       = None   , # field name to unit string
+                 metadata    = None     # extra header entries
+                ):
+        self.filename   = filename
+        self.dtype      = np.dtype( dtype ).newbyteorder( "<" )
+        self.last_time  = -np.inf
+        index_filename  = filename + INDEX_EXTENSION
+        if ( os.path.exists( filename ) and ( os.path.getsize( filename ) > 0 ) ):
+            _, file_dtype, offset = SDR_binary_log.read_header( filename, MAGIC )
+            if ( file_dtype != self.dtype ):
+                raise ValueError( filename + " holds records of a different dtype" )
+            self.file       = open( filename, "r+b" )
+            records, end    = scan_records( self.file, offset )
+            self.file.truncate( end )
+            self.file.seek( end )
+            self.index_file = open( index_filename, "wb" )
+            for record_offset, record_type, length, time_sec in records:
+                self.last_time = max( self.last_time, time_sec )
+                if ( record_type == EVENT_RECORD ):
+                    self.file.seek( record_offset + RECORD_SIZE )
+                    self._index_event( time_sec, self.file.read( 1 )[0],
+                                       record_offset )
+            self.file.seek( end )
+        else:
+            self.file       = open( filename, "wb" )
+            self.file.write( SDR_binary_log.build_header(
+                                        self.dtype                               ,
+                                        units    = units                         ,
+                                        metadata = metadata                      ,
+                                        magic    = MAGIC                         ,
+                                        extra    = { "event_types": event_types }
+                                                        ) )
+            self.index_file = open( index_filename, "wb" )
+    ## __init__ ##
+
+    # Append a record, returns its offset
+    def _write_record( self, record_type, time_sec, payload ):
+        self.last_time = max( self.last_time, time_sec )
+        offset         = self.file.tell()
+        self.file.write( struct.pack( RECORD_FORMAT, record_type, len( payload ),
+                                      self.last_time ) )
+        self.file.write( payload )
+        return offset
+    ## _write_record ##
+
+    # Append an entry to the event index
+    def _index_event( self, time_sec, type_code, offset ):
+        entry = np.array( [ ( time_sec, type_code, offset ) ],
+                          dtype = event_index_dtype )
+        self.index_file.write( entry.tobytes() )
+    ## _index_event ##
+
+    # Append a structured array of samples as one record, stamped with the
+    # oldest sample time so events queued after the batch keep their own times
+    def write_samples( self, samples ):
+        if ( samples.dtype != self.dtype ):
+            samples = samples.astype( self.dtype )
+        self._write_record( SAMPLE_RECORD, float( samples["time"].min() ),
+                            np.ascontiguousarray( samples ).tobytes() )
+    ## write_samples ##
+
+    # Append a run event
+    def write_event( self, event ):
+        type_code = event_types[event.event_type]
+        fields    = json.dumps( event.fields ).encode( "utf-8" )
+        payload   = bytes( [ type_code ] ) + fields
+        offset    = self._write_record( EVENT_RECORD, event.time, payload )
+        self._index_event( self.last_time, type_code, offset )
+    ## write_event ##
+
+    # Append a line of text as a note event, stamped with the last record time
+    def write_text( self, text ):
+        time_sec = max( self.last_time, 0.0 )
+        self.write_event( Run_Event( "note", time_sec, text = text.strip() ) )
+    ## write_text ##
+
+    # Flush buffered data to the operating system, journal before index so an
+    # index entry never points past the journal
+    def flush( self ):
+        self.file.flush()
+        self.index_file.flush()
+    ## flush ##
+
+    # Force flushed data to disk
+    def sync( self ):
+        os.fsync( self.file.fileno() )
+        os.fsync( self.index_file.fileno() )
+    ## sync ##
+
+    # Close the journal
+    def close( self ):
+        self.file.close()
+        self.index_file.close()
+    ## close ##
+## Run_Journal_File ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Run_Journal                                                                #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Reader for a run journal. Events are listed from the event index without   #
+#       touching the sample records                                                #
+#                                                                                  #
+####################################################################################
+class Run_Journal:
+
+    # Initialization
+    def __init__( self, filename ):
+        self.filename = filename
+        self.header, self.dtype, self.data_offset = SDR_binary_log.read_header(
+                                                                 filename, MAGIC )
+    ## __init__ ##
+
+    # Event index entries that point into the journal, as a structured array
+    def read_index( self ):
+        index_filename = self.filename + INDEX_EXTENSION
+        if ( not os.path.exists( index_filename ) ):
+            return np.zeros( 0, dtype = event_index_dtype )
+        with open( index_filename, "rb" ) as file:
+            data = file.read()
+        num_entries = len( data )//event_index_dtype.itemsize
+        index       = np.frombuffer( data, dtype = event_index_dtype,
+                                     count = num_entries )
+        journal_end = os.path.getsize( self.filename )
+        return index[index["offset"] + RECORD_SIZE <= journal_end]
+    ## read_index ##
+
+    # List of Run_Events, optionally only those of one event type
+    def events( self, event_type = None ):
+        index = self.read_index()
+        if ( event_type is not None ):
+            index = index[index["type"] == event_types[event_type]]
+        events = []
+        with open( self.filename, "rb" ) as file:
+            for entry in index:
+                file.seek( int( entry["offset"] ) )
+                _, length, time_sec = struct.unpack( RECORD_FORMAT,
+                                                     file.read( RECORD_SIZE ) )
+                events.append( decode_event( file.read( length ), time_sec ) )
+        return events
+    ## events ##
+
+    # Samples between start_time and end_time (seconds, None for unbounded) as
+    # one structured array
+    def load_samples( self, start_time = None, end_time = None ):
+        parts = [ np.zeros( 0, dtype = self.dtype ) ]
+        with open( self.filename, "rb" ) as file:
+            records, _ = scan_records( file, self.data_offset )
+            for offset, record_type, length, _ in records:
+                if ( record_type != SAMPLE_RECORD ):
+                    continue
+                file.seek( offset + RECORD_SIZE )
+                samples = np.frombuffer( file.read( length ), dtype = self.dtype )
+                mask    = np.ones( len( samples ), dtype = bool )
+                if ( start_time is not None ):
+                    mask &= samples["time"] >= start_time
+                if ( end_time is not None ):
+                    mask &= samples["time"] <= end_time
+                parts.append( samples[mask] )
+        return np.concatenate( parts )
+    ## load_samples ##
+## Run_Journal ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
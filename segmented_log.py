@@ -0,0 +1,408 @@
+####################################################################################
+#                                                                                  #
+# segmented_log.py -- sample logs split into fixed-size binary segments with a     #
+#                     time index                                                   #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+# Directory layout:                                                                #
+#       index.txt                  sealed segments: file start_time end_time rows  #
+#       segment_000000.sdrlog      sealed segments, binary_log format              #
+#       segment_000001.sdrlog                                                      #
+#       segment_000002.sdrlog.partial   segment being written                      #
+#       segment_000003.sdrlog.unreadable   segment a crash left unreadable         #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import bisect
+import os
+import re
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import binary_log as SDR_binary_log
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Extension of a segmented log directory
+DIRECTORY_EXTENSION = ".segments"
+
+# Rows per segment, 2**18 rows is about a minute at 5 kHz
+DEFAULT_SEGMENT_ROWS = 2**18
+
+# Files within a segmented log directory
+INDEX_FILENAME    = "index.txt"
+SEGMENT_FORMAT    = "segment_{:06d}" + SDR_binary_log.FILE_EXTENSION
+PARTIAL_SUFFIX    = ".partial"
+UNREADABLE_SUFFIX = ".unreadable"
+SEGMENT_PATTERN   = re.compile( r"^segment_(\d+)" )
+INDEX_HEADER      = "# file start_time end_time rows\n"
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         sync_directory                                                           #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Makes renames within a directory durable, where the platform allows      #
+#         opening directories                                                      #
+#                                                                                  #
+####################################################################################
+def sync_directory( directory ):
+    if ( not hasattr( os, "O_DIRECTORY" ) ):
+        return
+    directory_fd = os.open( directory, os.O_RDONLY | os.O_DIRECTORY )
+    try:
+        os.fsync( directory_fd )
+    finally:
+        os.close( directory_fd )
+## sync_directory ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         read_index                                                               #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Reads the index of a segmented log, returns a list of ( filename,        #
+#         start time, end time, rows ) tuples in time order                        #
+#                                                                                  #
+####################################################################################
+def read_index( directory ):
+    entries  = []
+    filename = os.path.join( directory, INDEX_FILENAME )
+    if ( not os.path.exists( filename ) ):
+        return entries
+    with open( filename ) as file:
+        for line in file:
+            if ( line.startswith( "#" ) or ( len( line.strip() ) == 0 ) ):
+                continue
+            name, start_time, end_time, rows = line.split()
+            entries.append( ( name, float( start_time ), float( end_time ),
+                              int( rows ) ) )
+    return entries
+## read_index ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         write_index                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Replaces the index of a segmented log in a single atomic step            #
+#                                                                                  #
+####################################################################################
+def write_index( directory, entries ):
+    filename      = os.path.join( directory, INDEX_FILENAME )
+    temp_filename = filename + ".tmp"
+    with open( temp_filename, "w" ) as file:
+        file.write( INDEX_HEADER )
+        for name, start_time, end_time, rows in entries:
+            file.write( "{} {:.6f} {:.6f} {}\n".format( name, start_time, end_time,
+                                                        rows ) )
+        file.flush()
+        os.fsync( file.fileno() )
+    os.replace( temp_filename, filename )
+    sync_directory( directory )
+## write_index ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         index_entry                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Builds the index entry of a segment file from its contents. Returns      #
+#         None if the segment cannot be read, as when a crash tore its header      #
+#                                                                                  #
+####################################################################################
+def index_entry( directory, name ):
+    try:
+        _, records = SDR_binary_log.load( os.path.join( directory, name ) )
+    except ( ValueError, OSError ):
+        return None
+    if ( len( records ) == 0 ):
+        return ( name, 0.0, 0.0, 0 )
+    times = records["time"]
+    return ( name, float( times.min() ), float( times.max() ), len( records ) )
+## index_entry ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Segmented_Log_File                                                         #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Log file object for log_writer.Log_Writer that splits samples into         #
+#       segments of segment_rows rows. The open segment is written under a        #
+#       .partial name; once full it is synced, renamed to its final name and only  #
+#       then added to the index, so sealed segments and the index are never left   #
+#       half written. Reopening a directory seals whatever a crash left behind     #
+#                                                                                  #
+####################################################################################
+class Segmented_Log_File:
+
+    # Initialization
+    def __init__(
+                 self                                 ,
+                 directory                            , # segmented log directory
+                 dtype                                , # structured record dtype
+                 units          = None                , # field name to unit string
+                 metadata       = None                , # extra header entries
+                 notes_filename = None                , # text file for notes
+                 segment_rows   = DEFAULT_SEGMENT_ROWS
+                ):
+        self.directory      = directory
+        self.dtype          = dtype
+        self.units          = units
+        self.metadata       = metadata
+        self.notes_filename = notes_filename
+        self.notes_file     = None
+        self.segment_rows   = segment_rows
+        self.segment        = None # open Binary_Log_File
+        self.segment_name   = None
+        self.segment_count  = 0    # rows in the open segment
+        self.segment_start  = None
+        self.segment_end    = None
+        if ( not os.path.isdir( directory ) ):
+            os.makedirs( directory )
+        self.index          = self._recover()
+        self.next_segment   = self._next_number()
+    ## __init__ ##
+
+    # Number the next segment past every indexed segment and segment file, so
+    # gaps left by removed segments are not reused and no unreadable segment
+    # is renamed over by a later one
+    def _next_number( self ):
+        next_number = 0
+        names       = os.listdir( self.directory )
+        for name in names + [ entry[0] for entry in self.index ]:
+            match = SEGMENT_PATTERN.match( name )
+            if ( match is not None ):
+                next_number = max( next_number, int( match.group( 1 ) ) + 1 )
+        return next_number
+    ## _next_number ##
+
+    # Seal segments left open by a crash and index sealed segments the index
+    # missed, returns the index entries. Empty segments are removed and
+    # unreadable ones renamed aside
+    def _recover( self ):
+        entries = read_index( self.directory )
+        indexed = set( entry[0] for entry in entries )
+        changed = False
+        for name in sorted( os.listdir( self.directory ) ):
+            if ( name.endswith( PARTIAL_SUFFIX ) ):
+                sealed_name = name[:-len( PARTIAL_SUFFIX )]
+                os.replace( os.path.join( self.directory, name ),
+                            os.path.join( self.directory, sealed_name ) )
+                name = sealed_name
+            elif ( not name.endswith( SDR_binary_log.FILE_EXTENSION ) ):
+                continue
+            if ( name not in indexed ):
+                filename = os.path.join( self.directory, name )
+                entry    = index_entry( self.directory, name )
+                if ( ( entry is None ) and ( os.path.getsize( filename ) > 0 ) ):
+                    os.replace( filename, filename + UNREADABLE_SUFFIX )
+                elif ( ( entry is not None ) and ( entry[3] > 0 ) ):
+                    entries.append( entry )
+                    indexed.add( name )
+                else:
+                    os.remove( filename )
+                changed = True
+        if ( changed ):
+            entries.sort( key = lambda entry: entry[0] )
+            write_index( self.directory, entries )
+        return entries
+    ## _recover ##
+
+    # Start a new segment
+    def _open_segment( self ):
+        self.segment_name  = SEGMENT_FORMAT.format( self.next_segment )
+        self.segment       = SDR_binary_log.Binary_Log_File(
+                                 os.path.join( self.directory,
+                                               self.segment_name + PARTIAL_SUFFIX ),
+                                 self.dtype                                        ,
+                                 units    = self.units                            ,
+                                 metadata = self.metadata
+                                                           )
+        self.next_segment += 1
+        self.segment_count = 0
+        self.segment_start = None
+        self.segment_end   = None
+    ## _open_segment ##
+
+    # Sync the open segment, give it its final name and index it
+    def _seal_segment( self ):
+        self.segment.flush()
+        self.segment.sync()
+        self.segment.close()
+        os.replace( os.path.join( self.directory, self.segment_name + PARTIAL_SUFFIX ),
+                    os.path.join( self.directory, self.segment_name ) )
+        sync_directory( self.directory )
+        self.index.append( ( self.segment_name, self.segment_start, self.segment_end,
+                             self.segment_count ) )
+        write_index( self.directory, self.index )
+        self.segment = None
+    ## _seal_segment ##
+
+    # Append a structured array of samples, sealing segments as they fill
+    def write_samples( self, samples ):
+        while ( len( samples ) > 0 ):
+            if ( self.segment is None ):
+                self._open_segment()
+            rows  = min( len( samples ), self.segment_rows - self.segment_count )
+            chunk = samples[:rows]
+            self.segment.write_samples( chunk )
+            start = float( chunk["time"].min() )
+            end   = float( chunk["time"].max() )
+            if ( self.segment_start is None ):
+                self.segment_start = start
+                self.segment_end   = end
+            else:
+                self.segment_start = min( self.segment_start, start )
+                self.segment_end   = max( self.segment_end  , end   )
+            self.segment_count += rows
+            samples             = samples[rows:]
+            if ( self.segment_count >= self.segment_rows ):
+                self._seal_segment()
+    ## write_samples ##
+
+    # Append a line to the notes file
+    def write_text( self, text ):
+        if ( self.notes_filename is None ):
+            return
+        if ( self.notes_file is None ):
+            self.notes_file = open( self.notes_filename, "a" )
+        self.notes_file.write( text )
+    ## write_text ##
+
+    # Flush buffered data to the operating system
+    def flush( self ):
+        if ( self.segment is not None ):
+            self.segment.flush()
+        if ( self.notes_file is not None ):
+            self.notes_file.flush()
+    ## flush ##
+
+    # Force flushed data to disk
+    def sync( self ):
+        if ( self.segment is not None ):
+            self.segment.sync()
+        if ( self.notes_file is not None ):
+            os.fsync( self.notes_file.fileno() )
+    ## sync ##
+
+    # Seal the last, possibly short, segment and close the log
+    def close( self ):
+        if ( self.segment is not None ):
+            if ( self.segment_count > 0 ):
+                self._seal_segment()
+            else:
+                self.segment.close()
+                os.remove( os.path.join( self.directory,
+                                         self.segment_name + PARTIAL_SUFFIX ) )
+                self.segment = None
+        if ( self.notes_file is not None ):
+            self.notes_file.close()
+    ## close ##
+## Segmented_Log_File ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Segmented_Log                                                              #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Reader for a segmented log. Segments holding a time range are found by     #
+#       binary search of the index and only those are mapped into memory. With     #
+#       include_partial, a segment still being written is read as well             #
+#                                                                                  #
+####################################################################################
+class Segmented_Log:
+
+    # Initialization
+    def __init__( self, directory, include_partial = False ):
+        self.directory   = directory
+        self.index       = read_index( directory )
+        self.start_times = [ entry[1] for entry in self.index ]
+        self.end_times   = [ entry[2] for entry in self.index ]
+        self.partial     = None
+        if ( include_partial ):
+            for name in sorted( os.listdir( directory ) ):
+                if ( name.endswith( PARTIAL_SUFFIX ) ):
+                    self.partial = name
+    ## __init__ ##
+
+    # Total number of indexed rows
+    def __len__( self ):
+        return sum( entry[3] for entry in self.index )
+    ## __len__ ##
+
+    # Names of the segments that may hold samples between start_time and
+    # end_time (seconds, None for unbounded)
+    def find_segments( self, start_time = None, end_time = None ):
+        first = 0
+        last  = len( self.index )
+        if ( start_time is not None ):
+            first = bisect.bisect_left( self.end_times, start_time )
+        if ( end_time is not None ):
+            last  = bisect.bisect_right( self.start_times, end_time )
+        names = [ entry[0] for entry in self.index[first:last] ]
+        if ( self.partial is not None ):
+            names.append( self.partial )
+        return names
+    ## find_segments ##
+
+    # Segment holding a timestamp, or None
+    def segment_for_time( self, time_sec ):
+        position = bisect.bisect_left( self.end_times, time_sec )
+        if ( ( position < len( self.index ) ) and
+             ( self.start_times[position] <= time_sec ) ):
+            return self.index[position][0]
+        return None
+    ## segment_for_time ##
+
+    # Header and samples between start_time and end_time (seconds, None for
+    # unbounded) as one structured array, both None if no segment matches
+    def load( self, start_time = None, end_time = None ):
+        header = None
+        parts  = []
+        for name in self.find_segments( start_time, end_time ):
+            header, records = SDR_binary_log.load( os.path.join( self.directory,
+                                                                 name ) )
+            mask = np.ones( len( records ), dtype = bool )
+            if ( start_time is not None ):
+                mask &= records["time"] >= start_time
+            if ( end_time is not None ):
+                mask &= records["time"] <= end_time
+            parts.append( records[mask] )
+        if ( len( parts ) == 0 ):
+            return header, None
+        return header, np.concatenate( parts )
+    ## load ##
+## Segmented_Log ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
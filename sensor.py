@@ -63,6 +63,21 @@ def format_sensor_readout( controller, sensor, readout ):
 ## format_sensor_readout ##
 
 
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         get_sensor_units                                                         #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#        Returns a dictionary of the units of each sensor of a controller, None    #
+#        for unitless sensors                                                      #
+#                                                                                  #
+####################################################################################
+def get_sensor_units( controller ):
+    return dict( SDR_controller.sensor_units.get( controller, {} ) )
+## get_sensor_units ##
+
+
 ###################################################################################
 # END OF FILE                                                                     # 
 ###################################################################################
\ No newline at end of file
@@ -0,0 +1,239 @@
+####################################################################################
+#                                                                                  #
+# sensor_frames.py -- NumPy layouts for batched sensor frame decoding              #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import itertools
+import warnings
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import controller_protocol as SDR_protocol
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Sensor channels, one float32 field per sensor
+sensor_fields = [ ( name, "<f4" ) for name in SDR_protocol.sensor_names ]
+
+# Wire layout of a streaming telemetry frame
+frame_dtype = np.dtype( [
+                        ( "sync"       , "V2"  ),
+                        ( "type"       , "u1"  ),
+                        ( "length"     , "u1"  ),
+                        ( "sequence"   , "<u2" ),
+                        ( "device_time", "<u4" )
+                        ] + sensor_fields + [
+                        ( "crc"        , "<u2" )
+                        ] )
+
+# Host-side sample: acquisition time in seconds followed by the sensor channels
+sample_dtype = np.dtype( [ ( "time", "<f8" ) ] + sensor_fields )
+
+# Text log lines parsed per chunk, bounding the memory used per file
+DEFAULT_CHUNK_ROWS = 65536
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         decode_frames                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Views a buffer of N back-to-back telemetry frames as a structured array  #
+#         with one named field per sensor. The buffer is not copied               #
+#                                                                                  #
+####################################################################################
+def decode_frames( buffer ):
+    return np.frombuffer( buffer, dtype = frame_dtype )
+## decode_frames ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         frames_to_samples                                                        #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Converts decoded telemetry frames into samples with the given            #
+#         acquisition time(s)                                                      #
+#                                                                                  #
+####################################################################################
+def frames_to_samples( frames, time_sec ):
+    samples         = np.empty( len( frames ), dtype = sample_dtype )
+    samples["time"] = time_sec
+    for name in SDR_protocol.sensor_names:
+        samples[name] = frames[name]
+    return samples
+## frames_to_samples ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         readouts_to_sample                                                       #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Converts a sensor readouts dictionary into a single sample               #
+#                                                                                  #
+####################################################################################
+def readouts_to_sample( readouts, time_sec ):
+    sample = np.empty( 1, dtype = sample_dtype )
+    sample["time"] = time_sec
+    for name in SDR_protocol.sensor_names:
+        sample[name] = readouts[name]
+    return sample
+## readouts_to_sample ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         sample_to_readouts                                                       #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Converts one sample back into a sensor readouts dictionary               #
+#                                                                                  #
+####################################################################################
+def sample_to_readouts( sample ):
+    return { name: float( sample[name] ) for name in SDR_protocol.sensor_names }
+## sample_to_readouts ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         text_formats                                                             #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Text log column formats for a structured sample dtype                    #
+#                                                                                  #
+####################################################################################
+def text_formats( dtype ):
+    formats = []
+    for name in dtype.names:
+        if   ( name == "time" ):
+            formats.append( "%.6f" )
+        elif ( dtype[name].kind in "iu" ):
+            formats.append( "%d" )
+        else:
+            formats.append( "%.7g" )
+    return formats
+## text_formats ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         write_text_rows                                                          #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Appends samples to a space-separated text log, one row per sample in     #
+#         field order                                                              #
+#                                                                                  #
+####################################################################################
+def write_text_rows( file, samples ):
+    columns = np.column_stack( [ samples[name] for name in samples.dtype.names ] )
+    np.savetxt(
+              file                                      ,
+              columns                                   ,
+              fmt       = text_formats( samples.dtype ) ,
+              delimiter = " "                           ,
+              newline   = " \n"
+              )
+## write_text_rows ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         parse_text_rows                                                          #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Parses space-separated sample rows into a structured array of dtype.     #
+#         Rows without one number per field, such as a line cut short by a crash,  #
+#         are skipped; returns the samples and the number of rows skipped          #
+#                                                                                  #
+####################################################################################
+def parse_text_rows( lines, dtype ):
+    num_fields = len( dtype.names )
+    values     = None
+    if ( len( lines ) > 0 ):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter( "ignore" )
+                values = np.loadtxt( lines, dtype = np.float64, ndmin = 2 )
+            if ( values.shape[1] != num_fields ):
+                values = None
+        except ValueError:
+            values = None
+    num_skipped = 0
+    if ( values is None ):
+        rows = []
+        for line in lines:
+            fields = line.split()
+            try:
+                if ( len( fields ) != num_fields ):
+                    raise ValueError
+                rows.append( [ float( field ) for field in fields ] )
+            except ValueError:
+                num_skipped += 1
+        values = np.array( rows, dtype = np.float64 ).reshape( -1, num_fields )
+    samples = np.empty( len( values ), dtype = dtype )
+    for column, name in enumerate( dtype.names ):
+        samples[name] = values[:, column]
+    return samples, num_skipped
+## parse_text_rows ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         read_text_log                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Streams a text log chunk_rows lines at a time. Yields sample arrays and  #
+#         comment lines (rate transitions, run events) in file order, and counts   #
+#         skipped rows in stats["skipped"]                                         #
+#                                                                                  #
+####################################################################################
+def read_text_log( filename, dtype, stats, chunk_rows = DEFAULT_CHUNK_ROWS ):
+    with open( filename, "r", errors = "replace" ) as file:
+        while ( True ):
+            lines = list( itertools.islice( file, chunk_rows ) )
+            if ( len( lines ) == 0 ):
+                break
+            start = 0
+            for comment in [ index for index, line in enumerate( lines )
+                             if line.lstrip().startswith( "#" ) ] + [ None ]:
+                data_lines = [ line for line in lines[start:comment]
+                               if not line.isspace() ]
+                samples, num_skipped = parse_text_rows( data_lines, dtype )
+                stats["skipped"] += num_skipped
+                if ( len( samples ) > 0 ):
+                    yield samples
+                if ( comment is not None ):
+                    yield lines[comment]
+                    start = comment + 1
+## read_text_log ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
@@ -20,6 +20,43 @@ import sys
 # Project Imports                                                                  #
 ####################################################################################
 import engineController
+import serial_transport as SDR_serial_transport
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Blocking sdec implementations of the engine subcommands
+engine_commands = {
+                  "pfpurge"          : engineController.pfpurge         ,
+                  "fillchill"        : engineController.fillchill       ,
+                  "standby"          : engineController.standby         ,
+                  "hotfire"          : engineController.hotfire         ,
+                  "hotfire_abort"    : engineController.hotfire_abort   ,
+                  "hotfire_getstate" : engineController.hotfire_getstate,
+                  "stop_hotfire"     : engineController.stop_hotfire    ,
+                  "stop_purge"       : engineController.stop_purge      ,
+                  "kbottle_close"    : engineController.kbottle_close
+                  }
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+# 		engine_command                                                             #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Issues an engine subcommand over the asyncio transport if one is in use,   #
+#       otherwise over the blocking sdec serial object                             #
+#                                                                                  #
+####################################################################################
+def engine_command( command, serialObj ):
+    if ( isinstance( serialObj, SDR_serial_transport.Serial_Transport ) ):
+        serialObj.engine_command( command )
+    else:
+        engine_commands[command]( [], serialObj )
+## engine_command ##
 
 
 ####################################################################################
@@ -48,7 +85,7 @@ def pre_fire_purge( engine_state, serialObj ):
         return
 
     # Initiate the pre-fire purge
-    engineController.pfpurge( [], serialObj )
+    engine_command( "pfpurge", serialObj )
 
     # Set the new engine state
     engine_state.set_engine_state( serialObj.get_engine_state() )
@@ -76,7 +113,7 @@ def fill_and_chill( engine_state, serialObj ):
         return
 
     # Initiate the fill and chill sequence
-    engineController.fillchill( [], serialObj )
+    engine_command( "fillchill", serialObj )
 
     # Set the new engine state
     engine_state.set_engine_state( serialObj.get_engine_state() )
@@ -104,7 +141,7 @@ def standby( engine_state, serialObj ):
         return
 
     # Put the engine in standby state
-    engineController.standby( [], serialObj )
+    engine_command( "standby", serialObj )
 
     # Set the new engine state
     engine_state.set_engine_state( serialObj.get_engine_state() )
@@ -132,7 +169,7 @@ def fire_engine( engine_state, serialObj ):
         return
 
     # Initiate the hotfire
-    engineController.hotfire( [], serialObj )
+    engine_command( "hotfire", serialObj )
 
     # Set the new engine state
     engine_state.set_engine_state( serialObj.get_engine_state() )
@@ -151,7 +188,7 @@ def fire_engine( engine_state, serialObj ):
 def hotfire_abort( engine_state, serialObj ):
 
     # Issue the abort command
-    engineController.hotfire_abort( [], serialObj )
+    engine_command( "hotfire_abort", serialObj )
 
     # Set the new engine state
     engine_state.set_engine_state( serialObj.get_engine_state() )
@@ -168,7 +205,7 @@ def hotfire_abort( engine_state, serialObj ):
 #                                                                                  #
 ####################################################################################
 def get_state( engine_state, serObj ):
-    engineController.hotfire_getstate( [], serObj )
+    engine_command( "hotfire_getstate", serObj )
     engine_state.set_engine_state( serObj.get_engine_state() )
 ## get_state ## 
 
@@ -194,7 +231,7 @@ def stop_hotfire( engine_state, serialObj ):
         return
     
     # Issue the stop hotfire command 
-    engineController.stop_hotfire( [], serialObj )
+    engine_command( "stop_hotfire", serialObj )
 ## stop_hotfire ## 
 
 
@@ -219,7 +256,7 @@ def stop_purge( engine_state, serialObj ):
         return
     
     # Issue the stop purge command
-    engineController.stop_purge( [], serialObj )
+    engine_command( "stop_purge", serialObj )
 
     # Set the new engine state
     engine_state.set_engine_state( serialObj.get_engine_state() )
@@ -247,10 +284,10 @@ def kbottle_close( engine_state, serialObj ):
         return
     
     # Issue the kbottle close command
-    engineController.kbottle_close( [], serialObj )
+    engine_command( "kbottle_close", serialObj )
 
     # Set the new engine state
-    engine_state.set_engine_state( serialObj.get_engine_set() )
+    engine_state.set_engine_state( serialObj.get_engine_state() )
 ## kbottle_close ##
 
 
@@ -0,0 +1,405 @@
+####################################################################################
+#                                                                                  #
+# serial_transport.py -- asyncio serial transport that multiplexes engine          #
+#                        commands and telemetry polls over one open port           #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import asyncio
+import collections
+import concurrent.futures
+import itertools
+import struct
+import threading
+
+# Serial (USB)
+import serial_asyncio
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import controller_protocol as SDR_protocol
+import telemetry_stream    as SDR_telemetry_stream
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Request priorities, lower values are sent first
+COMMAND_PRIORITY   = 0
+TELEMETRY_PRIORITY = 1
+
+# Requests written to the controller before their responses arrive
+DEFAULT_MAX_IN_FLIGHT = 2
+
+# Response timeout and the quiet period used to resynchronize after one
+DEFAULT_TIMEOUT = 1.0 # seconds
+RESYNC_QUIET    = 0.05 # seconds
+
+# Streaming mode receive parameters
+READ_CHUNK_SIZE    = 4096 # bytes
+STREAM_POLL_PERIOD = 0.05 # seconds between checks for expired requests
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Serial_Request                                                             #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		A request written to the controller and the response it expects. Outside  #
+#       of streaming mode the response is a fixed number of raw bytes; while       #
+#       streaming it is the payload of the next response frame                     #
+#                                                                                  #
+####################################################################################
+class Serial_Request:
+
+    # Initialization
+    def __init__( self, payload, response_size, future, stream_mode = None ):
+        self.payload       = payload
+        self.response_size = response_size
+        self.future        = future
+        self.stream_mode   = stream_mode # streaming state once answered, or None
+        self.deadline      = None
+    ## __init__ ##
+## Serial_Request ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Serial_Transport                                                           #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Keeps the controller serial port open as an asyncio stream on a dedicated  #
+#       event loop thread. Requests from any thread are queued by priority and     #
+#       pipelined onto the port; the controller answers in order, so each         #
+#       response is matched to the oldest request still in flight. Engine         #
+#       commands jump ahead of queued telemetry polls and only ever wait for the  #
+#       requests already on the wire. In streaming mode, telemetry frames pushed   #
+#       by the controller are handed to a callback and response frames are        #
+#       matched to requests as above. A port error or close() fails every request  #
+#       in flight or queued, and every later request, with a ConnectionError       #
+#                                                                                  #
+####################################################################################
+class Serial_Transport:
+
+    # Initialization
+    def __init__(
+                 self                                 ,
+                 serialObj                            , # connected sdec terminalData
+                 max_in_flight = DEFAULT_MAX_IN_FLIGHT, # pipelining depth
+                 timeout       = DEFAULT_TIMEOUT        # response timeout (s)
+                ):
+        self.serialObj          = serialObj
+        self.max_in_flight      = max_in_flight
+        self.timeout            = timeout
+        self.engine_state       = serialObj.get_engine_state()
+        self.sequence           = itertools.count()
+        self.pending            = collections.deque()
+        self.streaming          = False
+        self.parser             = SDR_telemetry_stream.Frame_Parser()
+        self.telemetry_callback = None
+        self.error              = None # ConnectionError that ended the link
+        self.open_error         = None
+        self.loop               = asyncio.new_event_loop()
+        self.ready              = threading.Event()
+        self.thread             = threading.Thread(
+                                             target = self._run_loop,
+                                             daemon = True          ,
+                                             name   = "serial transport"
+                                             )
+        self.thread.start()
+        self.ready.wait()
+        if ( self.open_error is not None ):
+            self.thread.join()
+            self.loop.close()
+            raise self.open_error
+    ## __init__ ##
+
+    # Event loop thread body, an error opening the stream is passed on to the
+    # thread that created the transport
+    def _run_loop( self ):
+        asyncio.set_event_loop( self.loop )
+        try:
+            self.loop.run_until_complete( self._open() )
+        except Exception as error:
+            self.open_error = error
+            return
+        finally:
+            self.ready.set()
+        self.loop.run_forever()
+    ## _run_loop ##
+
+    # Wrap the open pyserial handle in an asyncio stream and start the tasks
+    async def _open( self ):
+        self.send_queue    = asyncio.PriorityQueue()
+        self.pending_event = asyncio.Event()
+        self.in_flight     = asyncio.Semaphore( self.max_in_flight )
+        self.reader        = asyncio.StreamReader()
+        protocol           = asyncio.StreamReaderProtocol( self.reader )
+        transport, _       = await serial_asyncio.connection_for_serial(
+                                                   self.loop               ,
+                                                   lambda: protocol        ,
+                                                   self.serialObj.serialObj
+                                                                        )
+        self.writer        = asyncio.StreamWriter(
+                                                 transport  ,
+                                                 protocol   ,
+                                                 self.reader,
+                                                 self.loop
+                                                 )
+        self.tasks = [
+                     self.loop.create_task( self._send_task()    ),
+                     self.loop.create_task( self._receive_task() )
+                     ]
+    ## _open ##
+
+    # Write queued requests to the port in priority order
+    async def _send_task( self ):
+        try:
+            while ( True ):
+                _, _, request = await self.send_queue.get()
+                if ( request.future.cancelled() ):
+                    continue
+                await self.in_flight.acquire()
+                request.deadline = self.loop.time() + self.timeout
+                self.writer.write( request.payload )
+                self.pending.append( request )
+                self.pending_event.set()
+                await self.writer.drain()
+        except Exception as error:
+            self._fail_all( "Engine controller link failed: " + repr( error ) )
+    ## _send_task ##
+
+    # Dispatch received data according to the current mode
+    async def _receive_task( self ):
+        try:
+            while ( True ):
+                if ( self.streaming ):
+                    await self._receive_frames()
+                else:
+                    await self._receive_response()
+        except Exception as error:
+            self._fail_all( "Engine controller link failed: " + repr( error ) )
+    ## _receive_task ##
+
+    # Read the raw response to the oldest request in flight
+    async def _receive_response( self ):
+        if ( len( self.pending ) == 0 ):
+            self.pending_event.clear()
+            await self.pending_event.wait()
+            return
+        request = self.pending[0]
+        try:
+            response = await asyncio.wait_for(
+                           self.reader.readexactly( request.response_size ),
+                           max( request.deadline - self.loop.time(), 0 )
+                                             )
+        except asyncio.TimeoutError:
+            await self._resync()
+            return
+        self._complete( response )
+    ## _receive_response ##
+
+    # Parse streaming frames and expire requests whose response frame was lost
+    async def _receive_frames( self ):
+        try:
+            data = await asyncio.wait_for( self.reader.read( READ_CHUNK_SIZE ),
+                                           STREAM_POLL_PERIOD )
+        except asyncio.TimeoutError:
+            data = b''
+        telemetry, frames = self.parser.feed_batch( data )
+        if ( ( len( telemetry ) > 0 ) and ( self.telemetry_callback is not None ) ):
+            self.telemetry_callback( telemetry )
+        for frame in frames:
+            if ( ( frame.frame_type == SDR_protocol.RESPONSE_FRAME ) and
+                 ( len( self.pending ) > 0 ) ):
+                self._complete( frame.payload )
+        now = self.loop.time()
+        while ( ( len( self.pending ) > 0 ) and ( self.pending[0].deadline < now ) ):
+            self._fail( self.pending.popleft() )
+    ## _receive_frames ##
+
+    # Resolve the oldest request in flight with its response
+    def _complete( self, response ):
+        request = self.pending.popleft()
+        if ( not request.future.done() ):
+            request.future.set_result( response )
+        self.in_flight.release()
+        if ( request.stream_mode is not None ):
+            self.streaming = request.stream_mode
+            self.parser.reset()
+    ## _complete ##
+
+    # Fail a request that was never answered
+    def _fail( self, request ):
+        if ( not request.future.done() ):
+            request.future.set_exception(
+                TimeoutError( "No response from the engine controller" ) )
+        self.in_flight.release()
+    ## _fail ##
+
+    # End the link: fail every request in flight or queued, and every later
+    # request, with a ConnectionError. Runs on the event loop
+    def _fail_all( self, message ):
+        if ( self.error is None ):
+            self.error = ConnectionError( message )
+        requests = list( self.pending )
+        self.pending.clear()
+        while ( not self.send_queue.empty() ):
+            requests.append( self.send_queue.get_nowait()[2] )
+        for request in requests:
+            if ( not request.future.done() ):
+                request.future.set_exception( ConnectionError( str( self.error ) ) )
+    ## _fail_all ##
+
+    # Fail every request in flight and discard stale bytes so the next
+    # response lines up with the next request
+    async def _resync( self ):
+        while ( len( self.pending ) > 0 ):
+            self._fail( self.pending.popleft() )
+        while ( True ):
+            try:
+                await asyncio.wait_for( self.reader.read( READ_CHUNK_SIZE ),
+                                        RESYNC_QUIET )
+            except asyncio.TimeoutError:
+                break
+    ## _resync ##
+
+    # Queue a request from any thread, returns a concurrent.futures.Future that
+    # resolves to the raw response bytes
+    def submit(
+              self                         ,
+              payload                      ,
+              response_size                ,
+              priority    = COMMAND_PRIORITY,
+              stream_mode = None
+              ):
+        async def request():
+            if ( self.error is not None ):
+                raise ConnectionError( str( self.error ) )
+            future  = self.loop.create_future()
+            request = Serial_Request( payload, response_size, future, stream_mode )
+            self.send_queue.put_nowait( ( priority, next( self.sequence ), request ) )
+            return await future
+        if ( ( self.error is not None ) or ( not self.thread.is_alive() ) ):
+            failed = concurrent.futures.Future()
+            failed.set_exception( ConnectionError( str( self.error or
+                                                        "Serial transport stopped" ) ) )
+            return failed
+        return asyncio.run_coroutine_threadsafe( request(), self.loop )
+    ## submit ##
+
+    # Send a request and block the calling thread until its response arrives.
+    # The wait is checked every timeout, so a link that ended without resolving
+    # the request still raises
+    def request(
+               self                         ,
+               payload                      ,
+               response_size                ,
+               priority    = COMMAND_PRIORITY,
+               stream_mode = None
+               ):
+        future = self.submit( payload, response_size, priority, stream_mode )
+        while ( True ):
+            try:
+                return future.result( timeout = self.timeout )
+            except concurrent.futures.TimeoutError:
+                if ( future.done() ):
+                    raise
+                if ( ( self.error is not None ) or
+                     ( not self.thread.is_alive() ) ):
+                    future.cancel()
+                    raise ConnectionError( str( self.error or
+                                                "Serial transport stopped" ) )
+    ## request ##
+
+    # Request a sensor dump, returns the controller timestamp (ticks) and the
+    # sensor readouts dictionary
+    def poll_sensors( self ):
+        payload  = SDR_protocol.SENSOR_OP + SDR_protocol.sensor_subcommand_codes["dump"]
+        response = self.request(
+                               payload                          ,
+                               SDR_protocol.SENSOR_DUMP_SIZE    ,
+                               priority = TELEMETRY_PRIORITY
+                               )
+        device_ticks, readouts = SDR_protocol.parse_sensor_dump( response )
+        self.serialObj.sensor_readouts = readouts
+        return device_ticks, readouts
+    ## poll_sensors ##
+
+    # Switch the controller into streaming mode. callback is called on the
+    # transport thread with each received batch of telemetry frames as a
+    # sensor_frames.frame_dtype structured array
+    def start_stream( self, callback ):
+        self.telemetry_callback = callback
+        payload = ( SDR_protocol.SENSOR_OP +
+                    SDR_protocol.sensor_subcommand_codes["stream_start"] )
+        self.request( payload, SDR_protocol.STREAM_ACK_SIZE, stream_mode = True )
+    ## start_stream ##
+
+    # Return the controller to request/response mode
+    def stop_stream( self ):
+        payload = ( SDR_protocol.SENSOR_OP +
+                    SDR_protocol.sensor_subcommand_codes["stream_stop"] )
+        self.request( payload, SDR_protocol.STREAM_ACK_SIZE, stream_mode = False )
+        self.telemetry_callback = None
+    ## stop_stream ##
+
+    # Set the controller's telemetry stream rate in Hz without waiting for the
+    # acknowledgement, returns the request future
+    def set_stream_rate( self, rate ):
+        payload = ( SDR_protocol.SENSOR_OP +
+                    SDR_protocol.sensor_subcommand_codes["stream_rate"] +
+                    struct.pack( SDR_protocol.STREAM_RATE_FORMAT, int( rate ) ) )
+        return self.submit( payload, SDR_protocol.STREAM_ACK_SIZE )
+    ## set_stream_rate ##
+
+    # Issue an engine controller subcommand, returns the new engine state
+    def engine_command( self, command ):
+        payload  = SDR_protocol.ENGINE_OP + SDR_protocol.engine_subcommand_codes[command]
+        response = self.request( payload, SDR_protocol.ENGINE_RESPONSE_SIZE )
+        self.engine_state = SDR_protocol.parse_engine_state( response )
+        return self.engine_state
+    ## engine_command ##
+
+    # Engine state reported by the last engine command
+    def get_engine_state( self ):
+        return self.engine_state
+    ## get_engine_state ##
+
+    # Fail outstanding requests and stop the event loop thread, the serial port
+    # itself is left open
+    def close( self ):
+        async def shutdown():
+            self._fail_all( "Serial transport closed" )
+            for task in self.tasks:
+                task.cancel()
+
+            # Let the failed requests reach their callers before stopping
+            others = asyncio.all_tasks() - { asyncio.current_task() }
+            await asyncio.gather( *others, return_exceptions = True )
+            self.loop.stop()
+        if ( self.error is None ):
+            self.error = ConnectionError( "Serial transport closed" )
+        if ( self.thread.is_alive() ):
+            asyncio.run_coroutine_threadsafe( shutdown(), self.loop )
+            self.thread.join()
+    ## close ##
+## Serial_Transport ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
@@ -0,0 +1,244 @@
+####################################################################################
+#                                                                                  #
+# telemetry_stats.py -- sample loss accounting and latency histograms for the      #
+#                       acquisition pipeline                                       #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import math
+import os
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# Histogram resolution and range, latencies are recorded in microseconds
+DEFAULT_SIGNIFICANT_DIGITS = 2
+DEFAULT_MAX_LATENCY        = 3600*1000000 # us, longer latencies are clamped
+
+# Samples that take longer than this to reach the display are counted late
+DEFAULT_LATE_THRESHOLD = 0.1 # seconds
+
+# Percentiles reported in the stats file
+report_percentiles = [ 50.0, 90.0, 99.0, 99.9, 99.99, 100.0 ]
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Latency_Histogram                                                          #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		HDR-style histogram of latencies. Buckets double in width while each is    #
+#       split into the same number of linear sub-buckets, so every recorded value  #
+#       is kept to significant_digits decimal digits of precision from one         #
+#       microsecond up to max_value with a few thousand counters. Recording a      #
+#       batch is a handful of NumPy operations                                     #
+#                                                                                  #
+####################################################################################
+class Latency_Histogram:
+
+    # Initialization
+    def __init__(
+                self                                          ,
+                significant_digits = DEFAULT_SIGNIFICANT_DIGITS,
+                max_value          = DEFAULT_MAX_LATENCY        # us
+                ):
+        self.sub_bucket_bits  = int( math.ceil( math.log2( 2*10**significant_digits ) ) )
+        self.sub_bucket_half  = 2**( self.sub_bucket_bits - 1 )
+        self.max_value        = max_value
+        self.counts           = np.zeros( self._index( np.array( [ max_value ] ) )[0] + 1,
+                                          dtype = np.int64 )
+        self.total_count      = 0
+        self.total_sum        = 0
+        self.min_recorded     = None
+        self.max_recorded     = None
+    ## __init__ ##
+
+    # Counter index of integer microsecond values
+    def _index( self, values ):
+        bit_length = np.frexp( values.astype( np.float64 ) )[1]
+        bucket     = np.maximum( bit_length - self.sub_bucket_bits, 0 )
+        return bucket*self.sub_bucket_half + ( values >> bucket )
+    ## _index ##
+
+    # Largest value that falls in the same counter as each index
+    def _highest_equivalent( self, index ):
+        bucket = max( index//self.sub_bucket_half - 1, 0 )
+        sub    = index - bucket*self.sub_bucket_half
+        return ( ( sub + 1 ) << bucket ) - 1
+    ## _highest_equivalent ##
+
+    # Record an array of latencies in seconds
+    def record( self, latencies ):
+        if ( len( latencies ) == 0 ):
+            return
+        values = np.clip( np.round( np.asarray( latencies )*1e6 ), 0,
+                          self.max_value ).astype( np.int64 )
+        np.add.at( self.counts, self._index( values ), 1 )
+        self.total_count += len( values )
+        self.total_sum   += int( values.sum() )
+        low  = int( values.min() )
+        high = int( values.max() )
+        if ( self.min_recorded is None ):
+            self.min_recorded = low
+            self.max_recorded = high
+        else:
+            self.min_recorded = min( self.min_recorded, low  )
+            self.max_recorded = max( self.max_recorded, high )
+    ## record ##
+
+    # Latency in seconds at or below which percentile percent of values fall
+    def get_percentile( self, percentile ):
+        if ( self.total_count == 0 ):
+            return 0.0
+        if ( percentile >= 100.0 ):
+            return self.max_recorded/1e6
+        target = max( int( math.ceil( percentile/100.0*self.total_count ) ), 1 )
+        index  = int( np.searchsorted( np.cumsum( self.counts ), target ) )
+        return min( self._highest_equivalent( index ), self.max_recorded )/1e6
+    ## get_percentile ##
+
+    # Mean latency in seconds
+    def get_mean( self ):
+        if ( self.total_count == 0 ):
+            return 0.0
+        return self.total_sum/self.total_count/1e6
+    ## get_mean ##
+## Latency_Histogram ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Telemetry_Stats                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Per-run accounting of sample loss and staleness. Counts samples received,  #
+#       dropped (telemetry sequence gaps, ring buffer overruns and failed polls),  #
+#       late (older than late_threshold when displayed), corrupted (frames         #
+#       rejected by the CRC), unlogged (log records dropped because the            #
+#       recorder fell behind) and log errors (sample batches the log sink raised   #
+#       on), and keeps latency histograms from the time a sample was read to the   #
+#       time it was displayed and written to disk                                  #
+#                                                                                  #
+####################################################################################
+class Telemetry_Stats:
+
+    # Initialization
+    def __init__( self, late_threshold = DEFAULT_LATE_THRESHOLD ):
+        self.late_threshold  = late_threshold
+        self.read_to_display = Latency_Histogram()
+        self.read_to_disk    = Latency_Histogram()
+        self.num_late        = 0
+        self.counters        = {
+                               "received"  : 0,
+                               "dropped"   : 0,
+                               "late"      : 0,
+                               "corrupted" : 0,
+                               "unlogged"  : 0,
+                               "log errors": 0
+                               }
+
+        # Counts of transports that have since been replaced
+        self.transport         = None
+        self.retired_dropped   = 0
+        self.retired_corrupted = 0
+    ## __init__ ##
+
+    # Record the samples shown by a frame drawn at display_time (run seconds)
+    def record_display( self, samples, display_time ):
+        latencies      = display_time - samples["time"]
+        self.num_late += int( np.count_nonzero( latencies > self.late_threshold ) )
+        self.read_to_display.record( latencies )
+    ## record_display ##
+
+    # Record samples written to disk at disk_time (run seconds)
+    def record_disk( self, samples, disk_time ):
+        self.read_to_disk.record( disk_time - samples["time"] )
+    ## record_disk ##
+
+    # Refresh the counters from the acquisition thread and its transport, and
+    # from the run log when it can drop records
+    def update_counters( self, acquisition_thread, log_writer = None ):
+        transport = acquisition_thread.transport
+        if ( transport is not self.transport ):
+            if ( self.transport is not None ):
+                self.retired_dropped   += self.transport.parser.num_dropped
+                self.retired_corrupted += self.transport.parser.num_corrupted
+            self.transport = transport
+        dropped   = self.retired_dropped
+        corrupted = self.retired_corrupted
+        if ( transport is not None ):
+            dropped   += transport.parser.num_dropped
+            corrupted += transport.parser.num_corrupted
+        self.counters["received" ] = acquisition_thread.buffer.num_pushed
+        self.counters["dropped"  ] = ( dropped                                +
+                                       acquisition_thread.buffer.num_overrun  +
+                                       acquisition_thread.num_poll_failures )
+        self.counters["late"     ] = self.num_late
+        self.counters["corrupted"] = corrupted
+        self.counters["log errors"] = acquisition_thread.num_sink_failures
+        if ( hasattr( log_writer, "get_num_dropped" ) ):
+            self.counters["unlogged"] = log_writer.get_num_dropped()
+    ## update_counters ##
+
+    # One line summary for the status panel
+    def get_summary( self ):
+        return ( "Received: {}    Dropped: {}    Late: {}    Corrupted: {}    " +
+                 "Unlogged: {}    Log errors: {}    " +
+                 "Display latency p50/p99/max: {:.1f}/{:.1f}/{:.1f} ms    " +
+                 "Disk latency p99: {:.1f} ms" ).format(
+                       self.counters["received" ]                    ,
+                       self.counters["dropped"  ]                    ,
+                       self.counters["late"     ]                    ,
+                       self.counters["corrupted"]                    ,
+                       self.counters["unlogged" ]                    ,
+                       self.counters["log errors"]                   ,
+                       self.read_to_display.get_percentile( 50.0  )*1e3,
+                       self.read_to_display.get_percentile( 99.0  )*1e3,
+                       self.read_to_display.get_percentile( 100.0 )*1e3,
+                       self.read_to_disk.get_percentile   ( 99.0  )*1e3 )
+    ## get_summary ##
+
+    # Write the counters and latency percentiles to a stats file, replacing the
+    # previous one in a single step so a crash never leaves a partial file
+    def write( self, filename ):
+        lines = []
+        for name, count in self.counters.items():
+            lines.append( "{:<24}{}".format( name, count ) )
+        lines.append( "{:<24}{}".format( "late threshold (ms)",
+                                         self.late_threshold*1e3 ) )
+        for title, histogram in ( ( "read to display", self.read_to_display ),
+                                  ( "read to disk"   , self.read_to_disk    ) ):
+            lines.append( "" )
+            lines.append( title + " latency (ms)" )
+            lines.append( "{:<24}{}".format( "samples", histogram.total_count ) )
+            lines.append( "{:<24}{:.3f}".format( "mean", histogram.get_mean()*1e3 ) )
+            for percentile in report_percentiles:
+                lines.append( "{:<24}{:.3f}".format(
+                                   "p" + format( percentile, "g" ),
+                                   histogram.get_percentile( percentile )*1e3 ) )
+        temp_filename = filename + ".tmp"
+        with open( temp_filename, "w" ) as file:
+            file.write( "\n".join( lines ) + "\n" )
+        os.replace( temp_filename, filename )
+    ## write ##
+## Telemetry_Stats ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
@@ -0,0 +1,175 @@
+####################################################################################
+#                                                                                  #
+# telemetry_stream.py -- parser for the engine controller's binary streaming       #
+#                        telemetry mode                                            #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import struct
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import controller_protocol as SDR_protocol
+import sensor_frames       as SDR_sensor_frames
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Frame                                                                      #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		A validated streaming frame                                                #
+#                                                                                  #
+####################################################################################
+class Frame:
+
+    # Initialization
+    def __init__( self, frame_type, sequence, payload ):
+        self.frame_type = frame_type
+        self.sequence   = sequence
+        self.payload    = payload
+    ## __init__ ##
+## Frame ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Frame_Parser                                                               #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Incremental parser for the streaming byte stream. Bytes are fed in         #
+#       arbitrary chunks; complete frames whose CRC checks out are returned.       #
+#       After a corrupted frame the parser resynchronizes on the next sync word    #
+#       following the bad one, so a single bit error costs at most the frames it   #
+#       overlaps                                                                   #
+#                                                                                  #
+####################################################################################
+class Frame_Parser:
+
+    # Initialization
+    def __init__( self ):
+        self.buffer         = bytearray()
+        self.last_sequence  = None
+        self.num_frames     = 0 # valid frames parsed
+        self.num_corrupted  = 0 # frames rejected by the CRC or header checks
+        self.num_dropped    = 0 # telemetry frames missing from the sequence
+        self.num_discarded  = 0 # bytes skipped while searching for a sync word
+    ## __init__ ##
+
+    # Parse a chunk of received bytes, returns the list of complete frames
+    def feed( self, data ):
+        frames = []
+        for frame_type, sequence, raw_frame in self._scan( data ):
+            payload = raw_frame[SDR_protocol.FRAME_HEADER_SIZE:
+                                -SDR_protocol.FRAME_CRC_SIZE]
+            frames.append( Frame( frame_type, sequence, payload ) )
+        return frames
+    ## feed ##
+
+    # Parse a chunk of received bytes, returns all complete telemetry frames as
+    # one structured array (see sensor_frames.frame_dtype) and a list of the
+    # remaining frames
+    def feed_batch( self, data ):
+        telemetry = []
+        frames    = []
+        for frame_type, sequence, raw_frame in self._scan( data ):
+            if ( ( frame_type == SDR_protocol.TELEMETRY_FRAME ) and
+                 ( len( raw_frame ) == SDR_protocol.TELEMETRY_FRAME_SIZE ) ):
+                telemetry.append( raw_frame )
+            else:
+                payload = raw_frame[SDR_protocol.FRAME_HEADER_SIZE:
+                                    -SDR_protocol.FRAME_CRC_SIZE]
+                frames.append( Frame( frame_type, sequence, payload ) )
+        return SDR_sensor_frames.decode_frames( b"".join( telemetry ) ), frames
+    ## feed_batch ##
+
+    # Find the complete, valid frames in the buffered bytes, returns a list of
+    # ( frame type, sequence, raw frame bytes )
+    def _scan( self, data ):
+        buffer = self.buffer
+        buffer.extend( data )
+        frames = []
+        pos    = 0
+        while ( True ):
+
+            # Find the next sync word
+            start = buffer.find( SDR_protocol.STREAM_SYNC, pos )
+            if ( start < 0 ):
+                # Keep a trailing byte that could begin a split sync word
+                keep = 0
+                if ( ( pos < len( buffer ) ) and
+                     buffer.endswith( SDR_protocol.STREAM_SYNC[:1] ) ):
+                    keep = 1
+                self.num_discarded += len( buffer ) - keep - pos
+                pos = len( buffer ) - keep
+                break
+            self.num_discarded += start - pos
+            pos = start
+
+            # Wait for the rest of the header
+            if ( len( buffer ) - start < SDR_protocol.FRAME_HEADER_SIZE ):
+                break
+            _, frame_type, length, sequence = struct.unpack_from(
+                                                 SDR_protocol.FRAME_HEADER_FORMAT,
+                                                 buffer                          ,
+                                                 start
+                                                                )
+            if ( frame_type not in SDR_protocol.frame_types ):
+                self.num_corrupted += 1
+                pos = start + 1
+                continue
+
+            # Wait for the rest of the frame
+            payload_start = start + SDR_protocol.FRAME_HEADER_SIZE
+            crc_start     = payload_start + length
+            end           = crc_start + SDR_protocol.FRAME_CRC_SIZE
+            if ( len( buffer ) < end ):
+                break
+
+            # Validate the frame
+            crc, = struct.unpack_from( SDR_protocol.FRAME_CRC_FORMAT, buffer, crc_start )
+            body = buffer[start + len( SDR_protocol.STREAM_SYNC ):crc_start]
+            if ( crc != SDR_protocol.frame_crc( body ) ):
+                self.num_corrupted += 1
+                pos = start + 1
+                continue
+
+            # Track gaps in the telemetry sequence
+            if ( frame_type == SDR_protocol.TELEMETRY_FRAME ):
+                if ( self.last_sequence is not None ):
+                    self.num_dropped += ( sequence - self.last_sequence - 1 ) & 0xFFFF
+                self.last_sequence = sequence
+
+            frames.append( ( frame_type, sequence, bytes( buffer[start:end] ) ) )
+            self.num_frames += 1
+            pos = end
+
+        # Drop consumed bytes
+        del buffer[:pos]
+        return frames
+    ## _scan ##
+
+    # Forget any partial frame and the telemetry sequence, used when the stream
+    # is restarted
+    def reset( self ):
+        self.buffer.clear()
+        self.last_sequence = None
+    ## reset ##
+## Frame_Parser ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
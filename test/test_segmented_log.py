@@ -0,0 +1,112 @@
+####################################################################################
+#                                                                                  #
+# test_segmented_log.py -- crash recovery of segmented log directories             #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+# Usage: python -m unittest discover -s test                                       #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import os
+import tempfile
+import unittest
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import segmented_log as SDR_segmented_log
+import sensor_frames as SDR_sensor_frames
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Recover_Test                                                               #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Reopens segmented log directories as a crash right after opening a         #
+#       segment leaves them                                                        #
+#                                                                                  #
+####################################################################################
+class Recover_Test( unittest.TestCase ):
+
+    # Write one sealed segment of ten samples to a new log directory
+    def setUp( self ):
+        self.temp_dir   = tempfile.TemporaryDirectory()
+        self.directory  = os.path.join( self.temp_dir.name, "run" +
+                                        SDR_segmented_log.DIRECTORY_EXTENSION )
+        self.dtype      = SDR_sensor_frames.sample_dtype
+        samples         = np.zeros( 10, dtype = self.dtype )
+        samples["time"] = np.arange( 10 )
+        log_file = SDR_segmented_log.Segmented_Log_File( self.directory, self.dtype )
+        log_file.write_samples( samples )
+        log_file.close()
+        self.next_name = SDR_segmented_log.SEGMENT_FORMAT.format( 1 )
+    ## setUp ##
+
+    # Remove the log directory
+    def tearDown( self ):
+        self.temp_dir.cleanup()
+    ## tearDown ##
+
+    # Reopen the directory after writing data to the next segment's .partial file
+    def reopen( self, data ):
+        partial = os.path.join( self.directory, self.next_name +
+                                SDR_segmented_log.PARTIAL_SUFFIX )
+        with open( partial, "wb" ) as file:
+            file.write( data )
+        log_file = SDR_segmented_log.Segmented_Log_File( self.directory, self.dtype )
+        log_file.close()
+        return sorted( os.listdir( self.directory ) )
+    ## reopen ##
+
+    # A segment opened but never written is removed
+    def test_empty_partial( self ):
+        names = self.reopen( b"" )
+        self.assertNotIn( self.next_name, names )
+        self.assertEqual( len( SDR_segmented_log.Segmented_Log( self.directory ) ),
+                          10 )
+    ## test_empty_partial ##
+
+    # A segment with a torn header is renamed aside
+    def test_torn_header( self ):
+        names = self.reopen( b"SDRLOG\x01\x00\xff\x00\x00\x00{\"dty" )
+        self.assertIn( self.next_name + SDR_segmented_log.UNREADABLE_SUFFIX, names )
+        self.assertEqual( len( SDR_segmented_log.Segmented_Log( self.directory ) ),
+                          10 )
+    ## test_torn_header ##
+
+    # Segments written after a gap in the numbering get new numbers
+    def test_numbering_gap( self ):
+        self.reopen( b"" )
+        os.replace( os.path.join( self.directory,
+                                  SDR_segmented_log.SEGMENT_FORMAT.format( 0 ) ),
+                    os.path.join( self.directory,
+                                  SDR_segmented_log.SEGMENT_FORMAT.format( 2 ) ) )
+        os.remove( os.path.join( self.directory, SDR_segmented_log.INDEX_FILENAME ) )
+        log_file = SDR_segmented_log.Segmented_Log_File( self.directory, self.dtype,
+                                                         segment_rows = 5 )
+        samples         = np.zeros( 10, dtype = self.dtype )
+        samples["time"] = np.arange( 10, 20 )
+        log_file.write_samples( samples )
+        log_file.close()
+        _, records = SDR_segmented_log.Segmented_Log( self.directory ).load()
+        self.assertEqual( sorted( records["time"].tolist() ), list( range( 20 ) ) )
+    ## test_numbering_gap ##
+## Recover_Test ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################
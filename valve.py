@@ -44,7 +44,8 @@ class Buttons:
                 root,          # frame to attach button to
                 text,          # valve button frame label,
                 side,          # Where to place the widget in root 
-                symbol=None    # link to engine schematic symbol
+                symbol=None,   # link to engine schematic symbol
+                on_action=None # called with ( text, state ) on a toggle
                 ):
 
         ############################################################################
@@ -54,6 +55,10 @@ class Buttons:
 		# engine schematic symbol link
         self.symbol = symbol
 
+        # valve label and toggle callback
+        self.name      = text
+        self.on_action = on_action
+
 		# valve OPEN/CLOSE state
         self.state  = VALVE_CLOSED 
 
@@ -145,6 +150,8 @@ class Buttons:
             self.updateText()
             self.updateColor()
             self.configButton()
+            if ( self.on_action is not None ):
+                self.on_action( self.name, self.state )
     ## action ##
 
 
@@ -0,0 +1,461 @@
+####################################################################################
+#                                                                                  #
+# write_ahead.py -- crash-safe hand-off of the run log to a recorder process       #
+#                                                                                  #
+# Author: Colton Acosta                                                            #
+# Date: 10/18/2026                                                                 #
+# Sun Devil Rocketry Avionics                                                      #
+#                                                                                  #
+# File layout (memory mapped by the GUI and the recorder):                         #
+#       magic (6) | format version (u16) | capacity (u64) | write position (u64) | #
+#       read position (u64) | GUI heartbeat (f8) | recorder heartbeat (f8) |       #
+#       closed (u1) | padding to HEADER_SIZE | ring of capacity bytes              #
+#   ring record:                                                                   #
+#       record type (u32) | payload length (u32) | payload | padding to 8 bytes    #
+#                                                                                  #
+# Positions count bytes since the start of the run, the ring offset of a position  #
+# is position % capacity. A record that does not fit before the end of the ring    #
+# is preceded by a wrap record and written at the start                            #
+#                                                                                  #
+####################################################################################
+
+
+####################################################################################
+# Standard Imports                                                                 #
+####################################################################################
+import glob
+import json
+import mmap
+import os
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+# Data processing
+import numpy as np
+
+
+####################################################################################
+# Project Imports                                                                  #
+####################################################################################
+import run_journal as SDR_run_journal
+
+
+####################################################################################
+# Global variables                                                                 #
+####################################################################################
+
+# File identification
+MAGIC          = b"SDRWAL"
+FORMAT_VERSION = 1
+FILE_EXTENSION = ".sdrwal"
+
+# Header fields and their offsets
+HEADER_SIZE          = 64
+PREFIX_FORMAT        = "<6sHQ"  # magic, version, capacity
+WRITE_POS_OFFSET     = 16
+READ_POS_OFFSET      = 24
+GUI_BEAT_OFFSET      = 32
+RECORDER_BEAT_OFFSET = 40
+CLOSED_OFFSET        = 48
+
+# Ring records
+RECORD_FORMAT    = "<II"
+RECORD_SIZE      = struct.calcsize( RECORD_FORMAT )
+RECORD_ALIGNMENT = 8
+SAMPLE_RECORD    = 1
+TEXT_RECORD      = 2
+EVENT_RECORD     = 3
+WRAP_RECORD      = 4
+
+# Ring size, enough for minutes of full-rate streaming while the recorder is
+# restarted
+DEFAULT_CAPACITY = 64*2**20 # bytes
+
+# Longest time an acquired sample waits before the recorder has it on disk
+DEFAULT_DURABILITY_WINDOW = 0.05 # seconds
+
+# A side whose heartbeat is older than this is gone
+HEARTBEAT_PERIOD = 0.5 # seconds
+STALE_PERIOD     = 2.0 # seconds
+
+# Recorder gives up on a run whose GUI has not reattached for this long
+DEFAULT_ORPHAN_TIMEOUT = 3600.0 # seconds
+
+# Run files describing each recorded run
+RUN_FILE_PREFIX    = "engine_run"
+RUN_FILE_EXTENSION = ".json"
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         write_run_file                                                           #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Writes the description of a recorded run (filenames, log format, units,  #
+#         start time) that the recorder and a reattaching GUI read back. Replaced  #
+#         in a single step so a crash never leaves a partial file                  #
+#                                                                                  #
+####################################################################################
+def write_run_file( run_filename, run_info ):
+    temp_filename = run_filename + ".tmp"
+    with open( temp_filename, "w" ) as file:
+        json.dump( run_info, file, indent = 4 )
+    os.replace( temp_filename, run_filename )
+## write_run_file ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         read_run_file                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Reads a run description written by write_run_file                        #
+#                                                                                  #
+####################################################################################
+def read_run_file( run_filename ):
+    with open( run_filename, "r" ) as file:
+        return json.load( file )
+## read_run_file ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         find_live_run                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Searches output_root for a run whose recorder is still running but       #
+#         whose GUI is gone. Returns the newest such run file, or None             #
+#                                                                                  #
+####################################################################################
+def find_live_run( output_root ):
+    pattern   = os.path.join( output_root, "*", RUN_FILE_PREFIX + "*" +
+                                                RUN_FILE_EXTENSION )
+    run_files = sorted( glob.glob( pattern ), key = os.path.getmtime,
+                        reverse = True )
+    for run_filename in run_files:
+        try:
+            run_info = read_run_file( run_filename )
+            buffer   = Write_Ahead_Buffer( run_info["wal_filename"] )
+        except ( OSError, ValueError, KeyError ):
+            continue
+        try:
+            if ( ( not buffer.is_closed() ) and buffer.recorder_alive() and
+                 ( not buffer.gui_alive() ) ):
+                return run_filename
+        finally:
+            buffer.close()
+    return None
+## find_live_run ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         start_recorder                                                           #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Launches recorder.py for a run file in its own session, so neither a     #
+#         GUI crash nor a Ctrl-C in the GUI's terminal stops it. The recorder's    #
+#         output goes to log_filename                                              #
+#                                                                                  #
+####################################################################################
+def start_recorder( run_filename, log_filename ):
+    recorder_script = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ),
+                                    "recorder.py" )
+    options = {}
+    if ( os.name == 'nt' ):
+        options["creationflags"] = ( subprocess.CREATE_NEW_PROCESS_GROUP |
+                                     subprocess.DETACHED_PROCESS )
+    else:
+        options["start_new_session"] = True
+    with open( log_filename, "a" ) as log_file:
+        return subprocess.Popen( [ sys.executable, recorder_script, run_filename ],
+                                 stdin  = subprocess.DEVNULL,
+                                 stdout = log_file          ,
+                                 stderr = subprocess.STDOUT ,
+                                 **options )
+## start_recorder ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Write_Ahead_Buffer                                                         #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		Single-producer, single-consumer ring of typed records in a memory mapped  #
+#       file shared by the GUI and the recorder. A record is visible to the        #
+#       recorder once the write position passes it; the mapping lives in the       #
+#       operating system's page cache, so committed records outlive a crashed      #
+#       GUI. The GUI never blocks: a record that does not fit is dropped and       #
+#       counted. Heartbeats use time.monotonic, which is the system-wide           #
+#       monotonic clock on the supported platforms                                 #
+#                                                                                  #
+####################################################################################
+class Write_Ahead_Buffer:
+
+    # Initialization, creates the file when capacity is given and the file
+    # does not exist
+    def __init__( self, filename, capacity = None ):
+        self.filename = filename
+        if ( not os.path.exists( filename ) ):
+            if ( capacity is None ):
+                raise ValueError( filename + " does not exist" )
+            capacity -= capacity % RECORD_ALIGNMENT
+            with open( filename, "wb" ) as file:
+                file.write( struct.pack( PREFIX_FORMAT, MAGIC, FORMAT_VERSION,
+                                         capacity ).ljust( HEADER_SIZE, b"\x00" ) )
+                file.truncate( HEADER_SIZE + capacity )
+        self.file = open( filename, "r+b" )
+        try:
+            self.map = mmap.mmap( self.file.fileno(), 0 )
+        except ValueError:
+            self.file.close()
+            raise ValueError( filename + " is not a write-ahead buffer" )
+        magic, version, self.capacity = struct.unpack_from( PREFIX_FORMAT,
+                                                            self.map, 0 )
+        if ( ( magic != MAGIC ) or ( version > FORMAT_VERSION ) or
+             ( len( self.map ) < HEADER_SIZE + self.capacity ) ):
+            self.close()
+            raise ValueError( filename + " is not a write-ahead buffer" )
+        self.num_dropped = 0 # records that did not fit
+    ## __init__ ##
+
+    # Read a header field
+    def _get( self, field_format, offset ):
+        return struct.unpack_from( field_format, self.map, offset )[0]
+    ## _get ##
+
+    # Write a header field
+    def _set( self, field_format, offset, value ):
+        struct.pack_into( field_format, self.map, offset, value )
+    ## _set ##
+
+    # Bytes appended since the start of the run
+    def get_write_pos( self ):
+        return self._get( "<Q", WRITE_POS_OFFSET )
+    ## get_write_pos ##
+
+    # Bytes the recorder has on disk
+    def get_read_pos( self ):
+        return self._get( "<Q", READ_POS_OFFSET )
+    ## get_read_pos ##
+
+    # True once the GUI has ended the run
+    def is_closed( self ):
+        return self._get( "<B", CLOSED_OFFSET ) != 0
+    ## is_closed ##
+
+    # End the run
+    def set_closed( self ):
+        self._set( "<B", CLOSED_OFFSET, 1 )
+    ## set_closed ##
+
+    # Mark the GUI alive
+    def gui_beat( self ):
+        self._set( "<d", GUI_BEAT_OFFSET, time.monotonic() )
+    ## gui_beat ##
+
+    # Mark the recorder alive
+    def recorder_beat( self ):
+        self._set( "<d", RECORDER_BEAT_OFFSET, time.monotonic() )
+    ## recorder_beat ##
+
+    # Seconds since the GUI last beat
+    def gui_silence( self ):
+        return time.monotonic() - self._get( "<d", GUI_BEAT_OFFSET )
+    ## gui_silence ##
+
+    # True if the GUI beat recently
+    def gui_alive( self ):
+        return self.gui_silence() < STALE_PERIOD
+    ## gui_alive ##
+
+    # True if the recorder beat recently
+    def recorder_alive( self ):
+        return ( time.monotonic() - self._get( "<d", RECORDER_BEAT_OFFSET ) <
+                 STALE_PERIOD )
+    ## recorder_alive ##
+
+    # Copy bytes into the ring at a ring offset
+    def _put( self, ring_offset, data ):
+        start = HEADER_SIZE + ring_offset
+        self.map[start:start + len( data )] = data
+    ## _put ##
+
+    # Append a record, returns False if the ring is too full to hold it. Only
+    # one thread may append at a time
+    def append( self, record_type, payload ):
+        length      = len( payload )
+        record_size = RECORD_SIZE + length + ( -length % RECORD_ALIGNMENT )
+        write_pos   = self.get_write_pos()
+        ring_offset = write_pos % self.capacity
+        wrap_size   = 0
+        if ( ring_offset + record_size > self.capacity ):
+            wrap_size = self.capacity - ring_offset
+        free = self.capacity - ( write_pos - self.get_read_pos() )
+        if ( wrap_size + record_size > free ):
+            self.num_dropped += 1
+            return False
+        if ( wrap_size > 0 ):
+            self._put( ring_offset, struct.pack( RECORD_FORMAT, WRAP_RECORD, 0 ) )
+            ring_offset = 0
+        self._put( ring_offset, struct.pack( RECORD_FORMAT, record_type, length ) )
+        self._put( ring_offset + RECORD_SIZE, payload )
+
+        # Publish the record only once it is complete
+        self._set( "<Q", WRITE_POS_OFFSET, write_pos + wrap_size + record_size )
+        return True
+    ## append ##
+
+    # Records committed since the read position, returns a list of
+    # ( record type, payload ) and the position just past them. The read
+    # position only moves on with commit_read
+    def read( self ):
+        position  = self.get_read_pos()
+        write_pos = self.get_write_pos()
+        records   = []
+        while ( position < write_pos ):
+            start = HEADER_SIZE + position % self.capacity
+            record_type, length = struct.unpack_from( RECORD_FORMAT, self.map,
+                                                      start )
+            if ( record_type == WRAP_RECORD ):
+                position += self.capacity - position % self.capacity
+                continue
+            payload   = self.map[start + RECORD_SIZE:start + RECORD_SIZE + length]
+            position += RECORD_SIZE + length + ( -length % RECORD_ALIGNMENT )
+            records.append( ( record_type, payload ) )
+        return records, position
+    ## read ##
+
+    # Release the ring space of records up to position
+    def commit_read( self, position ):
+        self._set( "<Q", READ_POS_OFFSET, position )
+    ## commit_read ##
+
+    # Unmap and close the file
+    def close( self ):
+        self.map.close()
+        self.file.close()
+    ## close ##
+## Write_Ahead_Buffer ##
+
+
+####################################################################################
+#                                                                                  #
+# OBJECT:                                                                          #
+# 		Write_Ahead_Log                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+# 		GUI side of a recorded run, used in place of log_writer.Log_Writer. Sample #
+#       arrays, text lines and run events go straight into the write-ahead buffer  #
+#       from whichever thread produced them, and a heartbeat thread tells the      #
+#       recorder the GUI is alive. stop() ends the run; detach() leaves it open    #
+#       for a restarted GUI to reattach to                                         #
+#                                                                                  #
+####################################################################################
+class Write_Ahead_Log( threading.Thread ):
+
+    # Initialization
+    def __init__( self, wal_filename, capacity = DEFAULT_CAPACITY ):
+        super().__init__( daemon = True, name = "write-ahead heartbeat" )
+        self.buffer     = Write_Ahead_Buffer( wal_filename, capacity )
+        self.lock       = threading.Lock()
+        self.stop_event = threading.Event()
+        if ( self.buffer.gui_alive() ):
+            self.buffer.close()
+            raise ValueError( wal_filename + " is in use by another GUI" )
+        self.buffer.gui_beat()
+    ## __init__ ##
+
+    # Append a record under the lock
+    def _append( self, record_type, payload ):
+        with self.lock:
+            self.buffer.append( record_type, payload )
+    ## _append ##
+
+    # Append a structured array of samples, called from any thread
+    def write_samples( self, samples ):
+        if ( len( samples ) > 0 ):
+            self._append( SAMPLE_RECORD, np.ascontiguousarray( samples ).tobytes() )
+    ## write_samples ##
+
+    # Append a line of text
+    def write_text( self, text ):
+        self._append( TEXT_RECORD, text.encode( "utf-8" ) )
+    ## write_text ##
+
+    # Append a run_journal.Run_Event
+    def write_event( self, event ):
+        self._append( EVENT_RECORD, json.dumps( {
+                                                "type"  : event.event_type,
+                                                "time"  : event.time      ,
+                                                "fields": event.fields
+                                                } ).encode( "utf-8" ) )
+    ## write_event ##
+
+    # Records dropped because the recorder fell a full ring behind
+    def get_num_dropped( self ):
+        return self.buffer.num_dropped
+    ## get_num_dropped ##
+
+    # Thread body
+    def run( self ):
+        while ( not self.stop_event.wait( HEARTBEAT_PERIOD ) ):
+            self.buffer.gui_beat()
+    ## run ##
+
+    # Stop the heartbeat and release the buffer
+    def _release( self ):
+        self.stop_event.set()
+        if ( self.is_alive() ):
+            self.join()
+        with self.lock:
+            self.buffer.close()
+    ## _release ##
+
+    # End the run, the recorder writes out the rest of the buffer and exits
+    def stop( self ):
+        with self.lock:
+            self.buffer.set_closed()
+        self._release()
+    ## stop ##
+
+    # Leave the run open, the recorder keeps what is buffered and waits for a
+    # restarted GUI
+    def detach( self ):
+        self._release()
+    ## detach ##
+## Write_Ahead_Log ##
+
+
+####################################################################################
+#                                                                                  #
+# PROCEDURE:                                                                       #
+#         decode_record                                                            #
+#                                                                                  #
+# DESCRIPTION:                                                                     #
+#         Converts a ring record into what log_writer log files take: a sample     #
+#         array of dtype, a text line or a run_journal.Run_Event                   #
+#                                                                                  #
+####################################################################################
+def decode_record( record_type, payload, dtype ):
+    if ( record_type == SAMPLE_RECORD ):
+        return np.frombuffer( payload, dtype = dtype )
+    if ( record_type == TEXT_RECORD ):
+        return payload.decode( "utf-8" )
+    event = json.loads( payload.decode( "utf-8" ) )
+    return SDR_run_journal.Run_Event( event["type"], event["time"],
+                                      **event["fields"] )
+## decode_record ##
+
+
+####################################################################################
+# END OF FILE                                                                      #
+####################################################################################